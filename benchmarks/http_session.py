@@ -0,0 +1,84 @@
+"""Benchmark for the shared HTTP session.
+
+Starts a local aiohttp stub server and compares request latency when every
+call opens its own `aiohttp.ClientSession` (the old pattern in the steam,
+github, urban and integration code) against reusing the bot's pooled session
+from `utils.helpers.http.create_session`.
+
+The stub is plain HTTP on localhost, so there is no DNS lookup or TLS
+handshake to save; against real APIs the gap is larger.
+
+Run from the project root:
+    python -m benchmarks.http_session
+"""
+import asyncio
+import statistics
+import time
+
+import aiohttp
+from aiohttp import web
+
+from utils.helpers.http import create_session
+
+SEQUENTIAL = 500
+CONCURRENT = 50
+BATCHES = 10
+
+
+async def handle(request: web.Request) -> web.Response:
+    return web.json_response({'list': [{'word': 'cro', 'definition': 'a bot'}]})
+
+
+async def start_server() -> tuple:
+    app = web.Application()
+    app.router.add_get('/define', handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}/define"
+
+
+async def per_call(url: str, _session) -> None:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url) as resp:
+            await resp.json()
+
+
+async def shared(url: str, session: aiohttp.ClientSession) -> None:
+    async with session.get(url) as resp:
+        await resp.json()
+
+
+async def measure(request, url: str, session) -> tuple:
+    """Return (median ms per sequential request, ms per concurrent batch)."""
+    latencies = []
+    for _ in range(SEQUENTIAL):
+        start = time.perf_counter()
+        await request(url, session)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    for _ in range(BATCHES):
+        await asyncio.gather(*(request(url, session) for _ in range(CONCURRENT)))
+    batch_ms = (time.perf_counter() - start) * 1000 / BATCHES
+
+    return statistics.median(latencies), batch_ms
+
+
+async def main() -> None:
+    runner, url = await start_server()
+    session = create_session()
+    try:
+        for name, request in (('session per call', per_call), ('shared session', shared)):
+            median_ms, batch_ms = await measure(request, url, session)
+            print(f"{name:>16}: {median_ms:6.3f} ms median request, "
+                  f"{batch_ms:7.2f} ms per {CONCURRENT} concurrent requests")
+    finally:
+        await session.close()
+        await runner.cleanup()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+"""Benchmark for the bounded MemoryCache.
+
+Compares the previous unbounded MemoryCache (copied below) with the current
+one on a stream of short-lived keys:
+- time per set+get, including a periodic expiry sweep
+- memory still held after the stream
+- how many computations 100 concurrent misses on one key trigger
+
+Run from the project root:
+    python -m benchmarks.memory_cache
+"""
+import asyncio
+import time
+import timeit
+import tracemalloc
+from typing import Any, Dict, Optional
+
+from utils.cache.memory import MemoryCache
+
+OPERATIONS = 200_000
+HOT_KEYS = 1_000
+SWEEP_EVERY = 1_000
+TTL = 0.05
+
+
+class LegacyCacheEntry:
+    def __init__(self, value: Any, ttl: Optional[int] = None):
+        self.value = value
+        self.expires_at = time.time() + ttl if ttl else None
+
+    def is_expired(self) -> bool:
+        if self.expires_at is None:
+            return False
+        return time.time() > self.expires_at
+
+
+class LegacyMemoryCache:
+    def __init__(self):
+        self._cache: Dict[str, LegacyCacheEntry] = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry.is_expired():
+            del self._cache[key]
+            return None
+        return entry.value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        self._cache[key] = LegacyCacheEntry(value, ttl)
+
+    def cleanup(self) -> None:
+        current_time = time.time()
+        expired_keys = [
+            key for key, entry in self._cache.items()
+            if entry.expires_at and current_time > entry.expires_at
+        ]
+        for key in expired_keys:
+            del self._cache[key]
+
+
+def workload(cache) -> None:
+    """Mostly unique keys with a short TTL, plus reads of a small hot set."""
+    for i in range(OPERATIONS):
+        cache.set(f"key:{i}", i, TTL)
+        cache.get(f"key:{i % HOT_KEYS}")
+        if i % SWEEP_EVERY == 0:
+            cache.cleanup()
+
+
+def measure_memory(factory) -> int:
+    tracemalloc.start()
+    cache = factory()
+    workload(cache)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cache
+    return current
+
+
+async def count_computations(cache: MemoryCache) -> int:
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 'value'
+
+    await asyncio.gather(*(cache.get_or_set('shared', compute, 60) for _ in range(100)))
+    return calls
+
+
+def main() -> None:
+    cases = {
+        'legacy': LegacyMemoryCache,
+        'bounded': lambda: MemoryCache(max_entries=5_000),
+    }
+
+    for name, factory in cases.items():
+        seconds = min(timeit.repeat(lambda: workload(factory()), number=1, repeat=3))
+        kib = measure_memory(factory) / 1024
+        print(f"{name:>8}: {seconds / OPERATIONS * 1e6:5.2f} us/operation, {kib:9.1f} KiB held after stream")
+
+    cache = MemoryCache()
+    calls = asyncio.run(count_computations(cache))
+    print(f"get_or_set: 100 concurrent misses -> {calls} computation(s), stats {cache.stats}")
+
+
+if __name__ == '__main__':
+    main()
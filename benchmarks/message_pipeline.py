@@ -0,0 +1,159 @@
+"""Throughput benchmark for the shared message pipeline.
+
+Replays synthetic messages (chatter, mentions, replies and commands) through
+the message listeners and compares the old stack, where the afk listener and
+command processing each built their own context, against the pipeline in
+`Bot.on_message`, which builds one context plus `MessageFacts` and hands both
+to the `on_message_context` listeners. Commands are parsed but not invoked,
+and event dispatch overhead is left out of both sides.
+
+Run from the project root:
+    python -m benchmarks.message_pipeline
+"""
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault('DISCORD_TOKEN', 'benchmark')
+
+import discord
+
+from main import Bot
+from cogs.casual import Casual
+from cogs.fun import Fun
+from events.core.messages import MessageEvents
+from utils.helpers.messages import MessageFacts
+
+MESSAGES = 20_000
+GUILD_ID = 1234
+THANK_VARIANTS = ['thank', 'thanks', 'thx', 'ty', 'tysm', 'tyvm', 'thank you', 'thankyou', 'thnks']
+
+
+class StubUser:
+    def __init__(self, id: int, bot: bool = False) -> None:
+        self.id = id
+        self.bot = bot
+        self.name = f"user{id}"
+        self.mention = f"<@{id}>"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, StubUser) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return self.id
+
+    def mentioned_in(self, message) -> bool:
+        return message.mention_everyone or any(user.id == self.id for user in message.mentions)
+
+
+class StubGuild:
+    def __init__(self, id: int) -> None:
+        self.id = id
+        self.name = "Benchmark"
+
+
+class StubMessage:
+    _state = None
+
+    def __init__(self, content: str, author: StubUser, guild: StubGuild,
+                 mentions=(), reference=None) -> None:
+        self.content = content
+        self.author = author
+        self.guild = guild
+        self.mentions = list(mentions)
+        self.mention_everyone = False
+        self.reference = reference
+        self.type = discord.MessageType.reply if reference else discord.MessageType.default
+
+
+def synthetic_messages(count: int):
+    """70% chatter, 15% mentions, 10% replies and 5% commands."""
+    rng = random.Random(0)
+    guild = StubGuild(GUILD_ID)
+    users = [StubUser(100 + i) for i in range(50)]
+    chatter = ["hello there", "see you soon", "lol", "what is the plan for tonight", "nice one"]
+    commands = ["-ping", "?avatar", "!8ball will it work", ".help", "-choose a b c"]
+
+    messages = []
+    for _ in range(count):
+        author = rng.choice(users)
+        roll = rng.random()
+        if roll < 0.70:
+            messages.append(StubMessage(rng.choice(chatter), author, guild))
+        elif roll < 0.85:
+            mentioned = rng.choice(users)
+            messages.append(StubMessage(f"{mentioned.mention} hello", author, guild, mentions=[mentioned]))
+        elif roll < 0.95:
+            messages.append(StubMessage("agreed", author, guild, reference=object()))
+        else:
+            messages.append(StubMessage(rng.choice(commands), author, guild))
+    return messages
+
+
+async def legacy_stack(bot: Bot, message: StubMessage) -> None:
+    """The listener stack before the pipeline, up to each listener's first await."""
+    # MessageEvents.on_message
+    if message.author != bot.user:
+        if message.guild:
+            bot.settings.set_server_setting(message.guild.id, "server_name", message.guild.name)
+        bot.user.mentioned_in(message)
+
+    # Casual.on_message
+    if not message.author.bot:
+        ctx = await bot.get_context(message)
+        if ctx.valid and ctx.command and ctx.command.name == 'afk':
+            pass
+
+    # Fun.on_message
+    if not message.author.bot and (message.reference or message.mentions):
+        content = message.content.lower()
+        any(variant in content for variant in THANK_VARIANTS)
+
+    # Bot.process_commands
+    if not message.author.bot:
+        await bot.get_context(message)
+
+
+async def pipeline_stack(bot: Bot, listeners, message: StubMessage) -> None:
+    ctx = await bot.get_context(message)
+    facts = MessageFacts.from_context(ctx)
+    for listener in listeners:
+        await listener(ctx, facts)
+
+
+async def run() -> None:
+    os.chdir(tempfile.mkdtemp())
+    bot = Bot()
+    bot._connection.user = StubUser(1, bot=True)
+    bot.settings.set_server_setting(GUILD_ID, 'prefix', '$')
+
+    cogs = [MessageEvents(bot), Casual(bot), Fun(bot)]
+    for cog in cogs:
+        await bot.add_cog(cog)
+    listeners = [cog.on_message_context for cog in cogs]
+
+    messages = synthetic_messages(MESSAGES)
+    cases = {
+        'legacy stack': lambda message: legacy_stack(bot, message),
+        'pipeline': lambda message: pipeline_stack(bot, listeners, message),
+    }
+
+    for name, stack in cases.items():
+        for message in messages[:1000]:
+            await stack(message)
+
+        start = time.perf_counter()
+        for message in messages:
+            await stack(message)
+        elapsed = time.perf_counter() - start
+
+        print(f"{name:>12}: {MESSAGES / elapsed:10,.0f} messages/s, "
+              f"{elapsed / MESSAGES * 1e6:6.2f} us/message")
+
+    await bot.settings.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(run())
@@ -0,0 +1,72 @@
+"""Microbenchmark for cached merged settings views.
+
+Simulates the per-message settings reads (prefix resolution, a logging event
+and a starboard reaction) and compares the old `{**DEFAULT_SETTINGS, **guild}`
+merge against the cached read-only view.
+
+Run from the project root:
+    python -m benchmarks.settings_views
+"""
+import os
+import tempfile
+import timeit
+import tracemalloc
+
+from utils.settings.defaults import DEFAULT_SETTINGS
+from utils.settings.handler import ServerSettings
+from utils.settings.storage import JSONSettingsStorage
+
+READS_PER_MESSAGE = 3
+MESSAGES = 10_000
+GUILD_ID = 1234
+
+
+def legacy_get_all(settings: ServerSettings, guild_id: int):
+    return {**DEFAULT_SETTINGS, **settings._guild(str(guild_id))}
+
+
+def measure_allocations(get_all, settings: ServerSettings):
+    """Return (blocks, bytes) still allocated after MESSAGES simulated messages.
+
+    Results are kept alive so every dict built per read is counted.
+    """
+    kept = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(MESSAGES):
+        for _ in range(READS_PER_MESSAGE):
+            kept.append(get_all(settings, GUILD_ID))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, 'filename')
+    return sum(s.count_diff for s in stats), sum(s.size_diff for s in stats)
+
+
+def main() -> None:
+    os.chdir(tempfile.mkdtemp())
+    settings = ServerSettings(storage=JSONSettingsStorage('settings.json'))
+    settings.set_server_setting(GUILD_ID, 'prefix', '$')
+    settings.set_server_setting(GUILD_ID, 'log_channel_messages', 42)
+
+    cases = {
+        'legacy merge': legacy_get_all,
+        'cached view': lambda s, g: s.get_all_server_settings(g),
+    }
+
+    # Allocations made by the harness itself (growing the result list)
+    base_blocks, base_size = measure_allocations(lambda s, g: None, settings)
+
+    for name, get_all in cases.items():
+        get_all(settings, GUILD_ID)
+        blocks, size = measure_allocations(get_all, settings)
+        blocks = (blocks - base_blocks) / MESSAGES
+        size = max(size - base_size, 0) / MESSAGES
+        seconds = timeit.timeit(lambda: get_all(settings, GUILD_ID), number=MESSAGES * READS_PER_MESSAGE)
+        per_message_us = seconds / MESSAGES * 1e6
+        print(f"{name:>13}: {blocks:6.2f} allocations/message, "
+              f"{size:8.1f} bytes/message, {per_message_us:6.2f} us/message")
+
+
+if __name__ == '__main__':
+    main()
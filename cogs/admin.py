@@ -14,6 +14,22 @@ from discord.ext import commands
 
 logger = logging.getLogger(__name__)
 
+# Read-only subcommands anyone may use; everything else in this cog needs admin
+PUBLIC_COMMANDS = {'starboard top', 'starboard stats'}
+
+# Settings that hold more than a channel, so `config` leaves them to their own command
+MANAGED_SETTINGS = {'log_webhooks': 'logwebhooks'}
+
+
+def starboard_month(argument: str) -> Optional[str]:
+    """Convert a period argument to a 'YYYY-MM' month: 'month' for this one, 'all' for all time."""
+    argument = argument.lower()
+    if argument == 'all':
+        return None
+    if argument == 'month':
+        return datetime.utcnow().strftime('%Y-%m')
+    return datetime.strptime(argument, '%Y-%m').strftime('%Y-%m')
+
 class Admin(commands.Cog):
     """Admin-only commands for server management."""
     
@@ -23,6 +39,9 @@ class Admin(commands.Cog):
 
     async def cog_check(self, ctx: commands.Context) -> bool:
         """Check that user is administrator."""
+        if ctx.command is not None and ctx.command.qualified_name in PUBLIC_COMMANDS:
+            return True
+
         if str(ctx.author.id) in BOT_MASTERS or ctx.author == ctx.guild.owner:
             return True
 
@@ -94,6 +113,10 @@ class Admin(commands.Cog):
             await ctx.send(f"Unknown setting: `{setting}`")
             return
 
+        if setting in MANAGED_SETTINGS:
+            await ctx.send(f"`{setting}` is managed with `{ctx.prefix}{MANAGED_SETTINGS[setting]}`")
+            return
+
         if value and value.lower() == 'none':
             self.bot.settings.set_server_setting(ctx.guild.id, setting, None)
             await ctx.send(f"Cleared setting: `{setting}`")
@@ -156,6 +179,43 @@ class Admin(commands.Cog):
         
         await ctx.send(embed=embed.build())
 
+    #################################
+    ## Cache Stats Command
+    #################################
+    @commands.command(aliases=['cs'])
+    @PermissionHandler.is_bot_master()
+    async def cachestats(self, ctx: commands.Context) -> None:
+        """Show cache and log delivery counters. Bot developers only."""
+        sections = {
+            'User resolver': self.bot.user_resolver.stats,
+            'Log queue': self.bot.log_queue.stats,
+            'Log webhooks': self.bot.log_webhooks.stats,
+        }
+
+        logging_cog = self.bot.get_cog('LoggingEvents')
+        if logging_cog:
+            content = dict(logging_cog.content_store.stats)
+            content['bytes'] = f"{content['bytes'] / 1024:.1f} KiB"
+            if ctx.guild:
+                messages, size = logging_cog.content_store.guild_usage(ctx.guild.id)
+                content['this server'] = f"{messages} messages, {size / 1024:.1f} KiB"
+            sections['Message content store'] = content
+
+        tracking = self.bot.get_cog('MessageTrackingEvents')
+        if tracking:
+            snipes = dict(tracking.snipes.stats)
+            snipes['bytes'] = f"{snipes['bytes'] / 1024:.1f} KiB"
+            sections['Snipe store'] = snipes
+
+        embed = discord.Embed(title="Cache stats", color=0x2B2D31)
+        for name, stats in sections.items():
+            embed.add_field(
+                name=name,
+                value="\n".join(f"{key}: **{value}**" for key, value in stats.items()),
+                inline=True
+            )
+        await ctx.send(embed=embed)
+
     #################################
     ## Description Command
     #################################
@@ -427,6 +487,42 @@ class Admin(commands.Cog):
         await self._set_log_channel(ctx.guild.id, 'log_channel_mod_audit', None)
         await ctx.send("Mod audit logging has been disabled")
 
+    @commands.command(aliases=['lw'])
+    @PermissionHandler.has_permissions(administrator=True)
+    async def logwebhooks(self, ctx: commands.Context, log_type: Optional[str] = None) -> None:
+        """Toggle webhook delivery for a log type.
+        
+        Logs sent through a webhook don't share the bot's rate limits, so
+        busy log channels don't slow down command replies. Needs the
+        Manage Webhooks permission in the log channel.
+        
+        Log types: join_leave, messages, profiles, mod_audit
+        
+        Examples:
+        - `{prefix}logwebhooks`
+        - `{prefix}lw messages`
+        """
+        log_types = ('join_leave', 'messages', 'profiles', 'mod_audit')
+        enabled = list(self.bot.settings.get_server_setting(ctx.guild.id, 'log_webhooks') or [])
+
+        if log_type is None:
+            listed = ", ".join(f"`{t}`" for t in enabled) if enabled else "none"
+            await ctx.send(f"Log types sent through webhooks: {listed}")
+            return
+
+        if log_type not in log_types:
+            await ctx.send(f"Unknown log type. Choose from: {', '.join(f'`{t}`' for t in log_types)}")
+            return
+
+        if log_type in enabled:
+            enabled.remove(log_type)
+            await ctx.send(f"`{log_type}` logs will be sent by the bot")
+        else:
+            enabled.append(log_type)
+            await ctx.send(f"`{log_type}` logs will be sent through a webhook")
+
+        self.bot.settings.set_server_setting(ctx.guild.id, 'log_webhooks', enabled)
+
     @commands.group(aliases=['sb'], invoke_without_command=True)
     @PermissionHandler.has_permissions(administrator=True)
     async def starboard(self, ctx: commands.Context, channel: Optional[discord.TextChannel] = None) -> None:
@@ -436,6 +532,8 @@ class Admin(commands.Cog):
         - view: Show current starboard channel
         - disable: Disable starboard
         - limit <number>: Set minimum stars needed (default: 3)
+        - top: Most starred messages and authors (anyone)
+        - stats [member]: Starboard totals for the server or a member (anyone)
         
         Examples:
         - `{prefix}starboard #starboard-channel`
@@ -443,6 +541,8 @@ class Admin(commands.Cog):
         - `{prefix}starboard view`
         - `{prefix}starboard disable`
         - `{prefix}starboard limit 5`
+        - `{prefix}sb top`
+        - `{prefix}sb stats @user`
         """
         if ctx.invoked_subcommand is None:
             if not channel:
@@ -486,6 +586,90 @@ class Admin(commands.Cog):
         await self._set_log_channel(ctx.guild.id, 'starboard_channel', None)
         await ctx.send("Starboard has been disabled")
 
+    def _starboard_store(self):
+        starboard = self.bot.get_cog('StarboardEvents')
+        return starboard.store if starboard else None
+
+    @starboard.command(name='top', aliases=['leaderboard', 'lb'])
+    async def starboard_top(self, ctx: commands.Context, month: starboard_month = None) -> None:
+        """Show the most starred messages and authors.
+
+        Months go by when the starred message was sent.
+
+        Examples:
+        - `{prefix}starboard top`
+        - `{prefix}starboard top month`
+        - `{prefix}starboard top 2025-04`
+        """
+        store = self._starboard_store()
+        if store is None:
+            await ctx.send("The starboard is not running")
+            return
+
+        posts = await store.top_posts(ctx.guild.id, limit=10, month=month)
+        authors = await store.top_authors(ctx.guild.id, limit=10, month=month)
+        if not posts:
+            await ctx.send(f"Nothing was starred in {month}" if month else "Nothing has been starred yet")
+            return
+
+        # Message links are long, so they go in the description rather than a 1024 character field
+        embed = discord.Embed(
+            title=f"Starboard leaderboard - {month}" if month else "Starboard leaderboard",
+            color=0xFFAC33,
+            description="**Top messages**\n" + "\n".join(
+                f"**{i}.** ⭐ {post.stars} - "
+                f"[jump](https://discord.com/channels/{ctx.guild.id}/{post.channel_id}/{post.message_id})"
+                + (f" by <@{post.author_id}>" if post.author_id else "")
+                for i, post in enumerate(posts, 1)
+            )
+        )
+        if authors:
+            embed.add_field(
+                name="Top authors",
+                value="\n".join(
+                    f"**{i}.** <@{author_id}> - ⭐ {stars} across {count} post{'s' if count != 1 else ''}"
+                    for i, (author_id, stars, count) in enumerate(authors, 1)
+                ),
+                inline=False
+            )
+        await ctx.send(embed=embed, allowed_mentions=discord.AllowedMentions.none())
+
+    @starboard.command(name='stats')
+    async def starboard_stats(self, ctx: commands.Context, member: Optional[discord.Member] = None,
+                              month: starboard_month = None) -> None:
+        """Show starboard totals for the server, or for a member.
+
+        Examples:
+        - `{prefix}starboard stats`
+        - `{prefix}starboard stats @user month`
+        - `{prefix}starboard stats 2025-04`
+        """
+        store = self._starboard_store()
+        if store is None:
+            await ctx.send("The starboard is not running")
+            return
+
+        embed = discord.Embed(color=0xFFAC33)
+        if month:
+            embed.set_footer(text=month)
+        if member:
+            stars, posts, rank = await store.author_stats(ctx.guild.id, member.id, month=month)
+            embed.set_author(name=member.name, icon_url=member.display_avatar.url)
+            if not posts:
+                embed.description = "No starboard posts yet"
+            else:
+                embed.add_field(name="Stars", value=stars, inline=True)
+                embed.add_field(name="Posts", value=posts, inline=True)
+                embed.add_field(name="Rank", value=f"#{rank}", inline=True)
+        else:
+            stars, posts, authors = await store.guild_stats(ctx.guild.id, month=month)
+            embed.title = "Starboard stats"
+            embed.add_field(name="Stars", value=stars, inline=True)
+            embed.add_field(name="Posts", value=posts, inline=True)
+            embed.add_field(name="Authors", value=authors, inline=True)
+
+        await ctx.send(embed=embed)
+
 async def setup(bot: commands.Bot) -> None:
     """Load the Admin cog."""
     await bot.add_cog(Admin(bot))
@@ -1,18 +1,15 @@
 import discord
 from discord.ext import commands
-import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime
 import parsedatetime
 import time
 import re
-import aiohttp
 from config import STEAM_API_KEY
 
 class Casual(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.cal = parsedatetime.Calendar()
-        self.active_reminders = {}
         self.afk_users = {}
         
     #################################
@@ -84,7 +81,7 @@ class Casual(commands.Cog):
                 user = ctx.author
             else:
                 user_id = user_id.strip('<@!>')
-                user = await self.bot.fetch_user(int(user_id))
+                user = await self.bot.user_resolver.resolve(int(user_id))
             
             member = ctx.guild.get_member(user.id) if ctx.guild else None
             
@@ -129,7 +126,7 @@ class Casual(commands.Cog):
                 user = ctx.author
             else:
                 user_id = user_id.strip('<@!>')
-                user = await self.bot.fetch_user(int(user_id))
+                user = await self.bot.user_resolver.resolve(int(user_id))
 
             member = ctx.guild.get_member(user.id) if ctx.guild else None
 
@@ -153,11 +150,9 @@ class Casual(commands.Cog):
     async def banner(self, ctx, user_id: str = None):
         """Get a user's banner"""
         try:
-            if user_id is None:
-                user = ctx.author
-            else:
-                user_id = user_id.strip('<@!>')
-                user = await self.bot.fetch_user(int(user_id))
+            # Banners are only present on fetched users
+            user_id = ctx.author.id if user_id is None else int(user_id.strip('<@!>'))
+            user = await self.bot.user_resolver.resolve(user_id, fetch=True)
 
             if not user.banner:
                 await ctx.send(f"**{user.name}** doesn't have a banner!")
@@ -214,23 +209,20 @@ class Casual(commands.Cog):
         if total_seconds == 0:
             await ctx.send("Please specify a valid duration!")
             return
-            
-        if total_seconds > 2592000:
-            await ctx.send("Reminder time too far in the future (max 30 days)")
+
+        # Reminders are persisted, so only guard against nonsensical values
+        if total_seconds > 100 * 365 * 24 * 60 * 60:
+            await ctx.send("Reminder time too far in the future")
             return
             
-        reminder_time = datetime.now() + timedelta(seconds=total_seconds)
-        reminder_id = f"{ctx.author.id}-{int(time.time())}"
-        
-        if not hasattr(self, 'active_reminders'):
-            self.active_reminders = {}
-        
-        self.active_reminders[reminder_id] = {
-            'channel_id': ctx.channel.id,
-            'author_id': ctx.author.id,
-            'text': reminder_text,
-            'time': reminder_time.isoformat()
-        }
+        expires_at = time.time() + total_seconds
+        await self.bot.timers.create(
+            'reminder',
+            expires_at,
+            owner_id=ctx.author.id,
+            channel_id=ctx.channel.id,
+            text=reminder_text
+        )
         
         hours = total_seconds // 3600
         minutes = (total_seconds % 3600) // 60
@@ -242,16 +234,14 @@ class Casual(commands.Cog):
             confirm_msg += f"{int(minutes)} minutes"
         
         await ctx.reply(confirm_msg, ephemeral=True)
-        
-        async def remind():
-            await asyncio.sleep(total_seconds)
-            if reminder_id in self.active_reminders:
-                channel = self.bot.get_channel(ctx.channel.id)
-                if channel:
-                    await channel.send(f"# {reminder_text}\n-# Here is your reminder, {ctx.author.mention}")
-                del self.active_reminders[reminder_id]
-                
-        self.bot.loop.create_task(remind())
+
+    @commands.Cog.listener()
+    async def on_reminder_timer_complete(self, timer):
+        """Deliver a reminder once its timer fires"""
+        channel = self.bot.get_channel(timer.data['channel_id'])
+        if channel:
+            await channel.send(f"# {timer.data['text']}\n-# Here is your reminder, <@{timer.owner_id}>")
+        await self.bot.timers.complete(timer)
 
     #################################
     ## Reminders Command
@@ -259,11 +249,7 @@ class Casual(commands.Cog):
     @commands.command()
     async def reminders(self, ctx):
         """List your active reminders"""
-        if not hasattr(self, 'active_reminders'):
-            self.active_reminders = {}
-            
-        user_reminders = {k: v for k, v in self.active_reminders.items() 
-                         if v['author_id'] == ctx.author.id}
+        total, user_reminders = await self.bot.timers.owner_timers('reminder', ctx.author.id)
         
         if not user_reminders:
             await ctx.send("You have no active reminders!")
@@ -271,11 +257,15 @@ class Casual(commands.Cog):
             
         embed = discord.Embed(title="Your active reminders", color=0x2B2D31)
         
-        for reminder_id, reminder in user_reminders.items():
-            reminder_time = datetime.fromisoformat(reminder['time'])
-            time_left = reminder_time - datetime.now()
-            hours = int(time_left.total_seconds() // 3600)
-            minutes = int((time_left.total_seconds() % 3600) // 60)
+        for reminder in user_reminders:
+            time_left = reminder.expires - time.time()
+            if time_left <= 0:
+                # Fired, but delivery failed and is being retried
+                embed.add_field(name="Pending delivery", value=reminder.data['text'], inline=False)
+                continue
+
+            hours = int(time_left // 3600)
+            minutes = int((time_left % 3600) // 60)
             
             time_str = ""
             if hours > 0:
@@ -285,9 +275,12 @@ class Casual(commands.Cog):
                 
             embed.add_field(
                 name=f"In {time_str}",
-                value=reminder['text'],
+                value=reminder.data['text'],
                 inline=False
             )
+
+        if total > len(user_reminders):
+            embed.set_footer(text=f"Next {len(user_reminders)} of {total} reminders")
             
         await ctx.send(embed=embed)
 
@@ -386,14 +379,14 @@ class Casual(commands.Cog):
         await ctx.send(f"You are now AFK:\n**{message}**")
 
     @commands.Cog.listener()
-    async def on_message(self, message):
-        if message.author.bot:
+    async def on_message_context(self, ctx, facts):
+        if facts.is_bot or not self.afk_users:
             return
 
-        ctx = await self.bot.get_context(message)
-        if ctx.valid and ctx.command and ctx.command.name == 'afk':
+        if facts.is_command and ctx.command.name == 'afk':
             return
 
+        message = ctx.message
         if message.author.id in self.afk_users:
             del self.afk_users[message.author.id]
             await message.channel.send(f"Welcome back {message.author.mention}, I've removed your AFK status!")
@@ -450,9 +443,20 @@ class Casual(commands.Cog):
             return
         
         if "steamcommunity.com" not in steam_id and not steam_id.isdigit():
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"https://api.steampowered.com/ISteamUser/ResolveVanityURL/v1/?key={STEAM_API_KEY}&vanityurl={steam_id}"
+            async with self.bot.session.get(
+                f"https://api.steampowered.com/ISteamUser/ResolveVanityURL/v1/?key={STEAM_API_KEY}&vanityurl={steam_id}"
+            ) as resp:
+                data = await resp.json()
+                if data['response'].get('success') == 1:
+                    steam_id = data['response']['steamid']
+                else:
+                    await ctx.send("Could not find Steam profile!")
+                    return
+        elif "steamcommunity.com" in steam_id:
+            if "/id/" in steam_id:
+                custom_url = steam_id.split("/id/")[1].split("/")[0]
+                async with self.bot.session.get(
+                    f"https://api.steampowered.com/ISteamUser/ResolveVanityURL/v1/?key={STEAM_API_KEY}&vanityurl={custom_url}"
                 ) as resp:
                     data = await resp.json()
                     if data['response'].get('success') == 1:
@@ -460,27 +464,13 @@ class Casual(commands.Cog):
                     else:
                         await ctx.send("Could not find Steam profile!")
                         return
-        elif "steamcommunity.com" in steam_id:
-            if "/id/" in steam_id:
-                custom_url = steam_id.split("/id/")[1].split("/")[0]
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        f"https://api.steampowered.com/ISteamUser/ResolveVanityURL/v1/?key={STEAM_API_KEY}&vanityurl={custom_url}"
-                    ) as resp:
-                        data = await resp.json()
-                        if data['response'].get('success') == 1:
-                            steam_id = data['response']['steamid']
-                        else:
-                            await ctx.send("Could not find Steam profile!")
-                            return
             elif "/profiles/" in steam_id:
                 steam_id = steam_id.split("/profiles/")[1].split("/")[0]
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/?key={STEAM_API_KEY}&steamids={steam_id}"
-            ) as resp:
-                data = await resp.json()
+        async with self.bot.session.get(
+            f"https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/?key={STEAM_API_KEY}&steamids={steam_id}"
+        ) as resp:
+            data = await resp.json()
                 
         if not data['response']['players']:
             await ctx.send("Could not find Steam profile!")
@@ -560,12 +550,11 @@ class Casual(commands.Cog):
     async def github(self, ctx, *, username: str):
         """Display a GitHub profile"""
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"https://api.github.com/users/{username}") as resp:
-                if resp.status != 200:
-                    await ctx.send("Could not find GitHub profile!")
-                    return
-                data = await resp.json()
+        async with self.bot.session.get(f"https://api.github.com/users/{username}") as resp:
+            if resp.status != 200:
+                await ctx.send("Could not find GitHub profile!")
+                return
+            data = await resp.json()
                 
         embed = discord.Embed(
             title=data['login'],
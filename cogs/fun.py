@@ -1,16 +1,17 @@
 import random
-import json
 import discord
 import shlex
 from datetime import datetime, timedelta
 from typing import Union, Optional
 import urllib.parse
-import aiohttp
 import re
 
 from discord.ext import commands
 from utils.helpers.formatting import EmbedBuilder, TextFormatter
 from utils.permissions.handler import PermissionHandler
+from utils.helpers.files import read_json, update_json
+
+COOKIE_FILE = 'data/cookies.json'
 
 class Fun(commands.Cog):
     def __init__(self, bot):
@@ -282,14 +283,23 @@ class Fun(commands.Cog):
     ###########################
     ## Cookie System Commands
     ###########################
+    @staticmethod
+    def _cookie_entry(cookie_data: dict, user_id: int) -> list:
+        """Return a user's [cookies, eaten] entry, upgrading legacy int counts."""
+        key = str(user_id)
+        entry = cookie_data.get(key)
+        if isinstance(entry, int):
+            entry = cookie_data[key] = [entry, 0]
+        elif entry is None:
+            entry = cookie_data[key] = [0, 0]
+        return entry
+
     @commands.Cog.listener()
-    async def on_message(self, message):
-        if message.author.bot:
-            return
-        
-        if not (message.reference or message.mentions):
+    async def on_message_context(self, ctx, facts):
+        if facts.is_bot or not (facts.is_reply or facts.has_mentions):
             return
         
+        message = ctx.message
         content = message.content.lower()
         thank_variants = ['thank', 'thanks', 'thx', 'ty', 'tysm', 'tyvm', 'thank you', 'thankyou', 'thnks']
         
@@ -309,23 +319,10 @@ class Fun(commands.Cog):
         if not thanked_user or thanked_user.bot or thanked_user == message.author:
             return
         
-        cookie_file = 'data/cookies.json'
-        try:
-            with open(cookie_file, 'r') as f:
-                cookie_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            cookie_data = {}
-        
-        if str(thanked_user.id) in cookie_data:
-            if isinstance(cookie_data[str(thanked_user.id)], int):
-                cookie_data[str(thanked_user.id)] = [cookie_data[str(thanked_user.id)], 0]
-        else:
-            cookie_data[str(thanked_user.id)] = [0, 0]
-        
-        cookie_data[str(thanked_user.id)][0] += 1
-        
-        with open(cookie_file, 'w') as f:
-            json.dump(cookie_data, f, indent=2)
+        def add_cookie(cookie_data: dict) -> None:
+            self._cookie_entry(cookie_data, thanked_user.id)[0] += 1
+
+        await update_json(COOKIE_FILE, add_cookie, indent=2)
         
         await message.channel.send(f"{thanked_user.display_name} gained a cookie!")
 
@@ -334,20 +331,8 @@ class Fun(commands.Cog):
         """Check how many cookies someone has"""
         member = member or ctx.author
         
-        try:
-            with open('data/cookies.json', 'r') as f:
-                cookie_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            cookie_data = {}
-        
-        if str(member.id) in cookie_data:
-            if isinstance(cookie_data[str(member.id)], int):
-                cookie_data[str(member.id)] = [cookie_data[str(member.id)], 0]
-                with open('data/cookies.json', 'w') as f:
-                    json.dump(cookie_data, f, indent=2)
-        
-        user_data = cookie_data.get(str(member.id), [0, 0])
-        cookie_count, eaten_count = user_data
+        cookie_data = await read_json(COOKIE_FILE, {})
+        cookie_count, eaten_count = self._cookie_entry(cookie_data, member.id)
         
         cookie_text = "cookie" if cookie_count == 1 else "cookies"
         eaten_text = "cookie" if eaten_count == 1 else "cookies"
@@ -362,25 +347,21 @@ class Fun(commands.Cog):
             await ctx.send("You can't eat a negative number of cookies!")
             return
         
-        try:
-            with open('data/cookies.json', 'r') as f:
-                cookie_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            cookie_data = {}
-        
-        user_data = cookie_data.get(str(ctx.author.id), [0, 0])
-        user_cookies, eaten_cookies = user_data
+        def eat_cookies(cookie_data: dict) -> int:
+            entry = self._cookie_entry(cookie_data, ctx.author.id)
+            if entry[0] >= amount:
+                entry[0] -= amount
+                entry[1] += amount
+                return entry[0] + amount
+            return entry[0]
+
+        user_cookies = await update_json(COOKIE_FILE, eat_cookies, indent=2)
         
         if user_cookies < amount:
             cookie_text = "cookie" if user_cookies == 1 else "cookies"
             await ctx.send(f"You have **{user_cookies}** {cookie_text}")
             return
         
-        cookie_data[str(ctx.author.id)] = [user_cookies - amount, eaten_cookies + amount]
-        
-        with open('data/cookies.json', 'w') as f:
-            json.dump(cookie_data, f, indent=2)
-        
         remaining = user_cookies - amount
         remaining_text = "cookie" if remaining == 1 else "cookies"
         amount_text = "cookie" if amount == 1 else "cookies"
@@ -405,37 +386,22 @@ class Fun(commands.Cog):
             await ctx.send("You can't give cookies to yourself!")
             return
         
-        try:
-            with open('data/cookies.json', 'r') as f:
-                cookie_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            cookie_data = {}
-        
-        if str(ctx.author.id) in cookie_data:
-            if isinstance(cookie_data[str(ctx.author.id)], int):
-                cookie_data[str(ctx.author.id)] = [cookie_data[str(ctx.author.id)], 0]
-        else:
-            cookie_data[str(ctx.author.id)] = [0, 0]
-        
-        if str(member.id) in cookie_data:
-            if isinstance(cookie_data[str(member.id)], int):
-                cookie_data[str(member.id)] = [cookie_data[str(member.id)], 0]
-        else:
-            cookie_data[str(member.id)] = [0, 0]
-        
-        user_cookies = cookie_data[str(ctx.author.id)][0]
+        def give_cookies(cookie_data: dict) -> int:
+            giver = self._cookie_entry(cookie_data, ctx.author.id)
+            receiver = self._cookie_entry(cookie_data, member.id)
+            if giver[0] >= amount:
+                giver[0] -= amount
+                receiver[0] += amount
+                return giver[0] + amount
+            return giver[0]
+
+        user_cookies = await update_json(COOKIE_FILE, give_cookies, indent=2)
         
         if user_cookies < amount:
             cookie_text = "cookie" if user_cookies == 1 else "cookies"
             await ctx.send(f"You have **{user_cookies}** {cookie_text}")
             return
         
-        cookie_data[str(ctx.author.id)][0] = user_cookies - amount
-        cookie_data[str(member.id)][0] += amount
-        
-        with open('data/cookies.json', 'w') as f:
-            json.dump(cookie_data, f, indent=2)
-        
         if amount == 1:
             await ctx.send(f"You gave a cookie to {member.display_name}")
         else:
@@ -668,34 +634,61 @@ class Fun(commands.Cog):
         await ctx.send(f"{choice}")
 
     @commands.command()
-    async def snipe(self, ctx):
-        """Shows the last deleted message in the channel"""
-        message_events = self.bot.get_cog('MessageEvents')
-        if not message_events:
+    async def snipe(self, ctx, index: int = 1):
+        """Shows a recently deleted message in the channel (1 is the latest)"""
+        tracking = self.bot.get_cog('MessageTrackingEvents')
+        if not tracking:
             return
             
-        guild_deletes = message_events.deleted_messages.get(ctx.guild.id, {})
-        deleted_msg = guild_deletes.get(ctx.channel.id)
+        deleted_msg = tracking.snipes.deleted(ctx.channel.id, index)
         
         if not deleted_msg:
             await ctx.send("There's nothing to snipe!")
             return
             
         embed = discord.Embed(
-            description=deleted_msg['content'] or "*No text content*",
+            description=deleted_msg.content or "*No text content*",
             color=0x2B2D31
         )
         
         embed.set_author(
-            name=deleted_msg['author'].name,
-            icon_url=deleted_msg['author'].display_avatar.url
+            name=deleted_msg.author_name,
+            icon_url=deleted_msg.avatar_url
         )
         
-        if deleted_msg['reference']:
-            embed.description += f"\n\nReplying to [this message]({ctx.channel.jump_url}/{deleted_msg['reference']})"
+        if deleted_msg.reference_id:
+            embed.description += f"\n\nReplying to [this message]({ctx.channel.jump_url}/{deleted_msg.reference_id})"
+            
+        if deleted_msg.image_url:
+            embed.set_image(url=deleted_msg.image_url)
+            
+        embed.set_footer(text=f"Sniped by {ctx.author.name}")
+        
+        await ctx.send(embed=embed)
+
+    @commands.command(aliases=['esnipe', 'es'])
+    async def editsnipe(self, ctx, index: int = 1):
+        """Shows a recently edited message in the channel (1 is the latest)"""
+        tracking = self.bot.get_cog('MessageTrackingEvents')
+        if not tracking:
+            return
+            
+        edited_msg = tracking.snipes.edited(ctx.channel.id, index)
+        
+        if not edited_msg:
+            await ctx.send("There's nothing to snipe!")
+            return
             
-        if deleted_msg['attachments']:
-            embed.set_image(url=deleted_msg['attachments'][0])
+        embed = discord.Embed(color=0x2B2D31)
+        
+        embed.set_author(
+            name=edited_msg.author_name,
+            icon_url=edited_msg.avatar_url
+        )
+        
+        embed.add_field(name="Before", value=edited_msg.content[:1024] or "*No text content*", inline=False)
+        embed.add_field(name="After", value=edited_msg.after[:1024] or "*No text content*", inline=False)
+        embed.add_field(name="", value=f"[Jump to message]({edited_msg.jump_url})", inline=False)
             
         embed.set_footer(text=f"Sniped by {ctx.author.name}")
         
@@ -717,7 +710,7 @@ class Fun(commands.Cog):
 
         from utils.helpers.strings import get_random
 
-        action = get_random('user_was_x', ["beaned"]) 
+        action = await get_random('user_was_x', ["beaned"]) 
         await ctx.send(f"**{member.display_name}** was {action}")
 
     @commands.command(name='8ball', aliases=['8'])
@@ -746,11 +739,10 @@ class Fun(commands.Cog):
     async def urban(self, ctx, *, word: str):
         """Search Urban Dictionary for a word"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"https://api.urbandictionary.com/v0/define?term={urllib.parse.quote(word)}"
-                ) as resp:
-                    data = await resp.json()
+            async with self.bot.session.get(
+                f"https://api.urbandictionary.com/v0/define?term={urllib.parse.quote(word)}"
+            ) as resp:
+                data = await resp.json()
                     
             if not data['list']:
                 await ctx.send("No results found!")
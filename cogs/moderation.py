@@ -1,12 +1,13 @@
 import discord
+import io
 import random
-import json
 import re
 import base64
 import time
-from typing import Union, Dict, Any, Optional
+from typing import Union, Dict, Any, List, Optional, Tuple
 import asyncio
 import logging
+import sqlite3
 
 from utils.permissions.handler import PermissionHandler
 from config import BOT_MASTERS
@@ -14,15 +15,30 @@ from discord.ext import commands
 from datetime import datetime, timedelta
 from utils.helpers.formatting import TextFormatter, EmbedBuilder
 from utils.helpers.time import TimeParser
+from utils.moderation.cases import CaseStore
 
+logger = logging.getLogger(__name__)
+
+CASE_ID_ATTEMPTS = 5                  # New IDs to try when one already exists in the guild
+MASSBAN_CHUNK_SIZE = 200              # Users per bulk ban request (API maximum)
+MASSBAN_CONCURRENCY = 5               # Parallel single bans when bulk banning is unavailable
+MASSBAN_MAX_FILE_SIZE = 1024 * 1024   # Largest ID list attachment accepted
+MASSBAN_ID_REGEX = re.compile(rb'(?<!\d)\d{17,20}(?!\d)')  # Snowflake-length runs of digits only
 
 class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.mod_log_file = "data/mod_logs.json"
+        self.cases = CaseStore()
         self.last_case_time = 0
         self.case_counter = 0
 
+    async def cog_load(self):
+        await self.cases.import_legacy(self.mod_log_file)
+
+    async def cog_unload(self):
+        await self.cases.close()
+
     def generate_case_id(self) -> str:
         """Generate a unique case ID based on timestamp"""
         current_time = int(time.time())
@@ -33,45 +49,29 @@ class Moderation(commands.Cog):
             self.last_case_time = current_time
             self.case_counter = 0
         
-        unique_num = (current_time << 16) | (self.case_counter << 8) | random.randint(0, 255)
-        case_id = base64.b32encode(unique_num.to_bytes(8, 'big')).decode('utf-8').rstrip('=')[:8]
+        # 40 bits: low 24 bits of the timestamp, counter, random byte
+        unique_num = ((current_time & 0xFFFFFF) << 16) | ((self.case_counter & 0xFF) << 8) | random.randint(0, 255)
+        case_id = base64.b32encode(unique_num.to_bytes(5, 'big')).decode('utf-8')
         return case_id
 
     async def save_mod_action(self, guild_id: int, action: dict):
         """Save a moderation action to the records"""
-        try:
-            with open(self.mod_log_file, 'r') as f:
-                records = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            records = {}
+        user = await self.bot.user_resolver.resolve(action['user_id'])
+        username = f"{user.name}#{user.discriminator}" if user.discriminator != '0' else user.name
 
-        guild_id = str(guild_id)
-        if guild_id not in records:
-            records[guild_id] = {'cases': {}, 'users': {}}
-
-        case_id = self.generate_case_id()
-        action['case_id'] = case_id
         action['timestamp'] = datetime.utcnow().isoformat()
-        
-        records[guild_id]['cases'][case_id] = action
-        
-        user_id = str(action['user_id'])
-        user = await self.bot.fetch_user(action['user_id'])
-        
-        if user_id not in records[guild_id]['users']:
-            records[guild_id]['users'][user_id] = {
-                'username': f"{user.name}#{user.discriminator}" if user.discriminator != '0' else user.name,
-                'case_ids': []
-            }
-        else:
-            records[guild_id]['users'][user_id]['username'] = f"{user.name}#{user.discriminator}" if user.discriminator != '0' else user.name
-                
-        records[guild_id]['users'][user_id]['case_ids'].append(case_id)
 
-        with open(self.mod_log_file, 'w') as f:
-            json.dump(records, f, indent=2)
-            
-        return case_id
+        # IDs reuse their timestamp bits every ~194 days, so retry on the rare clash
+        for attempt in range(CASE_ID_ATTEMPTS):
+            case_id = self.generate_case_id()
+            action['case_id'] = case_id
+            try:
+                await self.cases.add_case(guild_id, action, username)
+                return case_id
+            except sqlite3.IntegrityError:
+                if attempt == CASE_ID_ATTEMPTS - 1:
+                    raise
+                logger.warning(f"Case ID {case_id} already exists in guild {guild_id}, generating another")
 
     @commands.command(aliases=['history', 'infractions'])
     @PermissionHandler.has_permissions(kick_members=True)
@@ -80,22 +80,18 @@ class Moderation(commands.Cog):
         try:
             if isinstance(user, str):
                 if user.isdigit():
-                    user = await self.bot.fetch_user(int(user))
+                    user = await self.bot.user_resolver.resolve(int(user), ctx.guild)
                 else:
                     mention_match = re.match(r'<@!?(\d+)>', user)
                     if mention_match:
-                        user = await self.bot.fetch_user(int(mention_match.group(1)))
+                        user = await self.bot.user_resolver.resolve(int(mention_match.group(1)), ctx.guild)
                     else:
                         await ctx.send("Please provide a valid user ID or mention.")
                         return
 
-            with open(self.mod_log_file, 'r') as f:
-                records = json.load(f)
-
-            guild_records = records.get(str(ctx.guild.id), {})
-            user_data = guild_records.get('users', {}).get(str(user.id))
+            total, cases = await self.cases.user_cases(ctx.guild.id, user.id, limit=10)
 
-            if not user_data or not user_data.get('case_ids', []):
+            if not total:
                 await ctx.send(f"No moderation records found for {user.mention}")
                 return
 
@@ -105,18 +101,11 @@ class Moderation(commands.Cog):
                 timestamp=datetime.utcnow()
             )
             
-            embed.description = f"**{user.name}**\nMention: {user.mention}\n```javascript\nID: {user.id}```\n**Total records:** {len(user_data['case_ids'])}"
+            embed.description = f"**{user.name}**\nMention: {user.mention}\n```javascript\nID: {user.id}```\n**Total records:** {total}"
             embed.set_thumbnail(url=user.display_avatar.url)
 
-            cases = guild_records.get('cases', {})
-            cases_to_show = user_data['case_ids'][-10:]
-            cases_to_show.reverse()
-            
-            for case_id in cases_to_show:
-                if case_id not in cases:
-                    continue
-                    
-                record = cases[case_id]
+            for record in cases:
+                case_id = record['case_id']
                 action_time = datetime.fromisoformat(record['timestamp'])
                 moderator = ctx.guild.get_member(record['mod_id'])
                 mod_name = moderator.name if moderator else "Unknown moderator"
@@ -133,13 +122,9 @@ class Moderation(commands.Cog):
                     inline=False
                 )
 
-            embed.set_footer(text=f"Most recent {min(len(user_data['case_ids']), 10)} of {len(user_data['case_ids'])} records")
+            embed.set_footer(text=f"Most recent {len(cases)} of {total} records")
             await ctx.send(embed=embed)
 
-        except FileNotFoundError:
-            await ctx.send("No moderation records exist yet")
-        except json.JSONDecodeError:
-            await ctx.send("Error reading moderation records")
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
 
@@ -148,24 +133,19 @@ class Moderation(commands.Cog):
     async def editrecord(self, ctx, case_id: str, *, new_reason: str):
         """Edit the reason for a moderation case"""
         try:
-            with open(self.mod_log_file, 'r') as f:
-                records = json.load(f)
-                
-            guild_records = records.get(str(ctx.guild.id), {})
-            case = guild_records.get('cases', {}).get(case_id)
+            case = await self.cases.update_case(
+                ctx.guild.id,
+                case_id,
+                reason=new_reason,
+                edited_by=ctx.author.id,
+                edited_at=datetime.utcnow().isoformat()
+            )
             
             if not case:
                 await ctx.send(f"Case ID `{case_id}` not found.")
                 return
             
-            case['reason'] = new_reason
-            case['edited_by'] = ctx.author.id
-            case['edited_at'] = datetime.utcnow().isoformat()
-            
-            with open(self.mod_log_file, 'w') as f:
-                json.dump(records, f, indent=2)
-            
-            user = ctx.guild.get_member(case['user_id']) or await ctx.guild.fetch_member(case['user_id'])
+            user = await self.bot.user_resolver.resolve(case['user_id'], ctx.guild)
             mod = ctx.guild.get_member(case['mod_id'])
             
             embed = discord.Embed(
@@ -212,7 +192,7 @@ class Moderation(commands.Cog):
                 await self.log_mod_action(ctx, "Kick", member, case_id, reason=reason)
 
                 from utils.helpers.strings import get_random
-                action = get_random('user_was_x', ['kicked'])
+                action = await get_random('user_was_x', ['kicked'])
                 await ctx.send(f"**{member.name}** was {action}")
             except discord.Forbidden:
                 await ctx.send("I don't have permission to kick that user!")
@@ -228,10 +208,10 @@ class Moderation(commands.Cog):
         
         if user_input.startswith('<@') and user_input.endswith('>'):
             user_id = int(user_input[2:-1].replace('!', ''))
-            user = ctx.guild.get_member(user_id) or await self.bot.fetch_user(user_id)
+            user = await self.bot.user_resolver.resolve(user_id, ctx.guild)
         elif user_input.isdigit():
             user_id = int(user_input)
-            user = ctx.guild.get_member(user_id) or await self.bot.fetch_user(user_id)
+            user = await self.bot.user_resolver.resolve(user_id, ctx.guild)
         else:
             user = discord.utils.find(
                 lambda m: str(m) == user_input or m.name == user_input,
@@ -266,6 +246,7 @@ class Moderation(commands.Cog):
 
             try:
                 await ctx.guild.ban(user, reason=reason)
+                await self._cancel_tempbans(ctx.guild.id, user.id)
                 case_id = await self.save_mod_action(ctx.guild.id, {
                     'user_id': user.id,
                     'mod_id': ctx.author.id,
@@ -276,7 +257,7 @@ class Moderation(commands.Cog):
                 await self.log_mod_action(ctx, "Ban", user, case_id, reason=reason)
 
                 from utils.helpers.strings import get_random
-                action = get_random('user_was_x', ['banned'])
+                action = await get_random('user_was_x', ['banned'])
                 await ctx.reply(f"**{user}** was {action}")
             except discord.Forbidden:
                 await ctx.send("I don't have permission to ban that user!")
@@ -304,6 +285,7 @@ class Moderation(commands.Cog):
                     return
 
             await ctx.guild.ban(user, reason=reason or "Silent ban")
+            await self._cancel_tempbans(ctx.guild.id, user.id)
             case_id = await self.save_mod_action(ctx.guild.id, {
                 'user_id': user.id,
                 'mod_id': ctx.author.id,
@@ -343,6 +325,7 @@ class Moderation(commands.Cog):
                 return
 
             await ctx.guild.unban(user)
+            await self._cancel_tempbans(ctx.guild.id, user.id)
             await ctx.send(f"**{user.name}** has been unbanned")
 
         except discord.Forbidden:
@@ -514,7 +497,7 @@ class Moderation(commands.Cog):
             return True
 
         try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
+            deleted = await self._purge(ctx, search + 1, check)
             await self.log_bulk_delete(ctx, len(deleted) - 1, member)
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
@@ -533,7 +516,7 @@ class Moderation(commands.Cog):
             return False
 
         try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
+            deleted = await self._purge(ctx, search + 1, check)
             await self.log_bulk_delete(ctx, len(deleted) - 1, None, f"Bot messages {f'with prefix {prefix}' if prefix else ''}")
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
@@ -546,7 +529,7 @@ class Moderation(commands.Cog):
             return not message.pinned and substring.lower() in message.content.lower()
 
         try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
+            deleted = await self._purge(ctx, search + 1, check)
             await self.log_bulk_delete(ctx, len(deleted) - 1, None, f"Messages containing: {substring}")
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
@@ -559,7 +542,7 @@ class Moderation(commands.Cog):
             return message.author == ctx.bot.user
 
         try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
+            deleted = await self._purge(ctx, search + 1, check)
             await self.log_bulk_delete(ctx, len(deleted) - 1, ctx.bot.user)
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
@@ -572,7 +555,7 @@ class Moderation(commands.Cog):
             return not message.pinned and (message.embeds or message.attachments)
 
         try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
+            deleted = await self._purge(ctx, search + 1, check)
             await self.log_bulk_delete(ctx, len(deleted) - 1, None, "Messages with embeds")
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
@@ -585,7 +568,7 @@ class Moderation(commands.Cog):
             return not message.pinned and re.search(r'<a?:\w+:\d+>', message.content)
 
         try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
+            deleted = await self._purge(ctx, search + 1, check)
             await self.log_bulk_delete(ctx, len(deleted) - 1, None, "Messages with custom emoji")
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
@@ -598,7 +581,7 @@ class Moderation(commands.Cog):
             return not message.pinned and message.attachments
 
         try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
+            deleted = await self._purge(ctx, search + 1, check)
             await self.log_bulk_delete(ctx, len(deleted) - 1, None, "Messages with attachments")
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
@@ -611,7 +594,7 @@ class Moderation(commands.Cog):
             return not message.pinned and re.search(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*(),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', message.content)
 
         try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
+            deleted = await self._purge(ctx, search + 1, check)
             await self.log_bulk_delete(ctx, len(deleted) - 1, None, "Messages with links")
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
@@ -624,7 +607,7 @@ class Moderation(commands.Cog):
             return not message.pinned and (message.mentions or message.role_mentions or message.mention_everyone)
 
         try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
+            deleted = await self._purge(ctx, search + 1, check)
             await self.log_bulk_delete(ctx, len(deleted) - 1, None, "Messages with mentions")
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
@@ -637,11 +620,27 @@ class Moderation(commands.Cog):
             return not message.pinned and not message.author.bot
 
         try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
+            deleted = await self._purge(ctx, search + 1, check)
             await self.log_bulk_delete(ctx, len(deleted) - 1, None, "Human messages")
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
 
+    async def _purge(self, ctx, limit: int, check) -> List[discord.Message]:
+        """Purge the channel, logging the removed messages as one transcript"""
+        logging_cog = self.bot.get_cog('LoggingEvents')
+
+        def tracked_check(message):
+            if not check(message):
+                return False
+            if logging_cog:
+                logging_cog.suppress_deletions((message.id,))
+            return True
+
+        deleted = await ctx.channel.purge(limit=limit, check=tracked_check)
+        if logging_cog:
+            await logging_cog.log_bulk_deletion(ctx.guild, ctx.channel, deleted, ctx.author)
+        return deleted
+
     async def log_bulk_delete(self, ctx, count: int, target: discord.Member = None, filter_info: str = None):
         """Helper function to log bulk message deletions"""
         log_channel_id = self.bot.settings.get_server_setting(ctx.guild.id, "log_channel_mod_audit")
@@ -764,7 +763,7 @@ class Moderation(commands.Cog):
                 await ctx.guild.unban(member)
 
                 from utils.helpers.strings import get_random
-                action = get_random('user_was_x', ['softbanned'])
+                action = await get_random('user_was_x', ['softbanned'])
                 await ctx.send(f"**{member.name}** was {action}")
             except discord.Forbidden:
                 await ctx.send("I don't have permission to ban that user!")
@@ -788,32 +787,38 @@ class Moderation(commands.Cog):
                 await ctx.send("Invalid duration format. Use combinations of w/d/h/m/s (e.g., 1d12h)")
                 return
 
+            expires_at = int(time.time()) + seconds
             await member.ban(reason=reason, delete_message_days=days)
+            await self._cancel_tempbans(ctx.guild.id, member.id)
             case_id = await self.save_mod_action(ctx.guild.id, {
                 'user_id': member.id,
                 'mod_id': ctx.author.id,
                 'action': 'Tempban',
                 'reason': reason,
                 'duration': TimeParser.format_duration(seconds),
-                'expires_at': int((datetime.utcnow() + timedelta(seconds=seconds)).timestamp())
+                'expires_at': expires_at
             })
-            
+
+            await self.bot.timers.create(
+                'tempban',
+                expires_at,
+                owner_id=member.id,
+                guild_id=ctx.guild.id,
+                user_id=member.id,
+                mod_id=ctx.author.id,
+                case_id=case_id
+            )
+
             await self.log_mod_action(
                 ctx, 
                 "Tempban", 
                 member, 
                 case_id, 
                 reason=reason,
-                duration=TimeParser.format_duration(seconds)
+                duration=TimeParser.format_duration(seconds),
+                expires_at=expires_at
             )
 
-            await asyncio.sleep(seconds)
-            try:
-                await ctx.guild.unban(member)
-                await self.log_mod_action(ctx, "Tempban expired", member, case_id)
-            except:
-                pass
-
             await ctx.reply(f"**{member.name}** was tempbanned for {TimeParser.format_duration(seconds)}")
 
         except discord.Forbidden:
@@ -823,96 +828,183 @@ class Moderation(commands.Cog):
 
     @commands.command()
     @PermissionHandler.has_permissions(ban_members=True)
-    async def massban(self, ctx, days: int = 2, *, args):
-        """Ban multiple members at once"""
-        members = []
+    async def massban(self, ctx, days: int = 2, *, args: str = ''):
+        """Ban multiple users at once. IDs can also be attached as a text file."""
+        user_ids = []
         reason = None
-        
+
         parts = args.split()
         for part in parts:
-            if part.startswith('<@') and part.endswith('>'):
-                try:
-                    member_id = int(part[2:-1].replace('!', ''))
-                    member = ctx.guild.get_member(member_id)
-                    if member:
-                        members.append(member)
-                except:
-                    continue
+            mention_match = re.fullmatch(r'<@!?(\d+)>', part)
+            if mention_match:
+                user_ids.append(int(mention_match.group(1)))
             elif part.isdigit():
-                try:
-                    member = ctx.guild.get_member(int(part))
-                    if member:
-                        members.append(member)
-                except:
-                    continue
+                user_ids.append(int(part))
             else:
                 reason_start = args.find(part)
                 if reason_start != -1:
                     reason = args[reason_start:]
                 break
 
-        if not members:
+        for attachment in ctx.message.attachments:
+            if attachment.size > MASSBAN_MAX_FILE_SIZE:
+                await ctx.send(f"Skipping **{attachment.filename}**: ID lists must be under 1 MB.")
+                continue
+            data = await attachment.read()
+            user_ids.extend(int(match) for match in MASSBAN_ID_REGEX.findall(data))
+
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
             await ctx.send("No valid members provided!")
             return
 
-        success = []
+        days = max(0, min(days, 7))
+        targets = []
+        names = {}
         failed = []
         bot_member = ctx.guild.me
-        for member in members:
-            try:
-                if member.top_role >= ctx.author.top_role:
-                    failed.append(f"**{member.name}** (higher role)")
-                    continue
+        for user_id in user_ids:
+            member = ctx.guild.get_member(user_id)
+            if not member:
+                # Not in the server (e.g. already left); ban by ID
+                targets.append(discord.Object(id=user_id))
+                continue
 
-                if bot_member and member.top_role >= bot_member.top_role:
-                    failed.append(f"**{member.name}** (higher than bot)")
-                    continue
+            if member.top_role >= ctx.author.top_role:
+                failed.append(f"**{member.name}** (higher role)")
+                continue
 
-                await member.ban(reason=reason, delete_message_days=days)
-                case_id = await self.save_mod_action(ctx.guild.id, {
-                    'user_id': member.id,
-                    'mod_id': ctx.author.id,
-                    'action': 'Massban',
-                    'reason': reason
-                })
-                await self.log_mod_action(ctx, "Massban", member, case_id, reason=reason)
-                success.append(member.name)
+            if bot_member and member.top_role >= bot_member.top_role:
+                failed.append(f"**{member.name}** (higher than bot)")
+                continue
+
+            names[member.id] = str(member)
+            targets.append(member)
+
+        async with ctx.typing():
+            banned, ban_failed = await self._ban_many(ctx.guild, targets, reason, days)
+        failed.extend(f"`{user_id}`" for user_id in ban_failed)
+
+        timestamp = datetime.utcnow().isoformat()
+        cases = []
+        case_ids = set()
+        for user_id in banned:
+            case_id = self.generate_case_id()
+            while case_id in case_ids:
+                case_id = self.generate_case_id()
+            case_ids.add(case_id)
+            cases.append({
+                'user_id': user_id,
+                'mod_id': ctx.author.id,
+                'action': 'Massban',
+                'reason': reason,
+                'case_id': case_id,
+                'timestamp': timestamp
+            })
+
+        recorded = True
+        if cases:
+            try:
+                await self.cases.add_cases(
+                    ctx.guild.id, cases, {user_id: names[user_id] for user_id in banned if user_id in names}
+                )
             except Exception:
-                failed.append(member.name)
+                # The bans already went through, so report them rather than failing the command
+                logger.exception(f"Failed to record {len(cases)} massban cases in guild {ctx.guild.id}")
+                recorded = False
+            await self.log_mass_action(ctx, "Massban", cases, names, failed=len(failed), reason=reason)
 
+        success = [names.get(user_id, f"`{user_id}`") for user_id in banned]
         report = f"Banned {len(success)} members"
+        if not recorded:
+            report += " (the bans could not be saved as cases)"
         if success:
             report += f"\nSuccess: {', '.join(success[:10])}" + ("..." if len(success) > 10 else "")
         if failed:
             report += f"\nFailed: {', '.join(failed[:10])}" + ("..." if len(failed) > 10 else "")
 
         from utils.helpers.strings import get_random
-        summary_action = get_random('user_was_x', ['banned'])
+        summary_action = await get_random('user_was_x', ['banned'])
         await ctx.send(report + f"\nAll done; users were {summary_action}.")
 
+    async def _ban_many(self, guild: discord.Guild, targets: List[discord.abc.Snowflake],
+                        reason: Optional[str], days: int) -> Tuple[List[int], List[int]]:
+        """Ban many users, returning (banned IDs, failed IDs).
+
+        Uses the bulk ban endpoint in chunks where available, and falls back
+        to a bounded number of concurrent single bans otherwise. Rate limits
+        are handled by discord.py's HTTP client.
+        """
+        banned = []
+        failed = []
+        delete_seconds = days * 86400
+        remaining = targets
+
+        if hasattr(guild, 'bulk_ban'):
+            remaining = []
+            for i in range(0, len(targets), MASSBAN_CHUNK_SIZE):
+                chunk = targets[i:i + MASSBAN_CHUNK_SIZE]
+                try:
+                    result = await guild.bulk_ban(chunk, reason=reason, delete_message_seconds=delete_seconds)
+                except discord.HTTPException as e:
+                    # Bulk bans also need Manage Server; retry the rest one by one
+                    logger.warning(f"Bulk ban failed in guild {guild.id}, falling back to single bans: {e}")
+                    remaining = targets[i:]
+                    break
+                banned.extend(user.id for user in result.banned)
+                failed.extend(user.id for user in result.failed)
+
+        if remaining:
+            semaphore = asyncio.Semaphore(MASSBAN_CONCURRENCY)
+
+            async def ban_one(target):
+                async with semaphore:
+                    try:
+                        await guild.ban(target, reason=reason, delete_message_seconds=delete_seconds)
+                        return target.id, True
+                    except discord.HTTPException:
+                        return target.id, False
+
+            for user_id, ok in await asyncio.gather(*(ban_one(target) for target in remaining)):
+                (banned if ok else failed).append(user_id)
+
+        return banned, failed
+
     @commands.group(invoke_without_command=True)
     @PermissionHandler.has_permissions(kick_members=True)
-    async def warns(self, ctx, member: discord.Member = None):
-        """List warnings for a member or the whole server"""
-        settings = self.bot.settings.get_all_server_settings(ctx.guild.id)
-        mod_logs = settings.get('mod_logs', {})
-        
+    async def warns(self, ctx, member: Optional[discord.Member] = None, page: int = 1):
+        """List warnings for a member, or page through the whole server's warnings"""
+        per_page = 10
+
         if member:
-            warnings = [log for log in mod_logs.values() if log.get('action') == 'Warn' and log.get('user_id') == member.id]
+            total, warnings = await self.cases.user_cases(ctx.guild.id, member.id, limit=per_page, action='Warn')
             if not warnings:
                 return await ctx.send(f"**{member.name}** has no warnings.")
             embed = discord.Embed(title=f"Warnings for **{member.name}**", color=discord.Color.yellow())
+            embed.set_footer(text=f"Most recent {len(warnings)} of {total} warnings")
         else:
-            warnings = [log for log in mod_logs.values() if log.get('action') == 'Warn']
-            if not warnings:
+            page = max(page, 1)
+            total, warnings = await self.cases.action_cases(
+                ctx.guild.id, 'Warn', limit=per_page, offset=(page - 1) * per_page
+            )
+            if not total:
                 return await ctx.send("No warnings in this server.")
-            embed = discord.Embed(title="Server Warnings", color=discord.Color.yellow())
-            
-        for warn in warnings[-10:]:
+
+            pages = (total + per_page - 1) // per_page
+            if not warnings:
+                return await ctx.send(f"There are only {pages} page(s) of warnings.")
+            embed = discord.Embed(title=f"Server Warnings | Page {page}/{pages}", color=discord.Color.yellow())
+            embed.set_footer(text=f"{total} warnings in total")
+
+        # Mentions of users who left render as bare IDs, so show the name recorded with the case
+        names = {} if member else await self.cases.usernames(ctx.guild.id, (warn['user_id'] for warn in warnings))
+        for warn in warnings:
             mod = ctx.guild.get_member(warn.get('mod_id'))
+            name = names.get(warn.get('user_id'))
+            target = f"**User:** <@{warn.get('user_id')}>" + (f" ({name})" if name else "") + "\n" if not member else ""
             embed.add_field(
                 name=f"Case {warn.get('case_id')}",
-                value=f"**Moderator:** {mod.mention if mod else 'Unknown'}\n**Reason:** {warn.get('reason') or 'No reason provided'}",
+                value=f"{target}**Moderator:** {mod.mention if mod else 'Unknown'}\n**Reason:** {warn.get('reason') or 'No reason provided'}",
                 inline=False
             )
             
@@ -922,16 +1014,10 @@ class Moderation(commands.Cog):
     @PermissionHandler.has_permissions(kick_members=True)
     async def remove_warn(self, ctx, case_id: str):
         """Remove a warning by its case ID"""
-        settings = self.bot.settings.get_all_server_settings(ctx.guild.id)
-        mod_logs = settings.get('mod_logs', {})
-        
-        if case_id not in mod_logs or mod_logs[case_id].get('action') != 'Warn':
+        warning = await self.cases.delete_case(ctx.guild.id, case_id, action='Warn')
+        if not warning:
             return await ctx.send("Warning not found.")
             
-        warning = mod_logs[case_id]
-        del mod_logs[case_id]
-        
-        self.bot.settings.set_server_setting(ctx.guild.id, 'mod_logs', mod_logs)
         await ctx.send(f"Removed warning case **{case_id}**")
         
         member = ctx.guild.get_member(warning.get('user_id'))
@@ -942,39 +1028,64 @@ class Moderation(commands.Cog):
     @PermissionHandler.has_permissions(kick_members=True)
     async def clear_warns(self, ctx, member: discord.Member):
         """Clear all warnings from a member"""
-        settings = self.bot.settings.get_all_server_settings(ctx.guild.id)
-        mod_logs = settings.get('mod_logs', {})
-        
-        removed = 0
-        new_logs = {}
-        for case_id, log in mod_logs.items():
-            if log.get('action') == 'Warn' and log.get('user_id') == member.id:
-                removed += 1
-            else:
-                new_logs[case_id] = log
+        removed = await self.cases.delete_user_cases(ctx.guild.id, member.id, 'Warn')
                 
         if removed == 0:
             return await ctx.send(f"**{member.name}** has no warnings to clear.")
             
-        self.bot.settings.set_server_setting(ctx.guild.id, 'mod_logs', new_logs)
         await ctx.send(f"Cleared {removed} warning(s) from **{member.name}**")
         await self.log_mod_action(ctx, "Warnings Cleared", member, self.generate_case_id())
 
+    async def _cancel_tempbans(self, guild_id: int, user_id: int) -> None:
+        """Drop a user's pending tempban expiries, so a later ban or unban is not undone"""
+        _, timers = await self.bot.timers.owner_timers('tempban', user_id)
+        for timer in timers:
+            if timer.data.get('guild_id') == guild_id:
+                await self.bot.timers.cancel(timer.id)
+
+    @commands.Cog.listener()
+    async def on_tempban_timer_complete(self, timer):
+        """Lift a tempban once its timer fires"""
+        guild = self.bot.get_guild(timer.data['guild_id'])
+        if not guild:
+            await self.bot.timers.complete(timer)
+            return
+
+        user_id = timer.data['user_id']
+        try:
+            await guild.unban(discord.Object(id=user_id), reason="Tempban expired")
+        except discord.NotFound:
+            # Already unbanned by hand
+            await self.bot.timers.complete(timer)
+            return
+        except discord.HTTPException as e:
+            # Left pending, so the scheduler retries it with a backoff
+            logger.warning(f"Failed to lift tempban of {user_id} in guild {guild.id}: {e}")
+            return
+        await self.bot.timers.complete(timer)
+
+        try:
+            target = await self.bot.user_resolver.resolve(user_id)
+        except discord.HTTPException:
+            return
+        await self._log_mod_action(guild, guild.me, "Tempban expired", target, timer.data['case_id'])
+
     async def log_mod_action(self, ctx, action: str, target: Union[discord.Member, discord.User], case_id: str, *, reason: str = None, duration: str = None, expires_at: int = None):
         """Log a moderation action to the audit log channel"""
-        log_channel_id = self.bot.settings.get_server_setting(ctx.guild.id, "log_channel_mod_audit")
-        if not log_channel_id:
-            return
-            
-        channel = ctx.guild.get_channel(int(log_channel_id))
-        if not channel:
+        await self._log_mod_action(
+            ctx.guild, ctx.author, action, target, case_id,
+            reason=reason, duration=duration, expires_at=expires_at
+        )
+
+    async def _log_mod_action(self, guild: discord.Guild, moderator: Union[discord.Member, discord.User], action: str, target: Union[discord.Member, discord.User], case_id: str, *, reason: str = None, duration: str = None, expires_at: int = None):
+        if not self.bot.settings.get_server_setting(guild.id, "log_channel_mod_audit"):
             return
 
         embed = EmbedBuilder(
             title=f"{action}",
             description=(
                 f"**User:** {target.mention}\n`{target.id}`\n"
-                f"**Moderator:** {ctx.author.mention}\n`{ctx.author.id}`\n"
+                f"**Moderator:** {moderator.mention}\n`{moderator.id}`\n"
                 f"**Case ID:** `{case_id}`"
                 + (f"\n**Duration:** {duration}" if duration else "")
                 + (f"\n**Expires:** <t:{expires_at}:R>" if expires_at else "")
@@ -985,7 +1096,38 @@ class Moderation(commands.Cog):
         embed.set_thumbnail(url=target.display_avatar.url)
         embed = embed.build()
         embed.color = 0x2B2D31
-        await channel.send(embed=embed)
+        self.bot.log_queue.submit_log(guild.id, "mod_audit", embed)
+
+    async def log_mass_action(self, ctx, action: str, cases: List[Dict[str, Any]], names: Dict[int, str], *, failed: int = 0, reason: str = None):
+        """Log a batch moderation action as one audit embed with the case list attached"""
+        log_channel_id = self.bot.settings.get_server_setting(ctx.guild.id, "log_channel_mod_audit")
+        if not log_channel_id:
+            return
+
+        channel = ctx.guild.get_channel(int(log_channel_id))
+        if not channel:
+            return
+
+        embed = EmbedBuilder(
+            title=f"{action}",
+            description=(
+                f"**Users:** {len(cases)}"
+                + (f" ({failed} failed)" if failed else "")
+                + f"\n**Moderator:** {ctx.author.mention}\n`{ctx.author.id}`"
+                + (f"\n\n**Reason:**\n> {reason}" if reason else "\n\n**Reason:** No reason provided")
+            )
+        ).build()
+        embed.color = 0x2B2D31
+
+        lines = [
+            f"{case['case_id']}\t{case['user_id']}\t{names.get(case['user_id'], '')}"
+            for case in cases
+        ]
+        file = discord.File(
+            io.BytesIO("\n".join(["case_id\tuser_id\tusername", *lines]).encode('utf-8')),
+            filename=f"{action.lower()}-{ctx.message.id}.txt"
+        )
+        await channel.send(embed=embed, file=file)
 
 async def setup(bot):
     await bot.add_cog(Moderation(bot))
\ No newline at end of file
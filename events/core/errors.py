@@ -8,14 +8,8 @@ class ErrorEvents(commands.Cog):
     @commands.Cog.listener()
     async def on_command_error(self, ctx, error):
         if isinstance(error, commands.CommandNotFound):
-            prefixes = await self.bot.get_prefix(ctx.message)
             content = ctx.message.content
-            
-            used_prefix = None
-            for prefix in prefixes:
-                if content.startswith(prefix):
-                    used_prefix = prefix
-                    break
+            used_prefix = self.bot.prefixes.get(ctx.guild.id if ctx.guild else None).match(content)
                 
             if not used_prefix:
                 return
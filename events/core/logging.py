@@ -1,41 +1,78 @@
 import discord
+import io
+import logging
+import time
 from discord.ext import commands
 from datetime import datetime
+from typing import Iterable, List, Optional, Set, Tuple
 from utils.helpers.formatting import EmbedBuilder
+from utils.cache.content import ContentStore
+from utils.logs.bursts import BurstAggregator
+
+logger = logging.getLogger(__name__)
+
+# Account age buckets for join/leave burst summaries: (label, max age in seconds)
+ACCOUNT_AGE_BUCKETS = (
+    ("< 1 hour", 3600),
+    ("< 1 day", 86400),
+    ("< 1 week", 7 * 86400),
+    ("< 1 month", 30 * 86400),
+    ("< 1 year", 365 * 86400),
+    ("1 year +", None),
+)
 
 class LoggingEvents(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # message_id -> monotonic expiry; deletions already logged elsewhere
         self.recent_deletions = {}
+        self._prune_deletions_at = 0.0
+        self.content_store = ContentStore()
+        # Guilds with profile logging enabled; built once, then updated per guild as settings change
+        self._profile_guilds: Optional[Set[int]] = None
+        # Joins/leaves above 10 per 10s are summarised every 30s instead of logged one by one
+        self.member_bursts = BurstAggregator(self._send_burst_summary, threshold=10, window=10.0, summary_interval=30.0)
+
+    async def cog_load(self):
+        self.bot.settings.add_listener(self._update_profile_guild)
+
+    async def cog_unload(self):
+        self.bot.settings.remove_listener(self._update_profile_guild)
+        await self.member_bursts.close()
+
+    def suppress_deletions(self, message_ids: Iterable[int], ttl: float = 60.0) -> None:
+        """Stop the per-message and bulk delete handlers from logging these IDs"""
+        now = time.monotonic()
+        if now >= self._prune_deletions_at:
+            self._prune_deletions_at = now + ttl
+            for message_id, expires in list(self.recent_deletions.items()):
+                if expires < now:
+                    del self.recent_deletions[message_id]
+
+        expires = now + ttl
+        for message_id in message_ids:
+            self.recent_deletions[message_id] = expires
 
     async def log_to_channel(self, guild_id: int, log_type: str, embed: discord.Embed):
-        """Logs to the appropriate channel"""
+        """Queues a log for the appropriate channel; embeds are sent in batches"""
         try:
-            setting_name = f"log_channel_{log_type}"
-            settings = self.bot.settings.get_all_server_settings(guild_id)
-            channel_id = settings.get(setting_name)
-            
-            if not channel_id:
-                return
-                
-            channel = self.bot.get_channel(int(channel_id))
-            if not channel:
-                return
-                
-            permissions = channel.permissions_for(channel.guild.me)
-            if not permissions.send_messages or not permissions.embed_links:
-                return
-
-            await channel.send(embed=embed)
+            self.bot.log_queue.submit_log(guild_id, log_type, embed)
             
-        except Exception as e:
-            print(f"Error in log_to_channel: {str(e)}")
+        except Exception:
+            logger.exception("Failed to queue %s log for guild %s", log_type, guild_id)
 
     #################################
     ## Member Events
     #################################
     @commands.Cog.listener()
     async def on_member_join(self, member):
+        if not self.bot.settings.get_server_setting(member.guild.id, "log_channel_join_leave"):
+            return
+
+        entry = (member.id, str(member), member.created_at.timestamp())
+        if self.member_bursts.record((member.guild.id, "join"), entry):
+            return
+
         embed = discord.Embed(
             title="Member joined",
             description=f"{member.mention} `{member.id}`",
@@ -63,6 +100,13 @@ class LoggingEvents(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_remove(self, member):
+        if not self.bot.settings.get_server_setting(member.guild.id, "log_channel_join_leave"):
+            return
+
+        entry = (member.id, str(member), member.created_at.timestamp())
+        if self.member_bursts.record((member.guild.id, "leave"), entry):
+            return
+
         embed = discord.Embed(
             title="Member left",
             description=f"{member.mention} `{member.id}`",
@@ -96,35 +140,96 @@ class LoggingEvents(commands.Cog):
         
         await self.log_to_channel(member.guild.id, "join_leave", embed)
 
+    async def _send_burst_summary(self, key: Tuple[int, str], entries: List[Tuple[int, str, float]]):
+        """Send one summary of (id, name, created timestamp) entries for a join or leave burst"""
+        guild_id, kind = key
+        now = time.time()
+
+        counts = [0] * len(ACCOUNT_AGE_BUCKETS)
+        for _, _, created in entries:
+            age = now - created
+            for index, (_, limit) in enumerate(ACCOUNT_AGE_BUCKETS):
+                if limit is None or age < limit:
+                    counts[index] += 1
+                    break
+
+        width = max(counts)
+        histogram = "\n".join(
+            f"{label:<10} {'█' * round(count / width * 15):<15} {count}"
+            for (label, _), count in zip(ACCOUNT_AGE_BUCKETS, counts)
+        )
+
+        joined = kind == "join"
+        embed = discord.Embed(
+            title="Member join burst" if joined else "Member leave burst",
+            description=f"**{len(entries)}** members {'joined' if joined else 'left'} in a short time",
+            color=discord.Color.green() if joined else discord.Color.red(),
+            timestamp=datetime.utcnow()
+        )
+        embed.add_field(name="Account age", value=f"```\n{histogram}\n```", inline=False)
+        embed.set_footer(text="Logging individual joins and leaves resumes once the rate drops")
+
+        lines = [
+            f"{member_id}\t{name}\t{datetime.utcfromtimestamp(created).strftime('%Y-%m-%d %H:%M:%S')}"
+            for member_id, name, created in entries
+        ]
+        file = discord.File(
+            io.BytesIO("\n".join(lines).encode('utf-8')),
+            filename=f"{kind}s-{guild_id}-{int(now)}.txt"
+        )
+        await self.send_log_file(guild_id, "join_leave", embed, file)
+
     #################################
     ## Message Events
     #################################
     @commands.Cog.listener()
-    async def on_message_edit(self, before, after):
-        if before.author.bot or before.content == after.content:
+    async def on_message_context(self, ctx, facts):
+        """Keep a compact copy of messages so uncached deletes/edits can be logged"""
+        if facts.is_bot or not facts.in_guild:
+            return
+
+        message = ctx.message
+        if not self.bot.settings.get_server_setting(message.guild.id, "log_channel_messages"):
             return
 
+        self.content_store.add(
+            message.guild.id,
+            message.id,
+            message.channel.id,
+            message.author.id,
+            message.content,
+            [a.url for a in message.attachments]
+        )
+
+    @commands.Cog.listener()
+    async def on_message_snapshot_edit(self, snapshot):
+        """Log an edit captured by the message tracking hub"""
+        self.content_store.update(snapshot.guild_id, snapshot.id, snapshot.after)
+
         embed = discord.Embed(
             color=discord.Color.yellow(),
             timestamp=datetime.utcnow()
         )
         
         embed.set_author(
-            name=before.author.name,
-            icon_url=before.author.display_avatar.url
+            name=snapshot.author_name,
+            icon_url=snapshot.avatar_url
         )
         
-        embed.add_field(name="Before", value=before.content[:1024] or "*Empty*", inline=False)
-        embed.add_field(name="After", value=after.content[:1024] or "*Empty*", inline=False)
-        embed.add_field(name="Channel", value=before.channel.mention, inline=True)
-        embed.add_field(name="User ID", value=f"```{before.author.id}```", inline=False)
-        embed.add_field(name="", value=f"[Jump to message]({before.jump_url})", inline=True)
+        embed.add_field(name="Before", value=snapshot.content[:1024] or "*Empty*", inline=False)
+        embed.add_field(name="After", value=snapshot.after[:1024] or "*Empty*", inline=False)
+        embed.add_field(name="Channel", value=f"<#{snapshot.channel_id}>", inline=True)
+        embed.add_field(name="User ID", value=f"```{snapshot.author_id}```", inline=False)
+        embed.add_field(name="", value=f"[Jump to message]({snapshot.jump_url})", inline=True)
 
-        await self.log_to_channel(before.guild.id, "messages", embed)
+        await self.log_to_channel(snapshot.guild_id, "messages", embed)
 
     @commands.Cog.listener()
-    async def on_message_delete(self, message):
-        if message.author.bot or message.id in self.recent_deletions:
+    async def on_message_snapshot_delete(self, snapshot):
+        """Log a deletion captured by the message tracking hub"""
+        self.content_store.pop(snapshot.guild_id, snapshot.id)
+
+        if snapshot.id in self.recent_deletions:
             return
 
         embed = discord.Embed(
@@ -133,22 +238,193 @@ class LoggingEvents(commands.Cog):
         )
 
         embed.set_author(
-            name=message.author.name,
-            icon_url=message.author.display_avatar.url
+            name=snapshot.author_name,
+            icon_url=snapshot.avatar_url
         )
         
-        embed.add_field(name="Content", value=message.content[:1024] or "*Empty*", inline=False)
-        embed.add_field(name="Channel", value=message.channel.mention, inline=True)
-        embed.add_field(name="User ID", value=f"```{message.author.id}```", inline=False)
+        embed.add_field(name="Content", value=snapshot.content[:1024] or "*Empty*", inline=False)
+        embed.add_field(name="Channel", value=f"<#{snapshot.channel_id}>", inline=True)
+        embed.add_field(name="User ID", value=f"```{snapshot.author_id}```", inline=False)
 
-        if message.attachments:
-            attachments = "\n".join([f"[{a.filename}]({a.url})" for a in message.attachments])
-            embed.add_field(name="Attachments", value=attachments, inline=False)
+        if snapshot.attachments:
+            attachments = "\n".join(f"[{url.rsplit('/', 1)[-1].split('?', 1)[0]}]({url})" for url in snapshot.attachments)
+            embed.add_field(name="Attachments", value=attachments[:1024], inline=False)
 
         current_time = datetime.utcnow()
         embed.set_footer(text=current_time.strftime("%d/%m/%Y %H:%M"))
 
-        await self.log_to_channel(message.guild.id, "messages", embed)
+        await self.log_to_channel(snapshot.guild_id, "messages", embed)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload):
+        """Log edits of messages that are no longer in the message cache"""
+        if payload.cached_message is not None or not payload.guild_id:
+            return
+
+        content = payload.data.get('content')
+        if content is None:
+            return
+
+        record = self.content_store.get(payload.guild_id, payload.message_id)
+        if record is None or record.content == content:
+            return
+
+        before = record.content
+        self.content_store.update(payload.guild_id, payload.message_id, content)
+
+        embed = discord.Embed(
+            color=discord.Color.yellow(),
+            timestamp=datetime.utcnow()
+        )
+        self._set_stored_author(embed, record.author_id)
+
+        jump_url = f"https://discord.com/channels/{payload.guild_id}/{record.channel_id}/{record.id}"
+        embed.add_field(name="Before", value=before[:1024] or "*Empty*", inline=False)
+        embed.add_field(name="After", value=content[:1024] or "*Empty*", inline=False)
+        embed.add_field(name="Channel", value=f"<#{record.channel_id}>", inline=True)
+        embed.add_field(name="User ID", value=f"```{record.author_id}```", inline=False)
+        embed.add_field(name="", value=f"[Jump to message]({jump_url})", inline=True)
+
+        await self.log_to_channel(payload.guild_id, "messages", embed)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        """Log deletions of messages that are no longer in the message cache"""
+        if payload.cached_message is not None or not payload.guild_id:
+            return
+
+        record = self.content_store.pop(payload.guild_id, payload.message_id)
+        if record is None or payload.message_id in self.recent_deletions:
+            return
+
+        embed = discord.Embed(
+            color=discord.Color.red(),
+            timestamp=datetime.utcnow()
+        )
+        self._set_stored_author(embed, record.author_id)
+
+        embed.add_field(name="Content", value=record.content[:1024] or "*Empty*", inline=False)
+        embed.add_field(name="Channel", value=f"<#{record.channel_id}>", inline=True)
+        embed.add_field(name="User ID", value=f"```{record.author_id}```", inline=False)
+
+        if record.attachments:
+            attachments = "\n".join(f"[{url.rsplit('/', 1)[-1].split('?', 1)[0]}]({url})" for url in record.attachments)
+            embed.add_field(name="Attachments", value=attachments[:1024], inline=False)
+
+        embed.set_footer(text=datetime.utcnow().strftime("%d/%m/%Y %H:%M"))
+
+        await self.log_to_channel(payload.guild_id, "messages", embed)
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload):
+        """Log a bulk deletion as one transcript instead of one embed per message"""
+        if not payload.guild_id:
+            return
+
+        records = {
+            message_id: self.content_store.pop(payload.guild_id, message_id)
+            for message_id in payload.message_ids
+        }
+        message_ids = [i for i in payload.message_ids if i not in self.recent_deletions]
+        if not message_ids or not self.bot.settings.get_server_setting(payload.guild_id, "log_channel_messages"):
+            return
+
+        cached = {message.id: message for message in payload.cached_messages}
+        entries = []
+        for message_id in sorted(message_ids):
+            message = cached.get(message_id)
+            record = records.get(message_id)
+            if message is not None:
+                entries.append(self._message_entry(message))
+            elif record is not None:
+                author = self.bot.get_user(record.author_id)
+                entries.append((
+                    message_id, record.author_id, str(author) if author else None,
+                    record.content, record.attachments
+                ))
+            else:
+                entries.append((message_id, None, None, None, ()))
+
+        await self._send_bulk_transcript(payload.guild_id, payload.channel_id, entries)
+
+    async def log_bulk_deletion(self, guild: discord.Guild, channel: discord.abc.GuildChannel,
+                                messages: List[discord.Message], moderator: Optional[discord.Member] = None):
+        """Log messages removed by a purge as a single transcript"""
+        for message in messages:
+            self.content_store.pop(guild.id, message.id)
+
+        if not messages or not self.bot.settings.get_server_setting(guild.id, "log_channel_messages"):
+            return
+
+        entries = [self._message_entry(message) for message in sorted(messages, key=lambda m: m.id)]
+        await self._send_bulk_transcript(guild.id, channel.id, entries, moderator)
+
+    @staticmethod
+    def _message_entry(message: discord.Message) -> Tuple:
+        return (
+            message.id, message.author.id, str(message.author),
+            message.content, tuple(a.url for a in message.attachments)
+        )
+
+    async def _send_bulk_transcript(self, guild_id: int, channel_id: int, entries: List[Tuple],
+                                    moderator: Optional[discord.Member] = None):
+        """Send one embed with a transcript of (id, author_id, author, content, attachments) entries"""
+        lines = []
+        missing = 0
+        for message_id, author_id, author_name, content, attachments in entries:
+            sent_at = discord.utils.snowflake_time(message_id).strftime("%Y-%m-%d %H:%M:%S")
+            if author_id is None:
+                missing += 1
+                lines.append(f"[{sent_at}] <content not cached> ({message_id})")
+                continue
+            lines.append(f"[{sent_at}] {author_name or 'Unknown user'} ({author_id}) ({message_id}): {content}")
+            lines.extend(f"    Attachment: {url}" for url in attachments)
+
+        description = f"**{len(entries)}** messages deleted in <#{channel_id}>"
+        if moderator:
+            description += f"\n**Moderator:** {moderator.mention}"
+        if missing:
+            description += f"\n{missing} of them were not cached"
+
+        embed = discord.Embed(
+            title="Bulk message deletion",
+            description=description,
+            color=discord.Color.red(),
+            timestamp=datetime.utcnow()
+        )
+
+        file = discord.File(
+            io.BytesIO("\n".join(lines).encode('utf-8')),
+            filename=f"deleted-{channel_id}-{int(time.time())}.txt"
+        )
+        await self.send_log_file(guild_id, "messages", embed, file)
+
+    async def send_log_file(self, guild_id: int, log_type: str, embed: discord.Embed, file: discord.File):
+        """Send a log with an attachment directly, bypassing the batched queue"""
+        channel_id = self.bot.settings.get_server_setting(guild_id, f"log_channel_{log_type}")
+        if not channel_id:
+            return
+
+        channel = self.bot.get_channel(int(channel_id))
+        if not channel:
+            return
+
+        permissions = channel.permissions_for(channel.guild.me)
+        if not (permissions.send_messages and permissions.embed_links and permissions.attach_files):
+            return
+
+        try:
+            await channel.send(embed=embed, file=file)
+        except discord.HTTPException:
+            logger.exception("Failed to send log file to channel %s", channel_id)
+
+    def _set_stored_author(self, embed: discord.Embed, author_id: int) -> None:
+        """Set the embed author for a stored message from the user cache"""
+        author = self.bot.get_user(author_id)
+        if author:
+            embed.set_author(name=author.name, icon_url=author.display_avatar.url)
+        else:
+            embed.set_author(name=f"User {author_id}")
 
     #################################
     ## Member Update Events
@@ -204,12 +480,52 @@ class LoggingEvents(commands.Cog):
 
             await self.log_to_channel(after.guild.id, "profiles", embed.build())
 
+    def _profile_log_guilds(self) -> Set[int]:
+        """Return the IDs of guilds that have a profile log channel set"""
+        if self._profile_guilds is None:
+            get_setting = self.bot.settings.get_server_setting
+            self._profile_guilds = {
+                guild.id for guild in self.bot.guilds if get_setting(guild.id, "log_channel_profiles")
+            }
+        return self._profile_guilds
+
+    def _update_profile_guild(self, guild_id: int) -> None:
+        if self._profile_guilds is None:
+            return
+        if self.bot.get_guild(guild_id) and self.bot.settings.get_server_setting(guild_id, "log_channel_profiles"):
+            self._profile_guilds.add(guild_id)
+        else:
+            self._profile_guilds.discard(guild_id)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self._update_profile_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        if self._profile_guilds is not None:
+            self._profile_guilds.discard(guild.id)
+        self.content_store.clear_guild(guild.id)
+
     @commands.Cog.listener()
     async def on_user_update(self, before, after):
         if (before.avatar == after.avatar and 
             before.name == after.name and 
             before.global_name == after.global_name):
             return
+
+        # Fetched copies of this user would keep showing the old name and avatar
+        self.bot.user_resolver.invalidate(after.id)
+
+        # Only guilds that log profiles and share the user; no embed work otherwise
+        guild_ids = []
+        for guild_id in self._profile_log_guilds():
+            guild = self.bot.get_guild(guild_id)
+            if guild and guild.get_member(after.id):
+                guild_ids.append(guild_id)
+
+        if not guild_ids:
+            return
             
         embed = discord.Embed(
             color=discord.Color.blue(),
@@ -249,9 +565,9 @@ class LoggingEvents(commands.Cog):
                 inline=False
             )
         
-        for guild in self.bot.guilds:
-            if guild.get_member(after.id):
-                await self.log_to_channel(guild.id, "profiles", embed)
+        # Queued per channel; the log queue sends to channels concurrently with a bound
+        for guild_id in guild_ids:
+            await self.log_to_channel(guild_id, "profiles", embed)
 
 async def setup(bot):
     await bot.add_cog(LoggingEvents(bot)) 
\ No newline at end of file
@@ -1,87 +1,326 @@
 import discord
+import asyncio
+import logging
 from discord.ext import commands
 import re
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from utils.starboard.store import StarboardStore, StarPost
+
+logger = logging.getLogger(__name__)
+
+# How many recent starboard messages to scan per guild on startup
+RECONCILE_LIMIT = 200
+
+# Checked in order; the first one present on a message sets its count
+STAR_EMOJIS = ('⭐', '🌟', '✨', '🔥')
+
+# Seconds to collect reactions on a message before updating its post
+UPDATE_DELAY = 2.0
+
+# Messages whose star counts are kept in memory, least recently reacted to dropped first
+MAX_TRACKED_MESSAGES = 5000
+
+STARBOARD_FOOTER_REGEX = re.compile(r'^ID: (\d+)$')
+STARBOARD_CONTENT_REGEX = re.compile(r'\*\*(\d+)\*\* <#(\d+)>')
+# User ID in a custom avatar URL (global or per-guild); default avatars carry none
+AVATAR_USER_REGEX = re.compile(r'/(?:avatars|users)/(\d+)/')
 
 class StarboardEvents(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.starboard_cache = {}
+        self.store = StarboardStore()
+        self._reconcile_task = None
+        # message_id -> {emoji: count}, seeded from one fetch and then kept up to date from payloads
+        self._counts: 'OrderedDict[int, Dict[str, int]]' = OrderedDict()
+        self._pending: Dict[int, asyncio.Task] = {}
+        self._updating = set()
+        self._dirty = set()
+        # Messages whose counts are being fetched, and those that got reactions during the fetch
+        self._seeding = set()
+        self._stale = set()
+
+    async def cog_load(self):
+        self._reconcile_task = asyncio.create_task(self.reconcile_all())
+
+    async def cog_unload(self):
+        if self._reconcile_task is not None:
+            self._reconcile_task.cancel()
+        for task in list(self._pending.values()):
+            task.cancel()
+        await self.store.close()
+
+    #################################
+    ## Reconciliation
+    #################################
+    async def reconcile_all(self):
+        """Recover posts made while the mapping was not being saved, once per startup"""
+        await self.bot.wait_until_ready()
+
+        for guild in self.bot.guilds:
+            starboard_channel_id = self.bot.settings.get_server_setting(guild.id, 'starboard_channel')
+            if not starboard_channel_id:
+                continue
+
+            starboard_channel = guild.get_channel(int(starboard_channel_id))
+            if not starboard_channel:
+                continue
+
+            try:
+                recovered = await self.reconcile(guild.id, starboard_channel)
+            except discord.HTTPException as e:
+                logger.warning(f"Could not scan starboard channel {starboard_channel.id}: {e}")
+                continue
+            except Exception:
+                logger.exception(f"Failed to reconcile starboard for guild {guild.id}")
+                continue
+
+            if recovered:
+                logger.info(f"Recovered {recovered} starboard posts in guild {guild.id}")
+
+    async def reconcile(self, guild_id: int, starboard_channel: discord.TextChannel) -> int:
+        """Scan the starboard channel's recent history once and merge what it shows into the store"""
+        found = {}
+        async for star_message in starboard_channel.history(limit=RECONCILE_LIMIT):
+            post = self._parse_star_message(star_message)
+            # History is newest first, so the newest post for a message wins
+            if post is not None and post.message_id not in found:
+                found[post.message_id] = post
+
+        return await self.store.merge(guild_id, found.values())
+
+    def _parse_star_message(self, star_message: discord.Message):
+        if star_message.author.id != self.bot.user.id or not star_message.embeds:
+            return None
+
+        embed = star_message.embeds[0]
+        match = STARBOARD_FOOTER_REGEX.match(embed.footer.text or "")
+        content = STARBOARD_CONTENT_REGEX.search(star_message.content or "")
+        if not match or not content:
+            return None
+
+        # Posts recovered with no author get one when their count next changes
+        author = AVATAR_USER_REGEX.search(embed.author.icon_url or "")
+        return StarPost(
+            message_id=int(match.group(1)),
+            channel_id=int(content.group(2)),
+            author_id=int(author.group(1)) if author else None,
+            star_message_id=star_message.id,
+            stars=int(content.group(1))
+        )
+
+    #################################
+    ## Reactions
+    #################################
 
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
-        await self.handle_starboard(payload)
+        if not self._accepts(payload):
+            return
+
+        self._apply_delta(payload.message_id, str(payload.emoji), 1)
+        if payload.member and payload.member.bot:
+            return
+        self._schedule_update(payload.guild_id, payload.channel_id, payload.message_id)
 
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload):
-        await self.handle_starboard(payload)
+        if not self._accepts(payload):
+            return
 
-    async def handle_starboard(self, payload):
-        if payload.member and payload.member.bot:
+        self._apply_delta(payload.message_id, str(payload.emoji), -1)
+        self._schedule_update(payload.guild_id, payload.channel_id, payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_clear(self, payload):
+        if payload.message_id in self._seeding:
+            self._stale.add(payload.message_id)
+        if payload.message_id in self._counts:
+            self._counts[payload.message_id] = dict.fromkeys(STAR_EMOJIS, 0)
+            self._schedule_update(payload.guild_id, payload.channel_id, payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_clear_emoji(self, payload):
+        if not self._accepts(payload):
             return
-            
-        channel = self.bot.get_channel(payload.channel_id)
-        if not channel:
+
+        counts = self._counts.get(payload.message_id)
+        if counts is not None:
+            counts[str(payload.emoji)] = 0
+        elif payload.message_id in self._seeding:
+            self._stale.add(payload.message_id)
+        self._schedule_update(payload.guild_id, payload.channel_id, payload.message_id)
+
+    def _accepts(self, payload) -> bool:
+        """Cheap checks on payload data and cached settings only; no API calls"""
+        if not payload.guild_id or str(payload.emoji) not in STAR_EMOJIS:
+            return False
+
+        starboard_channel_id = self.bot.settings.get_server_setting(payload.guild_id, 'starboard_channel')
+        return bool(starboard_channel_id) and int(starboard_channel_id) != payload.channel_id
+
+    def _apply_delta(self, message_id: int, emoji: str, delta: int) -> None:
+        # Unknown messages are counted from a fetch when their update runs. A fetch
+        # already in flight may or may not include this event, so its result is not kept.
+        counts = self._counts.get(message_id)
+        if counts is None:
+            if message_id in self._seeding:
+                self._stale.add(message_id)
             return
-            
+
+        counts[emoji] = max(0, counts.get(emoji, 0) + delta)
+        self._counts.move_to_end(message_id)
+
+    def _seed_counts(self, message: discord.Message) -> Dict[str, int]:
+        counts = dict.fromkeys(STAR_EMOJIS, 0)
+        for reaction in message.reactions:
+            emoji = str(reaction.emoji)
+            if emoji in counts:
+                counts[emoji] = reaction.count
+
+        if message.id in self._stale:
+            # Reactions changed while the message was being fetched; use these counts for
+            # now and fetch again on another pass instead of caching a possibly stale copy
+            self._stale.discard(message.id)
+            self._dirty.add(message.id)
+            return counts
+
+        self._counts[message.id] = counts
+        while len(self._counts) > MAX_TRACKED_MESSAGES:
+            self._counts.popitem(last=False)
+        return counts
+
+    @staticmethod
+    def _star_count(counts: Dict[str, int]) -> Tuple[Optional[str], int]:
+        """Return (emoji, count) for the first star emoji present, in STAR_EMOJIS order"""
+        for emoji in STAR_EMOJIS:
+            if counts.get(emoji):
+                return emoji, counts[emoji]
+        return None, 0
+
+    def _schedule_update(self, guild_id: int, channel_id: int, message_id: int) -> None:
+        """Coalesce reaction events on a message into one starboard update per UPDATE_DELAY"""
+        if message_id in self._pending:
+            # Events arriving mid-update need another pass; earlier ones are picked up by the sleep
+            if message_id in self._updating:
+                self._dirty.add(message_id)
+            return
+
+        self._pending[message_id] = asyncio.create_task(
+            self._debounced_update(guild_id, channel_id, message_id)
+        )
+
+    async def _debounced_update(self, guild_id: int, channel_id: int, message_id: int):
+        try:
+            while True:
+                await asyncio.sleep(UPDATE_DELAY)
+                self._updating.add(message_id)
+                try:
+                    await self.update_starboard(guild_id, channel_id, message_id)
+                except Exception:
+                    logger.exception(f"Error updating starboard for message {message_id}")
+                finally:
+                    self._updating.discard(message_id)
+
+                if message_id not in self._dirty:
+                    break
+                self._dirty.discard(message_id)
+        finally:
+            self._pending.pop(message_id, None)
+
+    async def _fetch_source(self, guild: discord.Guild, channel_id: int, message_id: int) -> Optional[discord.Message]:
+        channel = guild.get_channel_or_thread(channel_id)
+        if not channel:
+            return None
+
         try:
-            message = await channel.fetch_message(payload.message_id)
-        except discord.NotFound:
+            return await channel.fetch_message(message_id)
+        except (discord.NotFound, discord.Forbidden):
+            return None
+
+    async def update_starboard(self, guild_id: int, channel_id: int, message_id: int):
+        """Bring a message's starboard post in line with its current star count"""
+        guild = self.bot.get_guild(guild_id)
+        if not guild:
             return
-            
-        settings = self.bot.settings.get_all_server_settings(payload.guild_id)
+
+        settings = self.bot.settings.get_all_server_settings(guild_id)
         starboard_channel_id = settings.get('starboard_channel')
         threshold = settings.get('starboard_threshold', 3)
-        
         if not starboard_channel_id:
             return
-            
-        starboard_channel = channel.guild.get_channel(int(starboard_channel_id))
+
+        starboard_channel = guild.get_channel(int(starboard_channel_id))
         if not starboard_channel:
             return
-            
-        valid_emojis = ['⭐', '🌟', '✨', '🔥']
-        
-        if str(payload.emoji) not in valid_emojis:
-            return
-            
-        star_count = 0
-        active_emoji = None
-        for emoji in valid_emojis:
-            reaction = discord.utils.get(message.reactions, emoji=emoji)
-            if reaction:
-                star_count = reaction.count
-                active_emoji = emoji
-                break
-        
-        if not active_emoji:
-            return
-            
-        existing_star_message_id = self.starboard_cache.get(message.id)
-        
-        if star_count < threshold and not existing_star_message_id:
-            return
-            
-        if star_count < threshold and existing_star_message_id:
+
+        message = None
+        counts = self._counts.get(message_id)
+        if counts is None:
+            self._seeding.add(message_id)
             try:
-                star_message = await starboard_channel.fetch_message(existing_star_message_id)
-                await star_message.delete()
-                self.starboard_cache.pop(message.id, None)
-            except:
-                pass
+                message = await self._fetch_source(guild, channel_id, message_id)
+            finally:
+                self._seeding.discard(message_id)
+            if message is None:
+                self._stale.discard(message_id)
+                return
+            counts = self._seed_counts(message)
+
+        active_emoji, star_count = self._star_count(counts)
+        post = await self.store.get(guild_id, message_id)
+
+        if star_count < threshold:
+            if post:
+                try:
+                    await starboard_channel.get_partial_message(post.star_message_id).delete()
+                except discord.NotFound:
+                    pass
+                except discord.HTTPException as e:
+                    logger.warning(f"Error removing starboard message {post.star_message_id}: {e}")
+                    return
+                await self.store.remove(guild_id, message_id)
             return
 
-        embed = await self.create_starboard_embed(message)
-        content = f"{active_emoji} **{star_count}** {message.channel.mention}"
-        
+        content = f"{active_emoji} **{star_count}** <#{channel_id}>"
+
         try:
-            if existing_star_message_id:
-                star_message = await starboard_channel.fetch_message(existing_star_message_id)
-                await star_message.edit(content=content, embed=embed)
-            else:
+            star_message_id = None
+            if post:
+                if post.stars == star_count:
+                    # Nothing to edit, but a post recovered without an author can take it from a seed fetch
+                    if post.author_id is not None or message is None:
+                        return
+                    star_message_id = post.star_message_id
+                elif post.author_id is None and message is None:
+                    message = await self._fetch_source(guild, channel_id, message_id)
+
+            if post and star_message_id is None:
+                try:
+                    # Only the count line changes; the stored ID is enough to edit it
+                    await starboard_channel.get_partial_message(post.star_message_id).edit(content=content)
+                    star_message_id = post.star_message_id
+                except discord.NotFound:
+                    pass
+
+            if star_message_id is None:
+                if message is None:
+                    message = await self._fetch_source(guild, channel_id, message_id)
+                    if message is None:
+                        return
+                embed = await self.create_starboard_embed(message)
                 star_message = await starboard_channel.send(content=content, embed=embed)
-                self.starboard_cache[message.id] = star_message.id
-        except Exception as e:
-            print(f"Error handling starboard message: {e}")
+                star_message_id = star_message.id
+
+            await self.store.save(guild_id, StarPost(
+                message_id=message_id,
+                channel_id=channel_id,
+                author_id=message.author.id if message else post.author_id,
+                star_message_id=star_message_id,
+                stars=star_count
+            ))
+        except Exception:
+            logger.exception(f"Error handling starboard message for {message_id}")
 
     async def create_starboard_embed(self, message):
         embed = discord.Embed(
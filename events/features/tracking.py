@@ -1,62 +1,167 @@
 import discord
+import sys
+import time
+from collections import OrderedDict, deque
 from discord.ext import commands
-from datetime import datetime
+from typing import Deque, Dict, Optional
+from utils.helpers.messages import MessageSnapshot
+
+# Approximate cost of a deque slot plus the channel's share of bookkeeping
+_ENTRY_OVERHEAD = 64
+
+
+def _snapshot_size(snapshot: MessageSnapshot) -> int:
+    return (
+        sys.getsizeof(snapshot)
+        + sys.getsizeof(snapshot.content)
+        + sys.getsizeof(snapshot.author_name)
+        + sys.getsizeof(snapshot.avatar_url)
+        + (sys.getsizeof(snapshot.after) if snapshot.after is not None else 0)
+        + sum(sys.getsizeof(url) for url in snapshot.attachments)
+        + _ENTRY_OVERHEAD
+    )
+
+
+class _ChannelSnipes:
+    __slots__ = ('deleted', 'edited', 'bytes')
+
+    def __init__(self, size: int) -> None:
+        # (snapshot, size) pairs, oldest first
+        self.deleted: Deque = deque(maxlen=size)
+        self.edited: Deque = deque(maxlen=size)
+        self.bytes = 0
+
+
+class SnipeStore:
+    """Recent deletions and edits per channel for snipe and editsnipe.
+
+    Each channel keeps a ring buffer of its last `per_channel` deletions and
+    edits. Entries older than `ttl` seconds are dropped when the channel is
+    next touched. Across all channels the store stays under `max_bytes`
+    (an estimate), evicting the channels that were used least recently.
+    """
+
+    def __init__(self, per_channel: int = 10, ttl: float = 3600.0, max_bytes: int = 4 * 1024 * 1024) -> None:
+        self.per_channel = per_channel
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._channels: 'OrderedDict[int, _ChannelSnipes]' = OrderedDict()
+        self.bytes = 0
+        self.evictions = 0
+
+    def add_deleted(self, snapshot: MessageSnapshot) -> None:
+        self._add(snapshot, edited=False)
+
+    def add_edited(self, snapshot: MessageSnapshot) -> None:
+        self._add(snapshot, edited=True)
+
+    def deleted(self, channel_id: int, index: int = 1) -> Optional[MessageSnapshot]:
+        """Return the `index`-th most recent deletion in a channel (1 is the latest)."""
+        return self._get(channel_id, index, edited=False)
+
+    def edited(self, channel_id: int, index: int = 1) -> Optional[MessageSnapshot]:
+        """Return the `index`-th most recent edit in a channel (1 is the latest)."""
+        return self._get(channel_id, index, edited=True)
+
+    def _add(self, snapshot: MessageSnapshot, edited: bool) -> None:
+        channel = self._channels.get(snapshot.channel_id)
+        if channel is None:
+            channel = self._channels[snapshot.channel_id] = _ChannelSnipes(self.per_channel)
+        else:
+            self._channels.move_to_end(snapshot.channel_id)
+
+        entries = channel.edited if edited else channel.deleted
+        if len(entries) == entries.maxlen:
+            self._forget(channel, entries[0][1])
+
+        size = _snapshot_size(snapshot)
+        entries.append((snapshot, size))
+        channel.bytes += size
+        self.bytes += size
+
+        self._expire(channel)
+        self._evict()
+
+    def _get(self, channel_id: int, index: int, edited: bool) -> Optional[MessageSnapshot]:
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            return None
+
+        self._expire(channel)
+        if not channel.deleted and not channel.edited:
+            del self._channels[channel_id]
+            return None
+
+        self._channels.move_to_end(channel_id)
+        entries = channel.edited if edited else channel.deleted
+        if not 1 <= index <= len(entries):
+            return None
+        return entries[-index][0]
+
+    def _forget(self, channel: _ChannelSnipes, size: int) -> None:
+        channel.bytes -= size
+        self.bytes -= size
+
+    def _expire(self, channel: _ChannelSnipes) -> None:
+        cutoff = time.time() - self.ttl
+        for entries in (channel.deleted, channel.edited):
+            while entries and entries[0][0].at < cutoff:
+                self._forget(channel, entries.popleft()[1])
+
+    def _evict(self) -> None:
+        # Never evict the channel that was just written to
+        while self.bytes > self.max_bytes and len(self._channels) > 1:
+            _, channel = self._channels.popitem(last=False)
+            self.bytes -= channel.bytes
+            self.evictions += 1
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'channels': len(self._channels),
+            'deleted': sum(len(c.deleted) for c in self._channels.values()),
+            'edited': sum(len(c.edited) for c in self._channels.values()),
+            'bytes': self.bytes,
+            'evictions': self.evictions,
+        }
+
 
 class MessageTrackingEvents(commands.Cog):
+    """Hub for message deletions and edits.
+
+    This is the only cog listening to `on_message_delete` and `on_message_edit`.
+    Each event is captured once as a `MessageSnapshot`, kept in the snipe store
+    and re-dispatched as `message_snapshot_delete` / `message_snapshot_edit`
+    for other consumers such as logging.
+    """
+
     def __init__(self, bot):
         self.bot = bot
-        self.deleted_messages = {}
-        self.edited_messages = {}
+        self.snipes = SnipeStore()
 
     @commands.Cog.listener()
     async def on_message_delete(self, message):
-        if message.author.bot:
+        if not message.guild or message.author.bot:
             return
-            
-        if not message.guild:
-            return
-            
-        if not message.content and not message.attachments:
-            return
-            
-        if message.guild.id not in self.deleted_messages:
-            self.deleted_messages[message.guild.id] = {}
-            
-        self.deleted_messages[message.guild.id][message.channel.id] = {
-            'content': message.content,
-            'author': message.author,
-            'timestamp': message.created_at,
-            'attachments': [a.url for a in message.attachments if a.content_type and a.content_type.startswith('image/')],
-            'reference': message.reference.message_id if message.reference else None
-        }
+
+        snapshot = MessageSnapshot.from_message(message)
+        if snapshot.content or snapshot.attachments:
+            self.snipes.add_deleted(snapshot)
+
+        self.bot.dispatch('message_snapshot_delete', snapshot)
 
     @commands.Cog.listener()
     async def on_message_edit(self, before, after):
-        if before.author.bot:
+        if not before.guild or before.author.bot:
             return
-            
-        if not before.guild:
-            return
-            
+
         if before.content == after.content:
             return
-            
-        if before.guild.id not in self.edited_messages:
-            self.edited_messages[before.guild.id] = {}
-            
-        if before.channel.id not in self.edited_messages[before.guild.id]:
-            self.edited_messages[before.guild.id][before.channel.id] = []
-            
-        self.edited_messages[before.guild.id][before.channel.id].append({
-            'before': before.content,
-            'after': after.content,
-            'author': before.author,
-            'timestamp': datetime.utcnow(),
-            'message_id': before.id
-        })
-        
-        self.edited_messages[before.guild.id][before.channel.id] = \
-            self.edited_messages[before.guild.id][before.channel.id][-5:]
+
+        snapshot = MessageSnapshot.from_message(before, after=after.content)
+        self.snipes.add_edited(snapshot)
+
+        self.bot.dispatch('message_snapshot_edit', snapshot)
 
 async def setup(bot):
-    await bot.add_cog(MessageTrackingEvents(bot)) 
\ No newline at end of file
+    await bot.add_cog(MessageTrackingEvents(bot))
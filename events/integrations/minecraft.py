@@ -2,7 +2,6 @@
 
 import discord
 from discord.ext import commands, tasks
-import aiohttp
 import asyncio
 from utils.helpers import PermissionHandler
 from datetime import datetime, timezone
@@ -18,21 +17,19 @@ class Minecraft(commands.Cog):
 
     async def get_latest_version(self):
         """Get latest Minecraft version information"""
-        async with aiohttp.ClientSession() as session:
-            url = "https://launchermeta.mojang.com/mc/game/version_manifest.json"
-            async with session.get(url) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data['latest'], data['versions'][0]
+        url = "https://launchermeta.mojang.com/mc/game/version_manifest.json"
+        async with self.bot.session.get(url) as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                return data['latest'], data['versions'][0]
         return None, None
 
     async def get_version_details(self, version_id):
         """Get version details from Mojang API"""
-        async with aiohttp.ClientSession() as session:
-            url = f"https://launchermeta.mojang.com/v1/packages/b2e6d56509565a7b62b6cc272f6e01a7/versions/{version_id}/changelog.json"
-            async with session.get(url) as resp:
-                if resp.status == 200:
-                    return await resp.json()
+        url = f"https://launchermeta.mojang.com/v1/packages/b2e6d56509565a7b62b6cc272f6e01a7/versions/{version_id}/changelog.json"
+        async with self.bot.session.get(url) as resp:
+            if resp.status == 200:
+                return await resp.json()
         return None
 
     @tasks.loop(minutes=5)
@@ -162,7 +159,7 @@ class Minecraft(commands.Cog):
     async def channel(self, ctx, channel: discord.TextChannel):
         """Set the notifications channel"""
 
-        settings = self.bot.settings.get_all_server_settings(ctx.guild.id)
+        settings = dict(self.bot.settings.get_all_server_settings(ctx.guild.id))
         settings.setdefault('minecraft', {})['notifications_channel'] = channel.id
         self.bot.settings.set_server_setting(ctx.guild.id, 'minecraft', settings['minecraft'])
         await ctx.send(f"Minecraft update notifications will be sent to {channel.mention}")
@@ -172,7 +169,7 @@ class Minecraft(commands.Cog):
     async def role(self, ctx, role: discord.Role):
 
         """Set a role to be pinged for Minecraft updates"""
-        settings = self.bot.settings.get_all_server_settings(ctx.guild.id)
+        settings = dict(self.bot.settings.get_all_server_settings(ctx.guild.id))
         settings.setdefault('minecraft', {})
 
         if 'ping_role' in settings['minecraft'] and settings['minecraft']['ping_role'] == role.id:
@@ -2,7 +2,6 @@
 
 import discord
 from discord.ext import commands, tasks
-import aiohttp
 import asyncio
 from utils.helpers import PermissionHandler
 from datetime import datetime, timezone
@@ -23,17 +22,16 @@ class Twitch(commands.Cog):
 
     async def get_access_token(self):
         """Get Twitch API access token"""
-        async with aiohttp.ClientSession() as session:
-            params = {
-                'client_id': self.twitch_client_id,
-                'client_secret': self.twitch_client_secret,
-                'grant_type': 'client_credentials'
-            }
-            async with session.post('https://id.twitch.tv/oauth2/token', params=params) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    self.access_token = data['access_token']
-                    return self.access_token
+        params = {
+            'client_id': self.twitch_client_id,
+            'client_secret': self.twitch_client_secret,
+            'grant_type': 'client_credentials'
+        }
+        async with self.bot.session.post('https://id.twitch.tv/oauth2/token', params=params) as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                self.access_token = data['access_token']
+                return self.access_token
         return None
 
     async def get_stream_info(self, username):
@@ -46,34 +44,34 @@ class Twitch(commands.Cog):
             'Authorization': f'Bearer {self.access_token}'
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f'https://api.twitch.tv/helix/streams?user_login={username}', headers=headers) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
+        session = self.bot.session
+        async with session.get(f'https://api.twitch.tv/helix/streams?user_login={username}', headers=headers) as resp:
+            if resp.status == 200:
+                data = await resp.json()
 
-                    stream_data = data['data'][0] if data['data'] else None
-                    if not stream_data:
-                        return None
+                stream_data = data['data'][0] if data['data'] else None
+                if not stream_data:
+                    return None
                     
-                    user_id = stream_data['user_id']
-                    async with session.get(f'https://api.twitch.tv/helix/users?id={user_id}', headers=headers) as user_resp:
-                        if user_resp.status == 200:
-                            user_data = await user_resp.json()
-                            if user_data['data']:
-                                stream_data['profile_image'] = user_data['data'][0]['profile_image_url']
-                                stream_data['display_name'] = user_data['data'][0]['display_name']
-
-                    if stream_data['game_id']:
-                        async with session.get(f'https://api.twitch.tv/helix/games?id={stream_data["game_id"]}', headers=headers) as game_resp:
-                            if game_resp.status == 200:
-                                game_data = await game_resp.json()
-                                if game_data['data']:
-                                    stream_data['game_box_art'] = game_data['data'][0]['box_art_url'].replace('{width}', '188').replace('{height}', '250')
-
-                    return stream_data
-                elif resp.status == 401:
-                    await self.get_access_token()
-                    return await self.get_stream_info(username)
+                user_id = stream_data['user_id']
+                async with session.get(f'https://api.twitch.tv/helix/users?id={user_id}', headers=headers) as user_resp:
+                    if user_resp.status == 200:
+                        user_data = await user_resp.json()
+                        if user_data['data']:
+                            stream_data['profile_image'] = user_data['data'][0]['profile_image_url']
+                            stream_data['display_name'] = user_data['data'][0]['display_name']
+
+                if stream_data['game_id']:
+                    async with session.get(f'https://api.twitch.tv/helix/games?id={stream_data["game_id"]}', headers=headers) as game_resp:
+                        if game_resp.status == 200:
+                            game_data = await game_resp.json()
+                            if game_data['data']:
+                                stream_data['game_box_art'] = game_data['data'][0]['box_art_url'].replace('{width}', '188').replace('{height}', '250')
+
+                return stream_data
+            elif resp.status == 401:
+                await self.get_access_token()
+                return await self.get_stream_info(username)
         return None
 
     #################################
@@ -227,7 +225,7 @@ class Twitch(commands.Cog):
     async def channel(self, ctx, channel: discord.TextChannel):
         """Set the notifications channel"""
 
-        settings = self.bot.settings.get_all_server_settings(ctx.guild.id)
+        settings = dict(self.bot.settings.get_all_server_settings(ctx.guild.id))
         settings.setdefault('twitch', {})['notifications_channel'] = channel.id
         self.bot.settings.set_server_setting(ctx.guild.id, 'twitch', settings['twitch'])
         await ctx.send(f"Twitch notifications will be sent to {channel.mention}")
@@ -240,7 +238,7 @@ class Twitch(commands.Cog):
     async def add(self, ctx, streamer: str, *, roles: str = None):
 
         """Add a Twitch streamer to track"""
-        settings = self.bot.settings.get_all_server_settings(ctx.guild.id)
+        settings = dict(self.bot.settings.get_all_server_settings(ctx.guild.id))
         settings.setdefault('twitch', {}).setdefault('streamers', {})
 
         role_ids = []
@@ -318,7 +316,7 @@ class Twitch(commands.Cog):
     @PermissionHandler.has_permissions(manage_guild=True)
     async def role(self, ctx, role: discord.Role):
         """Set a role to be pinged for all Twitch notifications"""
-        settings = self.bot.settings.get_all_server_settings(ctx.guild.id)
+        settings = dict(self.bot.settings.get_all_server_settings(ctx.guild.id))
         settings.setdefault('twitch', {})
         
         if 'ping_role' in settings['twitch'] and settings['twitch']['ping_role'] == role.id:
@@ -2,7 +2,6 @@
 
 import discord
 from discord.ext import commands, tasks
-import aiohttp
 import asyncio
 from utils.helpers import PermissionHandler
 from datetime import datetime, timezone
@@ -19,43 +18,41 @@ class YouTube(commands.Cog):
 
     async def get_channel_info(self, channel_id):
         """Get channel information from YouTube API"""
-        async with aiohttp.ClientSession() as session:
-            url = f"https://www.googleapis.com/youtube/v3/channels"
-            params = {
-                'key': self.youtube_api_key,
-                'id': channel_id,
-                'part': 'snippet,contentDetails'
-            }
+        url = f"https://www.googleapis.com/youtube/v3/channels"
+        params = {
+            'key': self.youtube_api_key,
+            'id': channel_id,
+            'part': 'snippet,contentDetails'
+        }
             
-            async with session.get(url, params=params) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data['items'][0] if data['items'] else None
+        async with self.bot.session.get(url, params=params) as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                return data['items'][0] if data['items'] else None
         return None
 
     async def get_latest_content(self, playlist_id):
         """Get latest videos/streams from a channel's upload playlist"""
-        async with aiohttp.ClientSession() as session:
-            url = f"https://www.googleapis.com/youtube/v3/playlistItems"
-            params = {
-                'key': self.youtube_api_key,
-                'playlistId': playlist_id,
-                'part': 'snippet,contentDetails',
-                'maxResults': 1,
-                'order': 'date'
-            }
+        url = f"https://www.googleapis.com/youtube/v3/playlistItems"
+        params = {
+            'key': self.youtube_api_key,
+            'playlistId': playlist_id,
+            'part': 'snippet,contentDetails',
+            'maxResults': 1,
+            'order': 'date'
+        }
             
-            async with session.get(url, params=params) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    if data['items']:
-                        video = data['items'][0]
-                        publish_time = datetime.fromisoformat(video['snippet']['publishedAt'].replace('Z', '+00:00'))
-                        now = datetime.now(timezone.utc)
-                        if (now - publish_time).total_seconds() > 3600:
-                            return None
-                        return video
-                return None
+        async with self.bot.session.get(url, params=params) as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                if data['items']:
+                    video = data['items'][0]
+                    publish_time = datetime.fromisoformat(video['snippet']['publishedAt'].replace('Z', '+00:00'))
+                    now = datetime.now(timezone.utc)
+                    if (now - publish_time).total_seconds() > 3600:
+                        return None
+                    return video
+            return None
 
     async def get_channel_id_from_url(self, identifier):
         """Extract or fetch channel ID from various YouTube URL formats or username"""
@@ -74,36 +71,36 @@ class YouTube(commands.Cog):
         else:
             username = identifier.lstrip('@')
 
-        async with aiohttp.ClientSession() as session:
-            url = "https://www.googleapis.com/youtube/v3/channels"
-            params = {
-                'key': self.youtube_api_key,
-                'forHandle': username,
-                'part': 'id'
-            }
+        session = self.bot.session
+        url = "https://www.googleapis.com/youtube/v3/channels"
+        params = {
+            'key': self.youtube_api_key,
+            'forHandle': username,
+            'part': 'id'
+        }
             
-            async with session.get(url, params=params) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    if data.get('items'):
-                        return data['items'][0]['id']
-
-            url = "https://www.googleapis.com/youtube/v3/search"
-            params = {
-                'key': self.youtube_api_key,
-                'q': username,
-                'type': 'channel',
-                'part': 'id,snippet',
-                'maxResults': 5
-            }
+        async with session.get(url, params=params) as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                if data.get('items'):
+                    return data['items'][0]['id']
+
+        url = "https://www.googleapis.com/youtube/v3/search"
+        params = {
+            'key': self.youtube_api_key,
+            'q': username,
+            'type': 'channel',
+            'part': 'id,snippet',
+            'maxResults': 5
+        }
             
-            async with session.get(url, params=params) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    if data.get('items'):
-                        for item in data['items']:
-                            if item['snippet']['title'].lower() == username.lower():
-                                return item['id']['channelId']
+        async with session.get(url, params=params) as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                if data.get('items'):
+                    for item in data['items']:
+                        if item['snippet']['title'].lower() == username.lower():
+                            return item['id']['channelId']
         return None
 
     class WatchVideoButton(discord.ui.View):
@@ -234,7 +231,7 @@ class YouTube(commands.Cog):
     @PermissionHandler.has_permissions(manage_guild=True)
     async def channel(self, ctx, channel: discord.TextChannel):
         """Set the notifications channel"""
-        settings = self.bot.settings.get_all_server_settings(ctx.guild.id)
+        settings = dict(self.bot.settings.get_all_server_settings(ctx.guild.id))
         settings.setdefault('youtube', {})['notifications_channel'] = channel.id
         self.bot.settings.set_server_setting(ctx.guild.id, 'youtube', settings['youtube'])
         await ctx.send(f"YouTube notifications will be sent to {channel.mention}")
@@ -249,7 +246,7 @@ class YouTube(commands.Cog):
                 await ctx.send("Could not find that YouTube channel. Please check the URL or username.")
                 return
 
-            settings = self.bot.settings.get_all_server_settings(ctx.guild.id)
+            settings = dict(self.bot.settings.get_all_server_settings(ctx.guild.id))
             settings.setdefault('youtube', {}).setdefault('channels', {})
 
             channel_info = await self.get_channel_info(channel_id)
@@ -329,7 +326,7 @@ class YouTube(commands.Cog):
     @PermissionHandler.has_permissions(manage_guild=True)
     async def role(self, ctx, role: discord.Role):
         """Set a role to be pinged for all YouTube notifications"""
-        settings = self.bot.settings.get_all_server_settings(ctx.guild.id)
+        settings = dict(self.bot.settings.get_all_server_settings(ctx.guild.id))
         settings.setdefault('youtube', {})
         
         if 'ping_role' in settings['youtube'] and settings['youtube']['ping_role'] == role.id:
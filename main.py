@@ -1,15 +1,23 @@
 import discord
 import asyncio
 import random
-import json
 import logging
 import os
-from typing import List, Union
+from typing import Optional
 
+import aiohttp
 from dotenv import load_dotenv
 from discord.ext import commands
 
 from utils.settings.handler import ServerSettings
+from utils.cache.users import UserResolver
+from utils.cache.prefixes import PrefixCache
+from utils.scheduler.timers import TimerScheduler
+from utils.logs.queue import LogQueue
+from utils.logs.webhooks import WebhookSink
+from utils.helpers.messages import MessageFacts
+from utils.helpers.http import create_session
+from utils.helpers.strings import get_list
 
 #################################
 # Environment
@@ -40,11 +48,24 @@ class Bot(commands.Bot):
         )
 
         self.settings = ServerSettings()
+        self.prefixes = PrefixCache(self.settings, self.default_prefixes)
+        self.user_resolver = UserResolver(self)
+        self.timers = TimerScheduler(self)
+        # Shared pooled HTTP session; created in setup_hook once the event loop is running
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.log_webhooks: Optional[WebhookSink] = None
+        self.log_queue: Optional[LogQueue] = None
 
     #################################
     ## Setup Hook
     #################################
     async def setup_hook(self):
+        self.settings.start()
+
+        self.session = create_session()
+        self.log_webhooks = WebhookSink(self, self.session)
+        self.log_queue = LogQueue(self, webhooks=self.log_webhooks)
+
         logger.info("Loading core events...")
         for event in ['logging', 'messages', 'errors']:
             try:
@@ -75,21 +96,36 @@ class Bot(commands.Bot):
             except Exception as e:
                 logger.exception(f"Failed to load {extension}")
 
+        # Started after the cogs so their timer listeners are registered
+        await self.timers.start()
+
+    #################################
+    ## Shutdown
+    #################################
+    async def close(self):
+        try:
+            if self.log_queue is not None:
+                await self.log_queue.close()
+        except Exception:
+            logger.exception("Failed to flush queued logs")
+
+        try:
+            await super().close()
+        finally:
+            await self.timers.close()
+            await self.settings.close()
+            if self.session is not None:
+                await self.session.close()
+
     #################################
     ## Ready and Status
     #################################
     async def on_ready(self):
         logger.info(f"{self.user} is online!")
 
-        status_messages = []
-        try:
-            with open("data/strings.json", "r", encoding="utf-8") as f:
-                strings = json.load(f)
-                status_messages = strings.get("status", []) if isinstance(strings, dict) else []
-        except FileNotFoundError:
-            logger.warning("data/strings.json not found; using default status message")
-        except json.JSONDecodeError:
-            logger.exception("Failed to parse data/strings.json; using default status message")
+        status_messages = await get_list("status", [])
+        if not status_messages:
+            logger.warning("No status messages in data/strings.json; using default status message")
 
         await self.change_presence(
             status=discord.Status.idle,
@@ -111,23 +147,28 @@ class Bot(commands.Bot):
         self.loop.create_task(rotate_status())
 
     #################################
-    ## Get Prefix
+    ## Message Pipeline
     #################################
-    async def get_prefix(self, message):
-        if not message.guild:
-            return self.default_prefixes
-
-        settings = self.settings.get_all_server_settings(message.guild.id)
-        prefixes = []
+    async def on_message(self, message):
+        """Parse each message once and share the result with listeners.
 
-        custom_prefix = settings.get("prefix")
-        if custom_prefix:
-            prefixes.append(custom_prefix)
+        Cogs listen to `on_message_context(ctx, facts)` instead of
+        `on_message`, so prefix resolution and command lookup are not repeated
+        per listener.
+        """
+        ctx = await self.get_context(message)
+        facts = MessageFacts.from_context(ctx)
+        self.dispatch('message_context', ctx, facts)
 
-        if settings.get("use_default_prefix", True):
-            prefixes.extend(self.default_prefixes)
+        if not facts.is_bot:
+            await self.invoke(ctx)
 
-        return prefixes if prefixes else self.default_prefixes
+    #################################
+    ## Get Prefix
+    #################################
+    async def get_prefix(self, message):
+        """Return the guild's prefixes, longest first."""
+        return self.prefixes.get(message.guild.id if message.guild else None).prefixes
 
 
 # ----------------------------------
@@ -0,0 +1,143 @@
+"""Stub tests for log batching and webhook rate limiting.
+
+The bot, channel and settings are stand-ins, and the Discord webhook API is a
+local aiohttp server that answers the first request with a 429.
+
+Run from the project root:
+    python -m unittest discover -s tests
+"""
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+import discord
+from aiohttp import web
+
+from utils.helpers.http import create_session
+from utils.logs.queue import LogQueue
+from utils.logs.webhooks import WebhookSink
+
+GUILD_ID = 1
+CHANNEL_ID = 10
+BOT_ID = 99
+
+
+class StubChannel:
+    def __init__(self) -> None:
+        self.id = CHANNEL_ID
+        self.guild = SimpleNamespace(me=None)
+        self.sent = []
+        self.delay = 0.0
+
+    def permissions_for(self, member):
+        return SimpleNamespace(send_messages=True, embed_links=True, manage_webhooks=True)
+
+    async def send(self, *, embeds):
+        await asyncio.sleep(self.delay)
+        self.sent.append(len(embeds))
+
+    async def webhooks(self):
+        return [SimpleNamespace(id=5, token='token', user=SimpleNamespace(id=BOT_ID))]
+
+
+class StubSettings:
+    def __init__(self, **settings) -> None:
+        self.settings = settings
+
+    def get_all_server_settings(self, guild_id):
+        return self.settings
+
+
+class StubBot:
+    def __init__(self, channel: StubChannel, **settings) -> None:
+        self.channel = channel
+        self.settings = StubSettings(
+            log_channel_messages=CHANNEL_ID, log_channel_profiles=CHANNEL_ID, **settings
+        )
+        self.user = SimpleNamespace(
+            id=BOT_ID, name='cro', display_avatar=SimpleNamespace(url='https://example.com/a.png')
+        )
+
+    def get_channel(self, channel_id):
+        return self.channel if channel_id == self.channel.id else None
+
+
+class LogDeliveryTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.requests = []
+
+        async def execute(request: web.Request) -> web.Response:
+            payload = await request.json()
+            self.requests.append(len(payload['embeds']))
+            if len(self.requests) == 1:
+                return web.json_response({'retry_after': 0.01}, status=429)
+            return web.Response(status=204)
+
+        app = web.Application()
+        app.router.add_post('/webhooks/{id}/{token}', execute)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, '127.0.0.1', 0).start()
+        self.api_base = f"http://127.0.0.1:{self.runner.addresses[0][1]}"
+        self.session = create_session()
+
+    async def asyncTearDown(self) -> None:
+        await self.session.close()
+        await self.runner.cleanup()
+
+    def make_queue(self, **settings):
+        channel = StubChannel()
+        bot = StubBot(channel, **settings)
+        sink = WebhookSink(bot, api_base=self.api_base, session=self.session)
+        return channel, sink, LogQueue(bot, webhooks=sink, flush_delay=0.01)
+
+    async def test_embeds_are_batched_per_message(self) -> None:
+        channel, _, queue = self.make_queue()
+        for i in range(25):
+            self.assertTrue(queue.submit_log(GUILD_ID, 'messages', discord.Embed(title=str(i))))
+        await queue.close()
+
+        self.assertEqual(channel.sent, [10, 10, 5])
+        self.assertEqual(queue.stats['sent_embeds'], 25)
+
+    async def test_close_keeps_batch_being_sent(self) -> None:
+        channel, _, queue = self.make_queue()
+        channel.delay = 0.05
+        for i in range(15):
+            queue.submit_log(GUILD_ID, 'messages', discord.Embed(title=str(i)))
+        await asyncio.sleep(0.02)
+        await queue.close()
+
+        self.assertEqual(sorted(channel.sent), [5, 10])
+
+    async def test_rate_limited_webhook_is_retried(self) -> None:
+        channel, sink, queue = self.make_queue(log_webhooks=['messages'])
+        for i in range(3):
+            queue.submit_log(GUILD_ID, 'messages', discord.Embed(title=str(i)))
+        await queue.close()
+
+        self.assertEqual(self.requests, [3, 3])
+        self.assertEqual(sink.stats['rate_limited'], 1)
+        self.assertEqual(sink.stats['sent'], 1)
+        self.assertEqual(channel.sent, [])
+
+    async def test_log_types_sharing_a_channel_keep_their_route(self) -> None:
+        channel, sink, queue = self.make_queue(log_webhooks=['messages'])
+        queue.submit_log(GUILD_ID, 'profiles', discord.Embed(title='profile'))
+        queue.submit_log(GUILD_ID, 'messages', discord.Embed(title='message'))
+        await queue.close()
+
+        self.assertEqual(channel.sent, [1])
+        self.assertEqual(sink.stats['sent'], 1)
+
+    async def test_malformed_webhook_setting_falls_back_to_bot(self) -> None:
+        channel, _, queue = self.make_queue(log_webhooks=CHANNEL_ID)
+        queue.submit_log(GUILD_ID, 'messages', discord.Embed(title='x'))
+        await queue.close()
+
+        self.assertEqual(channel.sent, [1])
+        self.assertEqual(self.requests, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
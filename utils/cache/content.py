@@ -0,0 +1,136 @@
+import sys
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+# Approximate cost of one OrderedDict slot plus its int key
+_ENTRY_OVERHEAD = 120
+
+
+class StoredMessage:
+    """Compact copy of a message: IDs and strings only, no discord.py objects."""
+
+    __slots__ = ('id', 'channel_id', 'author_id', 'content', 'attachments', 'size')
+
+    def __init__(self, id: int, channel_id: int, author_id: int,
+                 content: str, attachments: Tuple[str, ...] = ()) -> None:
+        self.id = id
+        self.channel_id = channel_id
+        self.author_id = author_id
+        self.content = content
+        self.attachments = attachments
+        self.size = self._measure()
+
+    def _measure(self) -> int:
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(self.content)
+            + sys.getsizeof(self.attachments)
+            + sum(sys.getsizeof(url) for url in self.attachments)
+            + _ENTRY_OVERHEAD
+        )
+
+    def replace_content(self, content: str) -> int:
+        """Update the content after an edit. Returns the change in size."""
+        old_size = self.size
+        self.content = content
+        self.size = self._measure()
+        return self.size - old_size
+
+
+class _GuildContent:
+    __slots__ = ('messages', 'bytes')
+
+    def __init__(self) -> None:
+        self.messages: 'OrderedDict[int, StoredMessage]' = OrderedDict()
+        self.bytes = 0
+
+
+class ContentStore:
+    """Memory-bounded store of recent message content per guild.
+
+    Lets delete/edit logging work for messages that have already left
+    discord.py's message cache. Each guild gets a byte budget; once it is
+    exceeded the least recently stored or touched messages are evicted.
+    """
+
+    def __init__(self, guild_budget: int = 512 * 1024) -> None:
+        self.guild_budget = guild_budget
+        self._guilds: Dict[int, _GuildContent] = {}
+        self.evictions = 0
+
+    def add(self, guild_id: int, message_id: int, channel_id: int, author_id: int,
+            content: str, attachments: Iterable[str] = ()) -> None:
+        """Store a message, evicting older ones if the guild is over budget."""
+        record = StoredMessage(message_id, channel_id, author_id, content, tuple(attachments))
+        if record.size > self.guild_budget:
+            return
+
+        guild = self._guilds.get(guild_id)
+        if guild is None:
+            guild = self._guilds[guild_id] = _GuildContent()
+
+        previous = guild.messages.pop(message_id, None)
+        if previous is not None:
+            guild.bytes -= previous.size
+
+        guild.messages[message_id] = record
+        guild.bytes += record.size
+        self._evict(guild)
+
+    def get(self, guild_id: int, message_id: int) -> Optional[StoredMessage]:
+        guild = self._guilds.get(guild_id)
+        if guild is None:
+            return None
+
+        record = guild.messages.get(message_id)
+        if record is not None:
+            guild.messages.move_to_end(message_id)
+        return record
+
+    def update(self, guild_id: int, message_id: int, content: str) -> Optional[StoredMessage]:
+        """Replace a stored message's content. Returns the record, or None if not stored."""
+        guild = self._guilds.get(guild_id)
+        record = guild.messages.get(message_id) if guild else None
+        if record is None:
+            return None
+
+        guild.bytes += record.replace_content(content)
+        guild.messages.move_to_end(message_id)
+        self._evict(guild)
+        return record
+
+    def pop(self, guild_id: int, message_id: int) -> Optional[StoredMessage]:
+        guild = self._guilds.get(guild_id)
+        if guild is None:
+            return None
+
+        record = guild.messages.pop(message_id, None)
+        if record is not None:
+            guild.bytes -= record.size
+            if not guild.messages:
+                del self._guilds[guild_id]
+        return record
+
+    def clear_guild(self, guild_id: int) -> None:
+        self._guilds.pop(guild_id, None)
+
+    def _evict(self, guild: _GuildContent) -> None:
+        while guild.bytes > self.guild_budget and guild.messages:
+            _, record = guild.messages.popitem(last=False)
+            guild.bytes -= record.size
+            self.evictions += 1
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Memory use across all guilds (sizes are estimates in bytes)."""
+        return {
+            'guilds': len(self._guilds),
+            'messages': sum(len(g.messages) for g in self._guilds.values()),
+            'bytes': sum(g.bytes for g in self._guilds.values()),
+            'evictions': self.evictions,
+        }
+
+    def guild_usage(self, guild_id: int) -> Tuple[int, int]:
+        """Return (messages, bytes) stored for a guild."""
+        guild = self._guilds.get(guild_id)
+        return (len(guild.messages), guild.bytes) if guild else (0, 0)
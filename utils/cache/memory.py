@@ -1,51 +1,217 @@
-from typing import Any, Dict, Optional
-from datetime import datetime, timedelta
+import asyncio
+import heapq
+import itertools
+import sys
 import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class _ComputationCancelled(Exception):
+    """Set on a shared computation whose owner was cancelled, so waiters retry."""
+
 
 class CacheEntry:
-    def __init__(self, value: Any, ttl: Optional[int] = None):
+    __slots__ = ('value', 'expires_at', 'size')
+
+    def __init__(self, value: Any, expires_at: Optional[float], size: int) -> None:
         self.value = value
-        self.expires_at = time.time() + ttl if ttl else None
+        self.expires_at = expires_at
+        self.size = size
 
-    def is_expired(self) -> bool:
-        if self.expires_at is None:
-            return False
-        return time.time() > self.expires_at
 
 class MemoryCache:
-    def __init__(self):
-        self._cache: Dict[str, CacheEntry] = {}
+    """In-memory LRU cache with per-entry TTLs.
+
+    The cache holds at most `max_entries` entries and, if `max_bytes` is set,
+    at most that many bytes as measured by `sizeof` (shallow `sys.getsizeof`
+    by default; sizes are not tracked without a byte limit). When either
+    limit is exceeded the least recently used entries are evicted. Deadlines
+    are kept in a min-heap, so expiring an entry costs O(log n) instead of a
+    scan. `get_or_set` lets concurrent misses for the same key share one
+    computation.
+
+    Args:
+        max_entries: Maximum number of entries
+        max_bytes: Optional limit on the estimated total size of values
+        default_ttl: TTL in seconds for entries set without one; None never expires
+        sizeof: Function estimating the size of a value in bytes
+    """
+
+    def __init__(self, max_entries: int = 10_000, max_bytes: Optional[int] = None,
+                 default_ttl: Optional[float] = None,
+                 sizeof: Callable[[Any], int] = sys.getsizeof) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.sizeof = sizeof
 
-    def get(self, key: str) -> Optional[Any]:
-        """Get a value from cache"""
-        entry = self._cache.get(key)
+        self._data: 'OrderedDict[Hashable, CacheEntry]' = OrderedDict()
+        # (expires_at, seq, key, entry); entries replaced or removed early
+        # go stale and are skipped
+        self._deadlines: List[Tuple[float, int, Hashable, CacheEntry]] = []
+        self._seq = itertools.count()
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'entries': len(self._data),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'shared': self.shared,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key) is not None
+
+    #################################
+    ## Reads
+    #################################
+    def _lookup(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self._data.get(key)
         if entry is None:
             return None
-            
-        if entry.is_expired():
-            del self._cache[key]
+
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            self._remove(key, entry)
+            self.expirations += 1
             return None
-            
+        return entry
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value from cache, marking it as recently used"""
+        entry = self._lookup(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
         return entry.value
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
-        """Set a value in cache with optional TTL in seconds"""
-        self._cache[key] = CacheEntry(value, ttl)
+    async def get_or_set(self, key: Hashable, coro_factory: Callable[[], Awaitable[Any]],
+                         ttl: Optional[float] = None) -> Any:
+        """Return the cached value, or compute, cache and return it.
+
+        `coro_factory` is only called on a miss, and concurrent callers missing
+        the same key wait for that one computation. If it raises, every waiter
+        gets the exception and nothing is cached. If the caller running it is
+        cancelled, the waiters start over instead.
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.shared += 1
+            try:
+                return await asyncio.shield(pending)
+            except _ComputationCancelled:
+                return await self.get_or_set(key, coro_factory, ttl)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        # Waiters may all be gone by the time a computation fails
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._pending[key] = future
+        try:
+            value = await coro_factory()
+        except asyncio.CancelledError:
+            future.set_exception(_ComputationCancelled())
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._pending.pop(key, None)
+
+        self.set(key, value, ttl)
+        future.set_result(value)
+        return value
+
+    #################################
+    ## Writes
+    #################################
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Set a value with a TTL in seconds, falling back to `default_ttl`"""
+        if ttl is None:
+            ttl = self.default_ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
 
-    def delete(self, key: str) -> None:
+        # Sizes are only needed when there is a byte limit to enforce
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.delete(key)
+            return
+
+        previous = self._data.pop(key, None)
+        if previous is not None:
+            self.bytes -= previous.size
+
+        entry = self._data[key] = CacheEntry(value, expires_at, size)
+        self.bytes += size
+        if expires_at is not None:
+            heapq.heappush(self._deadlines, (expires_at, next(self._seq), key, entry))
+
+        if self._deadlines and self._deadlines[0][0] <= time.monotonic():
+            self.cleanup()
+        if len(self._data) > self.max_entries or self.max_bytes is not None:
+            self._evict()
+        # Deadlines of overwritten or evicted entries would otherwise pile up
+        if len(self._deadlines) > 2 * len(self._data) + 64:
+            self._compact()
+
+    def delete(self, key: Hashable) -> None:
         """Delete a value from cache"""
-        self._cache.pop(key, None)
+        entry = self._data.get(key)
+        if entry is not None:
+            self._remove(key, entry)
 
     def clear(self) -> None:
         """Clear all values from cache"""
-        self._cache.clear()
+        self._data.clear()
+        self._deadlines.clear()
+        self.bytes = 0
 
     def cleanup(self) -> None:
-        """Remove all expired entries"""
-        current_time = time.time()
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if entry.expires_at and current_time > entry.expires_at
-        ]
-        for key in expired_keys:
-            del self._cache[key] 
\ No newline at end of file
+        """Remove expired entries, cheapest-first from the deadline heap"""
+        now = time.monotonic()
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            _, _, key, entry = heapq.heappop(deadlines)
+            if self._data.get(key) is entry:
+                self._remove(key, entry)
+                self.expirations += 1
+
+    def _compact(self) -> None:
+        self._deadlines = [d for d in self._deadlines if self._data.get(d[2]) is d[3]]
+        heapq.heapify(self._deadlines)
+
+    def _remove(self, key: Hashable, entry: CacheEntry) -> None:
+        del self._data[key]
+        self.bytes -= entry.size
+
+    def _evict(self) -> None:
+        while len(self._data) > self.max_entries or (
+            self.max_bytes is not None and self.bytes > self.max_bytes
+        ):
+            _, entry = self._data.popitem(last=False)
+            self.bytes -= entry.size
+            self.evictions += 1
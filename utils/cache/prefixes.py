@@ -0,0 +1,71 @@
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from utils.settings.handler import ServerSettings
+
+
+class PrefixMatcher:
+    """An immutable set of prefixes, ordered longest first.
+
+    Longest-first ordering means overlapping prefixes (e.g. `!` and `!!`)
+    resolve to the most specific one.
+    """
+
+    __slots__ = ('prefixes',)
+
+    def __init__(self, prefixes: Iterable[str]) -> None:
+        self.prefixes: Tuple[str, ...] = tuple(
+            sorted(dict.fromkeys(p for p in prefixes if p), key=len, reverse=True)
+        )
+
+    def match(self, content: str) -> Optional[str]:
+        """Return the longest prefix `content` starts with, or None."""
+        if not content.startswith(self.prefixes):
+            return None
+        for prefix in self.prefixes:
+            if content.startswith(prefix):
+                return prefix
+        return None
+
+
+class PrefixCache:
+    """Per-guild compiled prefix matchers.
+
+    A guild's matcher is rebuilt only when its `prefix` or
+    `use_default_prefix` setting changes. Staleness is detected by comparing
+    against the guild's cached settings view, which is replaced whenever that
+    guild's settings change, so an unchanged guild costs one identity check.
+    """
+
+    def __init__(self, settings: ServerSettings, default_prefixes: Sequence[str]) -> None:
+        self.settings = settings
+        self.default = PrefixMatcher(default_prefixes)
+        self._default_prefixes = tuple(default_prefixes)
+        # guild_id -> (settings view, (prefix, use_default_prefix), matcher)
+        self._matchers: Dict[int, Tuple[object, Tuple, PrefixMatcher]] = {}
+
+    def get(self, guild_id: Optional[int]) -> PrefixMatcher:
+        """Return the matcher for a guild, or the default one for DMs."""
+        if guild_id is None:
+            return self.default
+
+        view = self.settings.get_all_server_settings(guild_id)
+        cached = self._matchers.get(guild_id)
+        if cached is not None and cached[0] is view:
+            return cached[2]
+
+        key = (view.get('prefix'), view.get('use_default_prefix', True))
+        if cached is not None and cached[1] == key:
+            matcher = cached[2]
+        else:
+            matcher = self._build(*key)
+
+        self._matchers[guild_id] = (view, key, matcher)
+        return matcher
+
+    def _build(self, custom_prefix: Optional[str], use_default: bool) -> PrefixMatcher:
+        prefixes = []
+        if custom_prefix:
+            prefixes.append(custom_prefix)
+        if use_default:
+            prefixes.extend(self._default_prefixes)
+        return PrefixMatcher(prefixes) if prefixes else self.default
@@ -0,0 +1,66 @@
+import logging
+from typing import Dict, Optional, Union
+
+import discord
+
+from .memory import MemoryCache
+
+logger = logging.getLogger(__name__)
+
+
+class UserResolver:
+    """Resolves users by ID with as few REST calls as possible.
+
+    Lookups try the guild member cache and the gateway user cache first, then
+    an LRU cache of previously fetched users (entries expire after `ttl`
+    seconds), and only then call `fetch_user`. Concurrent fetches for the same
+    ID share a single request.
+    """
+
+    def __init__(self, bot: discord.Client, max_size: int = 1000, ttl: float = 600.0) -> None:
+        self.bot = bot
+        self.max_size = max_size
+        self.ttl = ttl
+        self._fetched = MemoryCache(max_entries=max_size, default_ttl=ttl)
+
+        self.gateway_hits = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters. `misses` is the number of REST calls made."""
+        fetched = self._fetched.stats
+        return {
+            'gateway_hits': self.gateway_hits,
+            'cache_hits': fetched['hits'],
+            'shared_fetches': fetched['shared'],
+            'misses': fetched['misses'],
+            'cached': fetched['entries'],
+        }
+
+    async def resolve(self, user_id: int, guild: Optional[discord.Guild] = None,
+                      *, fetch: bool = False) -> Union[discord.Member, discord.User]:
+        """Resolve a user by ID.
+
+        Args:
+            user_id: ID of the user
+            guild: If given, a cached member of this guild is preferred
+            fetch: Skip the gateway cache and return a fetched user, which is
+                required for fields such as `banner`
+
+        Raises:
+            discord.NotFound: The user does not exist
+            discord.HTTPException: Fetching the user failed
+        """
+        user_id = int(user_id)
+
+        if not fetch:
+            user = (guild.get_member(user_id) if guild else None) or self.bot.get_user(user_id)
+            if user is not None:
+                self.gateway_hits += 1
+                return user
+
+        return await self._fetched.get_or_set(user_id, lambda: self.bot.fetch_user(user_id))
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user from the fetched-user cache."""
+        self._fetched.delete(int(user_id))
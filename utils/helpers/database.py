@@ -0,0 +1,44 @@
+import asyncio
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SQLiteStore:
+    """Base for stores backed by one SQLite database.
+
+    The database runs in WAL mode, and every query after setup goes through
+    `_run` on a single worker thread, so disk access stays off the event loop
+    and queries never overlap. Subclasses pass their schema and override
+    `_migrate` to upgrade databases created by older versions.
+    """
+
+    def __init__(self, path: str, schema: str, thread_name: str) -> None:
+        """Open (and create if needed) the database.
+
+        Args:
+            path: Location of the SQLite database
+            schema: Script of `CREATE ... IF NOT EXISTS` statements
+            thread_name: Name prefix for the worker thread
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=thread_name)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(schema)
+        self._migrate()
+        self._conn.commit()
+
+    def _migrate(self) -> None:
+        """Bring databases created by older versions up to date."""
+
+    async def _run(self, func, *args):
+        """Run a blocking database call on the worker thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def close(self) -> None:
+        """Close the database once pending queries have finished."""
+        await self._run(self._conn.close)
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import os
+import logging
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import aiofiles
+import aiofiles.os
+
+logger = logging.getLogger(__name__)
+T = TypeVar('T')
+
+_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _lock_for(path: str) -> asyncio.Lock:
+    """Return the lock that serializes writes to `path`."""
+    key = os.path.abspath(path)
+    lock = _locks.get(key)
+    if lock is None:
+        lock = _locks[key] = asyncio.Lock()
+    return lock
+
+
+def _temp_path(path: str) -> str:
+    return f"{path}.{os.getpid()}.tmp"
+
+
+def replace_file(path: str, payload: str) -> None:
+    """Atomically replace `path` with `payload`.
+
+    Blocking; only call this from a worker thread or at startup.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = _temp_path(path)
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+async def read_text(path: str) -> Optional[str]:
+    """Read a text file without blocking the event loop. Returns None if missing."""
+    try:
+        async with aiofiles.open(path, 'r', encoding='utf-8') as f:
+            return await f.read()
+    except FileNotFoundError:
+        return None
+
+
+async def _write_text(path: str, payload: str) -> None:
+    """Write to a temp file next to `path`, then rename it over the original."""
+    directory = os.path.dirname(path)
+    if directory:
+        await aiofiles.os.makedirs(directory, exist_ok=True)
+
+    tmp = _temp_path(path)
+    async with aiofiles.open(tmp, 'w', encoding='utf-8') as f:
+        await f.write(payload)
+        await f.flush()
+        await asyncio.to_thread(os.fsync, f.fileno())
+    await aiofiles.os.replace(tmp, path)
+
+
+async def read_json(path: str, default: Any = None) -> Any:
+    """Load JSON from `path`, returning `default` if it is missing or invalid."""
+    raw = await read_text(path)
+    if raw is None:
+        return default
+
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        logger.exception(f"Failed to parse {path}")
+        return default
+
+
+async def update_json(path: str, mutate: Callable[[Any], T],
+                      default_factory: Callable[[], Any] = dict,
+                      *, indent: Optional[int] = None) -> T:
+    """Read-modify-write a JSON file under its write lock.
+
+    `mutate` receives the loaded data (or `default_factory()` if the file is
+    missing or invalid), edits it in place and may return a value, which is
+    passed back to the caller.
+    """
+    async with _lock_for(path):
+        data = await read_json(path)
+        if data is None:
+            data = default_factory()
+
+        result = mutate(data)
+        await _write_text(path, json.dumps(data, indent=indent))
+        return result
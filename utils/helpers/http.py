@@ -0,0 +1,29 @@
+import aiohttp
+
+# Connection pool limits for the bot-wide HTTP session
+MAX_CONNECTIONS = 100
+MAX_CONNECTIONS_PER_HOST = 10
+DNS_CACHE_TTL = 300
+
+
+def create_session(total_timeout: float = 15.0, connect_timeout: float = 5.0) -> aiohttp.ClientSession:
+    """Create the pooled HTTP session shared by every cog.
+
+    Connections are kept alive and reused across requests, DNS lookups are
+    cached for `DNS_CACHE_TTL` seconds, and no single host can hold more than
+    `MAX_CONNECTIONS_PER_HOST` connections. Must be called from a running
+    event loop (the bot creates it in `setup_hook`).
+
+    Args:
+        total_timeout: Seconds allowed for a whole request, including reading the body
+        connect_timeout: Seconds allowed to acquire a connection and connect
+    """
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=MAX_CONNECTIONS_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout),
+    )
@@ -0,0 +1,102 @@
+import time
+from typing import Optional, Tuple
+
+import discord
+from discord.ext import commands
+
+
+class MessageFacts:
+    """Cheap facts about a message, computed once by the bot's message pipeline.
+
+    Listeners of `on_message_context` receive these alongside the parsed
+    context, so they can bail out on plain attribute checks instead of each
+    re-parsing the message.
+    """
+
+    __slots__ = ('is_command', 'is_bot', 'in_guild', 'has_mentions', 'mentions_bot', 'is_reply')
+
+    def __init__(self, is_command: bool, is_bot: bool, in_guild: bool,
+                 has_mentions: bool, mentions_bot: bool, is_reply: bool) -> None:
+        self.is_command = is_command
+        self.is_bot = is_bot
+        self.in_guild = in_guild
+        self.has_mentions = has_mentions
+        self.mentions_bot = mentions_bot
+        self.is_reply = is_reply
+
+    @classmethod
+    def from_context(cls, ctx: commands.Context) -> 'MessageFacts':
+        message = ctx.message
+        bot_user = ctx.bot.user
+        return cls(
+            is_command=ctx.valid,
+            is_bot=message.author.bot,
+            in_guild=message.guild is not None,
+            has_mentions=bool(message.mentions),
+            mentions_bot=bot_user is not None and bot_user.mentioned_in(message),
+            is_reply=message.reference is not None,
+        )
+
+    def __repr__(self) -> str:
+        flags = ' '.join(f"{name}={getattr(self, name)}" for name in self.__slots__)
+        return f"<MessageFacts {flags}>"
+
+
+class MessageSnapshot:
+    """Compact copy of a guild message at the moment it was deleted or edited.
+
+    Built once per event by the message tracking hub and handed to every
+    consumer (logging, snipe, edit tracking), so none of them has to keep
+    discord.py objects alive. Holds IDs and strings only. `after` is the new
+    content for edits and None for deletions.
+    """
+
+    __slots__ = (
+        'id', 'guild_id', 'channel_id', 'author_id', 'author_name', 'avatar_url',
+        'content', 'attachments', 'image_url', 'reference_id', 'after', 'at'
+    )
+
+    def __init__(self, id: int, guild_id: int, channel_id: int, author_id: int,
+                 author_name: str, avatar_url: str, content: str,
+                 attachments: Tuple[str, ...] = (), image_url: Optional[str] = None,
+                 reference_id: Optional[int] = None, after: Optional[str] = None,
+                 at: Optional[float] = None) -> None:
+        self.id = id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.author_id = author_id
+        self.author_name = author_name
+        self.avatar_url = avatar_url
+        self.content = content
+        self.attachments = attachments
+        self.image_url = image_url
+        self.reference_id = reference_id
+        self.after = after
+        self.at = time.time() if at is None else at
+
+    @classmethod
+    def from_message(cls, message: discord.Message, after: Optional[str] = None) -> 'MessageSnapshot':
+        image_url = next(
+            (a.url for a in message.attachments if a.content_type and a.content_type.startswith('image/')),
+            None
+        )
+        return cls(
+            id=message.id,
+            guild_id=message.guild.id,
+            channel_id=message.channel.id,
+            author_id=message.author.id,
+            author_name=message.author.name,
+            avatar_url=message.author.display_avatar.url,
+            content=message.content,
+            attachments=tuple(a.url for a in message.attachments),
+            image_url=image_url,
+            reference_id=message.reference.message_id if message.reference else None,
+            after=after,
+        )
+
+    @property
+    def jump_url(self) -> str:
+        return f"https://discord.com/channels/{self.guild_id}/{self.channel_id}/{self.id}"
+
+    def __repr__(self) -> str:
+        return f"<MessageSnapshot id={self.id} channel_id={self.channel_id} author_id={self.author_id}>"
@@ -1,34 +1,31 @@
-import json
 import random
 import logging
 from pathlib import Path
 
+from utils.helpers.files import read_json
+
 logger = logging.getLogger(__name__)
 STRINGS_PATH = Path("data") / "strings.json"
 
 
-def load_strings() -> dict:
-    try:
-        with open(STRINGS_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        logger.debug("strings.json not found; returning empty dict")
-        return {}
-    except json.JSONDecodeError:
-        logger.exception("Failed to parse strings.json")
+async def load_strings() -> dict:
+    data = await read_json(str(STRINGS_PATH))
+    if data is None:
+        logger.debug("strings.json missing or invalid; returning empty dict")
         return {}
+    return data if isinstance(data, dict) else {}
 
 
-def get_list(key: str, default: list) -> list:
-    strings = load_strings()
+async def get_list(key: str, default: list) -> list:
+    strings = await load_strings()
     value = strings.get(key)
     if isinstance(value, list) and value:
         return value
     return default
 
 
-def get_random(key: str, default: list) -> str:
-    choices = get_list(key, default)
+async def get_random(key: str, default: list) -> str:
+    choices = await get_list(key, default)
     try:
         return random.choice(choices)
     except Exception:
@@ -0,0 +1,109 @@
+import asyncio
+import time
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _BurstState:
+    __slots__ = ('times', 'pending', 'task')
+
+    def __init__(self) -> None:
+        self.times: Deque[float] = deque()
+        self.pending: List[Any] = []
+        self.task: Optional[asyncio.Task] = None
+
+
+class BurstAggregator:
+    """Switches a stream of events into summary mode while its rate is high.
+
+    `record()` tracks events per key in a sliding `window`. Below `threshold`
+    events per window it returns False and the caller logs the event as
+    usual. Once the threshold is reached, events are buffered instead and
+    `on_summary(key, items)` is awaited once every `summary_interval`
+    seconds. Aggregation ends after an interval in which the rate has
+    dropped below the threshold again.
+    """
+
+    def __init__(self, on_summary: Callable[[Hashable, List[Any]], Awaitable[None]],
+                 threshold: int = 10, window: float = 10.0, summary_interval: float = 30.0) -> None:
+        self.on_summary = on_summary
+        self.threshold = threshold
+        self.window = window
+        self.summary_interval = summary_interval
+        self._states: Dict[Hashable, _BurstState] = {}
+
+    def aggregating(self, key: Hashable) -> bool:
+        state = self._states.get(key)
+        return state is not None and state.task is not None and not state.task.done()
+
+    def record(self, key: Hashable, item: Any) -> bool:
+        """Count an event. Returns True if it was buffered for a summary."""
+        now = time.monotonic()
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _BurstState()
+
+        times = state.times
+        times.append(now)
+        while times and times[0] <= now - self.window:
+            times.popleft()
+
+        if self.aggregating(key):
+            state.pending.append(item)
+            return True
+
+        if len(times) < self.threshold:
+            if not times:
+                del self._states[key]
+            return False
+
+        state.pending.append(item)
+        state.task = asyncio.get_running_loop().create_task(self._summarize(key, state))
+        return True
+
+    async def _summarize(self, key: Hashable, state: _BurstState) -> None:
+        while True:
+            await asyncio.sleep(self.summary_interval)
+
+            items, state.pending = state.pending, []
+            if items:
+                try:
+                    await self.on_summary(key, items)
+                except Exception:
+                    logger.exception(f"Failed to send burst summary for {key}")
+
+            now = time.monotonic()
+            while state.times and state.times[0] <= now - self.window:
+                state.times.popleft()
+            if len(state.times) < self.threshold:
+                break
+
+        # From here on new events are logged individually again (or start a new burst).
+        # Anything buffered before that, including during the sends below, is flushed here.
+        state.task = None
+        while state.pending:
+            items, state.pending = state.pending, []
+            try:
+                await self.on_summary(key, items)
+            except Exception:
+                logger.exception(f"Failed to send burst summary for {key}")
+
+        if self._states.get(key) is state and state.task is None and not state.times:
+            del self._states[key]
+
+    async def close(self) -> None:
+        """Stop aggregating and send whatever is still buffered."""
+        for key, state in list(self._states.items()):
+            if state.task is not None and not state.task.done():
+                state.task.cancel()
+                try:
+                    await state.task
+                except asyncio.CancelledError:
+                    pass
+            if state.pending:
+                items, state.pending = state.pending, []
+                await self.on_summary(key, items)
+        self._states.clear()
@@ -0,0 +1,193 @@
+import asyncio
+import time
+import logging
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
+
+import discord
+
+if TYPE_CHECKING:
+    from .webhooks import WebhookSink
+
+logger = logging.getLogger(__name__)
+
+# Discord limits for a single message
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+
+
+class _ChannelBuffer:
+    """Pending embeds and cached lookups for one log channel and route."""
+
+    __slots__ = ('channel_id', 'embeds', 'full', 'task', 'channel', 'checked_at', 'webhook')
+
+    def __init__(self, channel_id: int, webhook: bool) -> None:
+        self.channel_id = channel_id
+        self.embeds: Deque[discord.Embed] = deque()
+        self.full = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.channel: Optional[discord.abc.Messageable] = None
+        self.checked_at = 0.0
+        self.webhook = webhook
+
+
+class LogQueue:
+    """Batches log embeds per channel.
+
+    Embeds submitted for a channel are sent together, up to 10 per message,
+    once `flush_delay` seconds have passed since the first one was queued or
+    as soon as a full batch is waiting. Each channel buffers at most
+    `max_pending` embeds; beyond that the oldest are dropped and counted.
+    The channel and its permission check are cached for `lookup_ttl` seconds.
+    Channels submitted with `webhook=True` are delivered through the webhook
+    sink when one is configured, falling back to the bot otherwise. At most
+    `max_concurrency` channels are sent to at once.
+    """
+
+    def __init__(self, bot: discord.Client, webhooks: Optional['WebhookSink'] = None,
+                 flush_delay: float = 2.0, max_pending: int = 500, lookup_ttl: float = 60.0,
+                 max_concurrency: int = 8) -> None:
+        self.bot = bot
+        self.webhooks = webhooks
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.flush_delay = flush_delay
+        self.max_pending = max_pending
+        self.lookup_ttl = lookup_ttl
+        self._closing = False
+        # (channel_id, webhook) -> buffer, so log types sharing a channel keep their own route
+        self._buffers: Dict[Tuple[int, bool], _ChannelBuffer] = {}
+
+        self.sent_messages = 0
+        self.sent_embeds = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'sent_messages': self.sent_messages,
+            'sent_embeds': self.sent_embeds,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'pending': sum(len(buffer.embeds) for buffer in self._buffers.values()),
+        }
+
+    def submit_log(self, guild_id: int, log_type: str, embed: discord.Embed) -> bool:
+        """Queue an embed for a guild's `log_channel_<log_type>`.
+
+        Returns False if the guild has no channel set for that log type.
+        """
+        settings = self.bot.settings.get_all_server_settings(guild_id)
+        channel_id = settings.get(f"log_channel_{log_type}")
+        if not channel_id:
+            return False
+
+        # Written as a list by the logwebhooks command; anything else means webhooks are off
+        webhooks = settings.get('log_webhooks')
+        webhook = isinstance(webhooks, (list, tuple)) and log_type in webhooks
+        self.submit(int(channel_id), embed, webhook=webhook)
+        return True
+
+    def submit(self, channel_id: int, embed: discord.Embed, *, webhook: bool = False) -> None:
+        """Queue an embed for a channel. Never blocks."""
+        buffer = self._buffers.get((channel_id, webhook))
+        if buffer is None:
+            buffer = self._buffers[(channel_id, webhook)] = _ChannelBuffer(channel_id, webhook)
+
+        if len(buffer.embeds) >= self.max_pending:
+            buffer.embeds.popleft()
+            self.dropped += 1
+        buffer.embeds.append(embed)
+
+        if buffer.task is None or buffer.task.done():
+            buffer.task = asyncio.get_running_loop().create_task(self._drain(buffer))
+        elif len(buffer.embeds) >= MAX_EMBEDS:
+            buffer.full.set()
+
+    async def close(self) -> None:
+        """Send everything still queued, skipping the flush delay."""
+        # Drains skip their delay from here on; cancelling them could drop a batch mid-send
+        self._closing = True
+        tasks = []
+        for buffer in list(self._buffers.values()):
+            buffer.full.set()
+            if buffer.task is not None and not buffer.task.done():
+                tasks.append(buffer.task)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        for buffer in list(self._buffers.values()):
+            while buffer.embeds:
+                await self._send(buffer, self._take_batch(buffer))
+
+    async def _drain(self, buffer: _ChannelBuffer) -> None:
+        """Send a channel's embeds in batches until its buffer is empty."""
+        while buffer.embeds:
+            if len(buffer.embeds) < MAX_EMBEDS and not self._closing:
+                buffer.full.clear()
+                try:
+                    await asyncio.wait_for(buffer.full.wait(), timeout=self.flush_delay)
+                except asyncio.TimeoutError:
+                    pass
+
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            async with self._semaphore:
+                await self._send(buffer, self._take_batch(buffer))
+
+    @staticmethod
+    def _take_batch(buffer: _ChannelBuffer) -> List[discord.Embed]:
+        """Pop as many embeds as fit in one message."""
+        batch = []
+        chars = 0
+        while buffer.embeds and len(batch) < MAX_EMBEDS:
+            size = len(buffer.embeds[0])
+            if batch and chars + size > MAX_EMBED_CHARS:
+                break
+            batch.append(buffer.embeds.popleft())
+            chars += size
+        return batch
+
+    def _resolve(self, buffer: _ChannelBuffer) -> Optional[discord.abc.Messageable]:
+        """Return the channel if it exists and we may post embeds in it, using the cache."""
+        now = time.monotonic()
+        if now - buffer.checked_at < self.lookup_ttl:
+            return buffer.channel
+
+        buffer.checked_at = now
+        buffer.channel = None
+
+        channel = self.bot.get_channel(buffer.channel_id)
+        if not channel:
+            return None
+
+        permissions = channel.permissions_for(channel.guild.me)
+        if not permissions.send_messages or not permissions.embed_links:
+            return None
+
+        buffer.channel = channel
+        return channel
+
+    async def _send(self, buffer: _ChannelBuffer, batch: List[discord.Embed]) -> None:
+        channel = self._resolve(buffer)
+        if channel is None:
+            self.failed += len(batch)
+            return
+
+        if buffer.webhook and self.webhooks is not None:
+            if await self.webhooks.send(channel, batch):
+                self.sent_messages += 1
+                self.sent_embeds += len(batch)
+                return
+
+        try:
+            await channel.send(embeds=batch)
+        except (discord.Forbidden, discord.NotFound):
+            buffer.checked_at = 0.0
+            self.failed += len(batch)
+        except Exception:
+            logger.exception(f"Failed to send logs to channel {buffer.channel_id}")
+            self.failed += len(batch)
+        else:
+            self.sent_messages += 1
+            self.sent_embeds += len(batch)
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+import discord
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_NAME = 'Cro Logs'
+DISCORD_API = 'https://discord.com/api/v10'
+
+
+class WebhookSink:
+    """Delivers log embeds through one webhook per log channel.
+
+    Webhook executions are rate limited separately from the bot's own
+    `channel.send` calls, so heavy audit traffic does not delay command
+    replies. The webhook for a channel is reused if the bot already created
+    one there, otherwise it is created on first use (this needs Manage
+    Webhooks). Requests go through the bot's shared HTTP session.
+    """
+
+    def __init__(self, bot: discord.Client, session: aiohttp.ClientSession,
+                 api_base: str = DISCORD_API, max_retries: int = 3) -> None:
+        self.bot = bot
+        self.session = session
+        self.api_base = api_base.rstrip('/')
+        self.max_retries = max_retries
+        # channel_id -> (webhook_id, token)
+        self._webhooks: Dict[int, Tuple[int, str]] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+        self.sent = 0
+        self.failed = 0
+        self.rate_limited = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'sent': self.sent,
+            'failed': self.failed,
+            'rate_limited': self.rate_limited,
+            'webhooks': len(self._webhooks),
+        }
+
+    async def _webhook_for(self, channel: discord.TextChannel) -> Optional[Tuple[int, str]]:
+        """Return (id, token) of the log webhook for a channel, creating it if needed."""
+        cached = self._webhooks.get(channel.id)
+        if cached is not None:
+            return cached
+
+        lock = self._locks.setdefault(channel.id, asyncio.Lock())
+        async with lock:
+            cached = self._webhooks.get(channel.id)
+            if cached is not None:
+                return cached
+
+            if not channel.permissions_for(channel.guild.me).manage_webhooks:
+                return None
+
+            try:
+                webhooks = await channel.webhooks()
+                webhook = discord.utils.find(
+                    lambda w: w.token and w.user and w.user.id == self.bot.user.id,
+                    webhooks
+                )
+                if webhook is None:
+                    webhook = await channel.create_webhook(name=WEBHOOK_NAME, reason="Log delivery")
+            except discord.HTTPException as e:
+                logger.warning(f"Could not set up a log webhook in channel {channel.id}: {e}")
+                return None
+
+            cached = self._webhooks[channel.id] = (webhook.id, webhook.token)
+            return cached
+
+    def _payload(self, embeds: List[discord.Embed]) -> dict:
+        payload = {
+            'embeds': [embed.to_dict() for embed in embeds],
+            'allowed_mentions': {'parse': []},
+        }
+        if self.bot.user is not None:
+            payload['username'] = self.bot.user.name
+            payload['avatar_url'] = self.bot.user.display_avatar.url
+        return payload
+
+    async def send(self, channel: discord.TextChannel, embeds: List[discord.Embed]) -> bool:
+        """Send up to 10 embeds in one webhook call. Returns False if the caller should fall back."""
+        payload = self._payload(embeds)
+
+        for _ in range(self.max_retries):
+            webhook = await self._webhook_for(channel)
+            if webhook is None:
+                return False
+
+            url = f"{self.api_base}/webhooks/{webhook[0]}/{webhook[1]}"
+            try:
+                async with self.session.post(url, json=payload) as response:
+                    if response.status in (200, 204):
+                        self.sent += 1
+                        return True
+
+                    if response.status == 429:
+                        self.rate_limited += 1
+                        data = await response.json(content_type=None)
+                        await asyncio.sleep(float(data.get('retry_after', 1.0)))
+                        continue
+
+                    if response.status in (401, 404):
+                        # Webhook was deleted; create a new one on the next attempt
+                        self._webhooks.pop(channel.id, None)
+                        continue
+
+                    logger.warning(f"Webhook log delivery to {channel.id} failed with HTTP {response.status}")
+                    break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Webhook log delivery to {channel.id} failed: {e}")
+                break
+
+        self.failed += 1
+        return False
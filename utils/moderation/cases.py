@@ -0,0 +1,290 @@
+import json
+import os
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.helpers.database import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    case_id TEXT NOT NULL,
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    mod_id INTEGER,
+    action TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (guild_id, case_id)
+);
+CREATE INDEX IF NOT EXISTS idx_cases_guild_user ON cases (guild_id, user_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_cases_guild_user_action ON cases (guild_id, user_id, action, timestamp);
+CREATE INDEX IF NOT EXISTS idx_cases_guild_action ON cases (guild_id, action, timestamp);
+CREATE INDEX IF NOT EXISTS idx_cases_timestamp ON cases (timestamp);
+
+CREATE TABLE IF NOT EXISTS users (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    username TEXT,
+    PRIMARY KEY (guild_id, user_id)
+);
+
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class CaseStore(SQLiteStore):
+    """Indexed moderation case store backed by SQLite.
+
+    Cases are keyed by (guild, case ID), with secondary indexes on
+    (guild, user), (guild, user, action), (guild, action) and timestamp, so
+    appends and lookups do not depend on the size of the moderation history.
+    All queries run on a single worker thread to keep disk access off the
+    event loop.
+    """
+
+    def __init__(self, path: str = 'data/mod_cases.db') -> None:
+        super().__init__(path, _SCHEMA, 'case-store')
+
+    def _migrate(self) -> None:
+        """Rekey databases created when case IDs were unique across all guilds."""
+        primary_key = [row[1] for row in self._conn.execute('PRAGMA table_info(cases)') if row[5]]
+        if primary_key != ['case_id']:
+            return
+
+        with self._conn:
+            self._conn.execute('ALTER TABLE cases RENAME TO cases_old')
+            # Indexes moved with the renamed table; drop them so the schema can recreate them
+            for (name,) in self._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'cases_old' AND sql IS NOT NULL"
+            ).fetchall():
+                self._conn.execute(f'DROP INDEX {name}')
+        self._conn.executescript(_SCHEMA)
+        with self._conn:
+            self._conn.execute(
+                'INSERT INTO cases (case_id, guild_id, user_id, mod_id, action, timestamp, data) '
+                'SELECT case_id, guild_id, user_id, mod_id, action, timestamp, data FROM cases_old'
+            )
+            self._conn.execute('DROP TABLE cases_old')
+
+    @staticmethod
+    def _row_values(guild_id: int, case: Dict[str, Any]) -> Tuple:
+        return (
+            case['case_id'], int(guild_id), int(case['user_id']), case.get('mod_id'),
+            case['action'], case['timestamp'], json.dumps(case)
+        )
+
+    #################################
+    ## Writes
+    #################################
+    def _add_case(self, guild_id: int, case: Dict[str, Any], username: Optional[str]) -> None:
+        with self._conn:
+            self._conn.execute(
+                'INSERT INTO cases (case_id, guild_id, user_id, mod_id, action, timestamp, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                self._row_values(guild_id, case)
+            )
+            if username is not None:
+                self._conn.execute(
+                    'INSERT INTO users (guild_id, user_id, username) VALUES (?, ?, ?) '
+                    'ON CONFLICT(guild_id, user_id) DO UPDATE SET username = excluded.username',
+                    (int(guild_id), int(case['user_id']), username)
+                )
+
+    async def add_case(self, guild_id: int, case: Dict[str, Any], username: Optional[str] = None) -> None:
+        """Append a case. `case` must contain case_id, user_id, action and timestamp.
+
+        Raises:
+            sqlite3.IntegrityError: The guild already has a case with this ID
+        """
+        await self._run(self._add_case, guild_id, case, username)
+
+    def _add_cases(self, guild_id: int, cases: List[Dict[str, Any]],
+                   usernames: Dict[int, str]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                'INSERT INTO cases (case_id, guild_id, user_id, mod_id, action, timestamp, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (self._row_values(guild_id, case) for case in cases)
+            )
+            self._conn.executemany(
+                'INSERT INTO users (guild_id, user_id, username) VALUES (?, ?, ?) '
+                'ON CONFLICT(guild_id, user_id) DO UPDATE SET username = excluded.username',
+                ((int(guild_id), int(user_id), name) for user_id, name in usernames.items())
+            )
+
+    async def add_cases(self, guild_id: int, cases: List[Dict[str, Any]],
+                        usernames: Optional[Dict[int, str]] = None) -> None:
+        """Append many cases in a single transaction."""
+        await self._run(self._add_cases, guild_id, cases, usernames or {})
+
+    def _update_case(self, guild_id: int, case_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._conn:
+            row = self._conn.execute(
+                'SELECT data FROM cases WHERE case_id = ? AND guild_id = ?', (case_id, int(guild_id))
+            ).fetchone()
+            if not row:
+                return None
+
+            case = json.loads(row[0])
+            case.update(changes)
+            self._conn.execute(
+                'UPDATE cases SET data = ? WHERE guild_id = ? AND case_id = ?',
+                (json.dumps(case), int(guild_id), case_id)
+            )
+            return case
+
+    async def update_case(self, guild_id: int, case_id: str, **changes: Any) -> Optional[Dict[str, Any]]:
+        """Update fields of a case and return it, or None if it does not exist."""
+        return await self._run(self._update_case, guild_id, case_id, changes)
+
+    #################################
+    ## Reads
+    #################################
+    def _get_case(self, guild_id: int, case_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            'SELECT data FROM cases WHERE case_id = ? AND guild_id = ?', (case_id, int(guild_id))
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def get_case(self, guild_id: int, case_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a single case by ID."""
+        return await self._run(self._get_case, guild_id, case_id)
+
+    def _user_cases(self, guild_id: int, user_id: int, limit: int,
+                    action: Optional[str]) -> Tuple[int, List[Dict[str, Any]]]:
+        where = 'guild_id = ? AND user_id = ?'
+        params: Tuple = (int(guild_id), int(user_id))
+        if action is not None:
+            where += ' AND action = ?'
+            params += (action,)
+
+        total = self._conn.execute(f'SELECT COUNT(*) FROM cases WHERE {where}', params).fetchone()[0]
+        rows = self._conn.execute(
+            f'SELECT data FROM cases WHERE {where} ORDER BY timestamp DESC, rowid DESC LIMIT ?',
+            params + (limit,)
+        ).fetchall()
+        return total, [json.loads(row[0]) for row in rows]
+
+    async def user_cases(self, guild_id: int, user_id: int, limit: int = 10,
+                         action: Optional[str] = None) -> Tuple[int, List[Dict[str, Any]]]:
+        """Return (total, most recent `limit` cases) for a user, newest first.
+
+        When `action` is given only cases of that type are counted and returned.
+        """
+        return await self._run(self._user_cases, guild_id, user_id, limit, action)
+
+    def _action_cases(self, guild_id: int, action: str, limit: int,
+                      offset: int) -> Tuple[int, List[Dict[str, Any]]]:
+        total = self._conn.execute(
+            'SELECT COUNT(*) FROM cases WHERE guild_id = ? AND action = ?', (int(guild_id), action)
+        ).fetchone()[0]
+        rows = self._conn.execute(
+            'SELECT data FROM cases WHERE guild_id = ? AND action = ? '
+            'ORDER BY timestamp DESC, rowid DESC LIMIT ? OFFSET ?',
+            (int(guild_id), action, limit, offset)
+        ).fetchall()
+        return total, [json.loads(row[0]) for row in rows]
+
+    async def action_cases(self, guild_id: int, action: str, limit: int = 10,
+                           offset: int = 0) -> Tuple[int, List[Dict[str, Any]]]:
+        """Return (total, one page of cases) of a given action in a guild, newest first."""
+        return await self._run(self._action_cases, guild_id, action, limit, offset)
+
+    def _usernames(self, guild_id: int, user_ids: List[int]) -> Dict[int, str]:
+        placeholders = ', '.join('?' * len(user_ids))
+        rows = self._conn.execute(
+            f'SELECT user_id, username FROM users WHERE guild_id = ? AND user_id IN ({placeholders}) '
+            'AND username IS NOT NULL',
+            (int(guild_id), *map(int, user_ids))
+        ).fetchall()
+        return dict(rows)
+
+    async def usernames(self, guild_id: int, user_ids: Iterable[int]) -> Dict[int, str]:
+        """Return the names users had when their cases were recorded, for users that have one."""
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return {}
+        return await self._run(self._usernames, guild_id, user_ids)
+
+    #################################
+    ## Deletes
+    #################################
+    def _delete_case(self, guild_id: int, case_id: str, action: Optional[str]) -> Optional[Dict[str, Any]]:
+        with self._conn:
+            case = self._get_case(guild_id, case_id)
+            if not case or (action is not None and case.get('action') != action):
+                return None
+            self._conn.execute('DELETE FROM cases WHERE guild_id = ? AND case_id = ?', (int(guild_id), case_id))
+            return case
+
+    async def delete_case(self, guild_id: int, case_id: str, action: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Delete a case and return it. If `action` is given, only a case of that type is deleted."""
+        return await self._run(self._delete_case, guild_id, case_id, action)
+
+    def _delete_user_cases(self, guild_id: int, user_id: int, action: str) -> int:
+        with self._conn:
+            cursor = self._conn.execute(
+                'DELETE FROM cases WHERE guild_id = ? AND user_id = ? AND action = ?',
+                (int(guild_id), int(user_id), action)
+            )
+            return cursor.rowcount
+
+    async def delete_user_cases(self, guild_id: int, user_id: int, action: str) -> int:
+        """Delete every case of `action` for a user. Returns the number removed."""
+        return await self._run(self._delete_user_cases, guild_id, user_id, action)
+
+    #################################
+    ## Legacy import
+    #################################
+    def _import_legacy(self, legacy_file: str) -> int:
+        done = self._conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone()
+        if done or not os.path.exists(legacy_file):
+            return 0
+
+        try:
+            with open(legacy_file, 'r') as f:
+                records = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"Failed to import {legacy_file}: {e}")
+            return 0
+
+        imported = 0
+        skipped = 0
+        with self._conn:
+            for guild_id, guild_records in records.items():
+                for case_id, case in guild_records.get('cases', {}).items():
+                    case.setdefault('case_id', case_id)
+                    if 'user_id' not in case or 'action' not in case or 'timestamp' not in case:
+                        logger.warning(f"Skipping malformed legacy case {case_id}")
+                        continue
+                    cursor = self._conn.execute(
+                        'INSERT OR IGNORE INTO cases (case_id, guild_id, user_id, mod_id, action, timestamp, data) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        self._row_values(int(guild_id), case)
+                    )
+                    if cursor.rowcount:
+                        imported += 1
+                    else:
+                        skipped += 1
+                        logger.warning(f"Skipping legacy case {case_id} in guild {guild_id}: already stored")
+
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO users (guild_id, user_id, username) VALUES (?, ?, ?)',
+                    (
+                        (int(guild_id), int(user_id), data.get('username'))
+                        for user_id, data in guild_records.get('users', {}).items()
+                    )
+                )
+
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('legacy_imported', ?)", (legacy_file,)
+            )
+
+        logger.info(f"Imported {imported} moderation cases from {legacy_file} ({skipped} duplicates skipped)")
+        return imported
+
+    async def import_legacy(self, legacy_file: str = 'data/mod_logs.json') -> int:
+        """Import cases from the old mod_logs.json once. Returns the number imported."""
+        return await self._run(self._import_legacy, legacy_file)
@@ -0,0 +1,246 @@
+import asyncio
+import heapq
+import json
+import sqlite3
+import time
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import discord
+
+from utils.helpers.database import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS timers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event TEXT NOT NULL,
+    expires REAL NOT NULL,
+    created REAL NOT NULL,
+    owner_id INTEGER,
+    data TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    retry_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_timers_expires ON timers (expires);
+"""
+
+_OWNER_INDEX = 'CREATE INDEX IF NOT EXISTS idx_timers_owner ON timers (event, owner_id, expires)'
+
+# Upper bound on a single sleep, so wall clock jumps are noticed eventually
+MAX_SLEEP = 3600.0
+
+# Timers not completed by their handler fire again after RETRY_DELAY seconds, doubling each time
+RETRY_DELAY = 60.0
+MAX_ATTEMPTS = 8
+
+
+class Timer:
+    """A scheduled event. `data` holds whatever the creator stored with it."""
+
+    __slots__ = ('id', 'event', 'expires', 'created', 'owner_id', 'data')
+
+    def __init__(self, id: int, event: str, expires: float, created: float,
+                 owner_id: Optional[int], data: Dict[str, Any]) -> None:
+        self.id = id
+        self.event = event
+        self.expires = expires
+        self.created = created
+        self.owner_id = owner_id
+        self.data = data
+
+    @classmethod
+    def from_row(cls, row: Tuple) -> 'Timer':
+        return cls(row[0], row[1], row[2], row[3], row[4], json.loads(row[5]))
+
+    def __repr__(self) -> str:
+        return f"<Timer id={self.id} event={self.event!r} expires={self.expires}>"
+
+
+class TimerScheduler(SQLiteStore):
+    """Persistent timers driven by a single dispatcher task.
+
+    Timers live in SQLite; only their (deadline, id) pairs are kept in memory,
+    in a min-heap. The dispatcher sleeps until the earliest deadline and then
+    fires `on_<event>_timer_complete` with the `Timer`. Timers that expired
+    while the bot was offline fire once the bot is ready.
+
+    Handlers call `complete()` once they are done with a timer. Until then it
+    stays on disk and fires again with a growing backoff, so a failed handler
+    or a restart mid-dispatch does not lose it. After `MAX_ATTEMPTS` firings
+    it is removed regardless.
+    """
+
+    def __init__(self, bot: discord.Client, path: str = 'data/timers.db') -> None:
+        super().__init__(path, _SCHEMA, 'timers')
+        self.bot = bot
+
+        self._heap: List[Tuple[float, int]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _migrate(self) -> None:
+        """Bring databases created by older versions up to date."""
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(timers)')}
+        if 'owner_id' not in columns:
+            self._conn.execute('ALTER TABLE timers ADD COLUMN owner_id INTEGER')
+        if 'attempts' not in columns:
+            self._conn.execute('ALTER TABLE timers ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0')
+            self._conn.execute('ALTER TABLE timers ADD COLUMN retry_at REAL')
+        # Tempbans used to be created without an owner; their user is in the payload
+        self._conn.execute(
+            "UPDATE timers SET owner_id = json_extract(data, '$.user_id') "
+            "WHERE event = 'tempban' AND owner_id IS NULL"
+        )
+        self._conn.execute(_OWNER_INDEX)
+
+    #################################
+    ## Lifecycle
+    #################################
+    async def start(self) -> None:
+        """Load pending deadlines and start the dispatcher."""
+        if self._task is not None and not self._task.done():
+            return
+
+        self._heap = await self._run(self._load_deadlines)
+        heapq.heapify(self._heap)
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._dispatch_loop())
+        logger.info(f"Timer scheduler started with {len(self._heap)} pending timers")
+
+    async def close(self) -> None:
+        """Stop the dispatcher and close the database."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await super().close()
+
+    def _load_deadlines(self) -> List[Tuple[float, int]]:
+        return [tuple(row) for row in self._conn.execute('SELECT COALESCE(retry_at, expires), id FROM timers')]
+
+    #################################
+    ## Dispatcher
+    #################################
+    async def _dispatch_loop(self) -> None:
+        await self.bot.wait_until_ready()
+
+        while True:
+            if not self._heap:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            expires, timer_id = self._heap[0]
+            delay = expires - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=min(delay, MAX_SLEEP))
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            heapq.heappop(self._heap)
+            try:
+                timer, retry_at = await self._run(self._claim, timer_id, time.time())
+            except sqlite3.Error:
+                logger.exception(f"Failed to load timer {timer_id}")
+                continue
+
+            # Cancelled and completed timers stay in the heap until they come up
+            if timer is None:
+                continue
+            if retry_at is not None:
+                heapq.heappush(self._heap, (retry_at, timer_id))
+            self.bot.dispatch(f"{timer.event}_timer_complete", timer)
+
+    def _claim(self, timer_id: int, now: float) -> Tuple[Optional[Timer], Optional[float]]:
+        """Load a due timer and push its retry back, or remove it on its last attempt."""
+        with self._conn:
+            row = self._conn.execute(
+                'SELECT id, event, expires, created, owner_id, data, attempts FROM timers WHERE id = ?',
+                (timer_id,)
+            ).fetchone()
+            if not row:
+                return None, None
+
+            attempts = row[6] + 1
+            if attempts >= MAX_ATTEMPTS:
+                logger.warning(f"Timer {timer_id} ({row[1]}) was never completed; giving up after {attempts} attempts")
+                self._conn.execute('DELETE FROM timers WHERE id = ?', (timer_id,))
+                retry_at = None
+            else:
+                retry_at = now + RETRY_DELAY * 2 ** (attempts - 1)
+                self._conn.execute(
+                    'UPDATE timers SET attempts = ?, retry_at = ? WHERE id = ?', (attempts, retry_at, timer_id)
+                )
+        return Timer.from_row(row), retry_at
+
+    #################################
+    ## Public API
+    #################################
+    def _insert(self, event: str, expires: float, created: float,
+                owner_id: Optional[int], data: Dict[str, Any]) -> int:
+        with self._conn:
+            cursor = self._conn.execute(
+                'INSERT INTO timers (event, expires, created, owner_id, data) VALUES (?, ?, ?, ?, ?)',
+                (event, expires, created, owner_id, json.dumps(data))
+            )
+            return cursor.lastrowid
+
+    async def create(self, event: str, expires: Union[datetime, float], *,
+                     owner_id: Optional[int] = None, **data: Any) -> Timer:
+        """Schedule `on_<event>_timer_complete` to fire at `expires`.
+
+        Args:
+            event: Event name, e.g. 'tempban'
+            expires: Aware datetime or UNIX timestamp
+            owner_id: Optional owner (e.g. a user ID), indexed for `owner_timers`
+            **data: JSON-serializable payload stored with the timer
+        """
+        if isinstance(expires, datetime):
+            expires = expires.timestamp()
+        created = time.time()
+
+        timer_id = await self._run(self._insert, event, expires, created, owner_id, data)
+        timer = Timer(timer_id, event, expires, created, owner_id, data)
+
+        was_next = not self._heap or expires < self._heap[0][0]
+        heapq.heappush(self._heap, (expires, timer_id))
+        if was_next and self._wakeup is not None:
+            self._wakeup.set()
+        return timer
+
+    def _delete(self, timer_id: int) -> bool:
+        with self._conn:
+            return self._conn.execute('DELETE FROM timers WHERE id = ?', (timer_id,)).rowcount > 0
+
+    async def cancel(self, timer_id: int) -> bool:
+        """Cancel a pending timer. Returns False if it does not exist."""
+        return await self._run(self._delete, timer_id)
+
+    async def complete(self, timer: Timer) -> None:
+        """Mark a fired timer as handled so it is not retried."""
+        await self._run(self._delete, timer.id)
+
+    def _owner_timers(self, event: str, owner_id: int, limit: int) -> Tuple[int, List[Timer]]:
+        total = self._conn.execute(
+            'SELECT COUNT(*) FROM timers WHERE event = ? AND owner_id = ?', (event, owner_id)
+        ).fetchone()[0]
+        rows = self._conn.execute(
+            'SELECT id, event, expires, created, owner_id, data FROM timers '
+            'WHERE event = ? AND owner_id = ? ORDER BY expires LIMIT ?',
+            (event, owner_id, limit)
+        ).fetchall()
+        return total, [Timer.from_row(row) for row in rows]
+
+    async def owner_timers(self, event: str, owner_id: int, limit: int = 25) -> Tuple[int, List[Timer]]:
+        """Return (total, next `limit` timers) of one event type for an owner, soonest first."""
+        return await self._run(self._owner_timers, event, owner_id, limit)
@@ -1,72 +1,245 @@
+import asyncio
 import json
 import os
+import sqlite3
 import logging
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, Any, List, Mapping, Optional, Set
 from .defaults import DEFAULT_SETTINGS
+from .storage import SettingsStorage, SQLiteSettingsStorage
 
 logger = logging.getLogger(__name__)
 
+_MUTABLE_TYPES = (dict, list, set)
+
+
 class ServerSettings:
-    """Handles per-server settings management with JSON persistence."""
-    
-    def __init__(self) -> None:
-        """Initialize settings handler and ensure data directory exists."""
-        self.settings_file = 'data/settings.json'
-        self.settings: Dict[str, Any] = self._load_settings()
+    """Handles per-server settings management with pluggable persistence.
+
+    Guild settings are loaded from the storage backend on first access and
+    kept in memory. Mutations are applied in memory immediately. Once
+    `start()` has been called, persistence is write-behind: changed guilds are
+    marked dirty and a background flusher writes them in batches every
+    `flush_interval` seconds, or sooner once `flush_threshold` writes are
+    pending. `close()` performs the final flush on shutdown.
+    """
+
+    def __init__(self, storage: Optional[SettingsStorage] = None,
+                 flush_interval: float = 5.0, flush_threshold: int = 50) -> None:
+        """Initialize settings handler and ensure data directory exists.
+
+        Args:
+            storage: Persistence backend (defaults to SQLite at data/settings.db)
+            flush_interval: Seconds between background flushes
+            flush_threshold: Number of pending writes that triggers an early flush
+        """
         os.makedirs('data', exist_ok=True)
+        self.storage = storage or SQLiteSettingsStorage()
+        self.settings: Dict[str, Dict[str, Any]] = {}
+        self._views: Dict[str, Mapping[str, Any]] = {}
+        # Called with the guild ID after each change, so derived data can be updated in place
+        self._listeners: List[Callable[[int], None]] = []
 
-    def _load_settings(self) -> Dict[str, Any]:
-        """Load settings from file with error handling."""
-        try:
-            with open(self.settings_file, 'r') as f:
-                data = json.load(f)
-                logger.info(f"Loaded settings for {len(data)} guilds")
-                return data
-        except FileNotFoundError:
-            logger.info("Settings file not found, starting with empty settings")
-            return {}
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse settings.json: {e}")
-            return {}
-        except Exception as e:
-            logger.error(f"Unexpected error loading settings: {e}")
-            return {}
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._dirty: Set[str] = set()
+        self._pending_writes = 0
+        self._flush_event: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def _guild(self, guild_key: str) -> Dict[str, Any]:
+        """Return a guild's stored settings, loading them from storage if needed."""
+        guild_settings = self.settings.get(guild_key)
+        if guild_settings is None:
+            try:
+                guild_settings = self.storage.load_guild(guild_key) or {}
+            except Exception as e:
+                logger.error(f"Failed to load settings for guild {guild_key}: {e}")
+                guild_settings = {}
+            self.settings[guild_key] = guild_settings
+        return guild_settings
+
+    def _snapshot(self, guild_keys: Set[str]) -> Dict[str, Optional[str]]:
+        """Serialize the given guilds for the storage backend."""
+        return {
+            key: json.dumps(self.settings[key]) if self.settings.get(key) else None
+            for key in guild_keys
+        }
 
     def _save_settings(self) -> None:
-        """Save settings to file with error handling."""
+        """Save dirty settings synchronously."""
+        dirty = set(self._dirty)
+        self._dirty.clear()
+        self._pending_writes = 0
+        if not self._write_snapshot(self._snapshot(dirty)):
+            self._dirty |= dirty
+
+    def _write_snapshot(self, snapshot: Dict[str, Optional[str]]) -> bool:
+        """Hand a snapshot to the storage backend with error handling."""
         try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
-        except IOError as e:
+            self.storage.save_guilds(snapshot)
+            return True
+        except (IOError, sqlite3.Error) as e:
             logger.error(f"Failed to save settings: {e}")
         except Exception as e:
             logger.error(f"Unexpected error saving settings: {e}")
+        return False
+
+    #################################
+    ## Write-behind
+    #################################
+    @property
+    def running(self) -> bool:
+        """Whether the background flusher is active."""
+        return self._flush_task is not None and not self._flush_task.done()
+
+    def start(self) -> None:
+        """Start the background flusher. Must be called from a running event loop."""
+        if self.running:
+            return
+
+        self._flush_event = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        """Stop the background flusher and persist any pending changes."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+
+        await self.flush()
+        self.storage.close()
+
+    async def flush(self) -> None:
+        """Persist all dirty guilds now."""
+        if not self._dirty:
+            return
+
+        if self._flush_lock is None:
+            self._save_settings()
+            return
+
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+
+            dirty = set(self._dirty)
+            self._dirty.clear()
+            self._pending_writes = 0
+
+            # Serialize on the loop so the snapshot is consistent, write off it
+            snapshot = self._snapshot(dirty)
+            if not await asyncio.to_thread(self._write_snapshot, snapshot):
+                self._dirty |= dirty
+
+    async def _flush_loop(self) -> None:
+        """Flush dirty settings on an interval or when the threshold is hit."""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._flush_event.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Background settings flush failed")
+
+    def _mark_dirty(self, guild_key: str) -> None:
+        """Record a change to a guild and schedule it for persistence."""
+        self._views.pop(guild_key, None)
+        self._dirty.add(guild_key)
+        self._pending_writes += 1
+
+        if not self.running:
+            self._save_settings()
+            return
+
+        if self._pending_writes >= self.flush_threshold:
+            self._flush_event.set()
+
+    def _notify(self, guild_key: str) -> None:
+        """Tell listeners that a guild's settings changed."""
+        guild_id = int(guild_key)
+        for listener in list(self._listeners):
+            try:
+                listener(guild_id)
+            except Exception:
+                logger.exception(f"Settings listener failed for guild {guild_key}")
+
+    @staticmethod
+    def _is_noop(current: Any, value: Any) -> bool:
+        """Return True when writing `value` over `current` changes nothing.
+
+        The same mutable object is never a no-op, since callers commonly edit
+        a nested dict in place and then write it back.
+        """
+        if current is value:
+            return not isinstance(value, _MUTABLE_TYPES)
+        return type(current) is type(value) and current == value
+
+    #################################
+    ## Public API
+    #################################
+    def add_listener(self, listener: Callable[[int], None]) -> None:
+        """Call `listener(guild_id)` whenever a guild's settings change."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[int], None]) -> None:
+        """Stop calling a listener added with `add_listener`."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
 
     def get_server_setting(self, guild_id: int, setting: str) -> Optional[Any]:
         """Get a specific setting for a server"""
-        guild_settings = self.settings.get(str(guild_id), {})
+        guild_settings = self._guild(str(guild_id))
         return guild_settings.get(setting, DEFAULT_SETTINGS.get(setting))
 
-    def get_all_server_settings(self, guild_id: int) -> Dict[str, Any]:
-        """Get all settings for a server"""
-        guild_settings = self.settings.get(str(guild_id), {})
-        return {**DEFAULT_SETTINGS, **guild_settings}
+    def get_all_server_settings(self, guild_id: int) -> Mapping[str, Any]:
+        """Get all settings for a server as a read-only view.
+
+        The merged view is built once per guild and reused until that guild's
+        settings change. Copy it with `dict()` before editing top-level keys.
+        """
+        guild_key = str(guild_id)
+        view = self._views.get(guild_key)
+        if view is None:
+            view = MappingProxyType({**DEFAULT_SETTINGS, **self._guild(guild_key)})
+            self._views[guild_key] = view
+        return view
 
     def set_server_setting(self, guild_id: int, setting: str, value: Any) -> None:
         """Set a specific setting for a server"""
-        if str(guild_id) not in self.settings:
-            self.settings[str(guild_id)] = {}
-            
-        self.settings[str(guild_id)][setting] = value
-        self._save_settings()
+        guild_key = str(guild_id)
+        guild_settings = self._guild(guild_key)
+
+        if setting in guild_settings and self._is_noop(guild_settings[setting], value):
+            return
+
+        guild_settings[setting] = value
+        self._mark_dirty(guild_key)
+        self._notify(guild_key)
 
     def remove_server_setting(self, guild_id: int, setting: str) -> None:
         """Remove a specific setting for a server"""
-        if str(guild_id) in self.settings:
-            self.settings[str(guild_id)].pop(setting, None)
-            self._save_settings()
+        guild_key = str(guild_id)
+        guild_settings = self._guild(guild_key)
+        if setting in guild_settings:
+            del guild_settings[setting]
+            self._mark_dirty(guild_key)
+            self._notify(guild_key)
 
     def clear_server_settings(self, guild_id: int) -> None:
         """Clear all settings for a server"""
-        self.settings.pop(str(guild_id), None)
-        self._save_settings() 
\ No newline at end of file
+        guild_key = str(guild_id)
+        if self._guild(guild_key):
+            self.settings[guild_key] = {}
+            self._mark_dirty(guild_key)
+            self._notify(guild_key)
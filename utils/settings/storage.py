@@ -0,0 +1,168 @@
+import json
+import os
+import sqlite3
+import threading
+import logging
+from typing import Dict, Any, Optional
+
+from utils.helpers.files import replace_file
+
+logger = logging.getLogger(__name__)
+
+
+class SettingsStorage:
+    """Persistence backend for `ServerSettings`.
+
+    Guild settings are exchanged as serialized JSON strings so backends can be
+    called from a worker thread without touching live settings dicts.
+    """
+
+    def load_guild(self, guild_key: str) -> Optional[Dict[str, Any]]:
+        """Load one guild's settings, or None if it has none stored."""
+        raise NotImplementedError
+
+    def save_guilds(self, guilds: Dict[str, Optional[str]]) -> None:
+        """Persist serialized settings per guild. A value of None deletes the guild."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class JSONSettingsStorage(SettingsStorage):
+    """Single JSON file holding every guild. Each save rewrites the whole file."""
+
+    def __init__(self, path: str = 'data/settings.json') -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: Dict[str, str] = {
+            key: json.dumps(value) for key, value in self._load_file().items()
+        }
+
+    def _load_file(self) -> Dict[str, Any]:
+        """Load settings from file with error handling."""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+                logger.info(f"Loaded settings for {len(data)} guilds")
+                return data
+        except FileNotFoundError:
+            logger.info("Settings file not found, starting with empty settings")
+            return {}
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse {self.path}: {e}")
+            return {}
+        except Exception as e:
+            logger.error(f"Unexpected error loading settings: {e}")
+            return {}
+
+    def load_guild(self, guild_key: str) -> Optional[Dict[str, Any]]:
+        raw = self._data.get(guild_key)
+        return json.loads(raw) if raw is not None else None
+
+    def save_guilds(self, guilds: Dict[str, Optional[str]]) -> None:
+        with self._lock:
+            for guild_key, raw in guilds.items():
+                if raw is None:
+                    self._data.pop(guild_key, None)
+                else:
+                    self._data[guild_key] = raw
+
+            payload = '{' + ', '.join(
+                f'{json.dumps(key)}: {raw}' for key, raw in self._data.items()
+            ) + '}'
+
+            replace_file(self.path, payload)
+
+
+class SQLiteSettingsStorage(SettingsStorage):
+    """SQLite store with one row per guild.
+
+    Runs in WAL mode, and reads go through their own read-only connection
+    with its own lock, so a guild loaded on the event loop never waits for
+    the flusher's write to finish. A write only touches the rows of the
+    guilds that changed, and guilds are loaded on first access rather than
+    at startup.
+    """
+
+    def __init__(self, path: str = 'data/settings.db', legacy_file: Optional[str] = 'data/settings.json') -> None:
+        """Open (and create if needed) the settings database.
+
+        Args:
+            path: Location of the SQLite database
+            legacy_file: JSON settings file to import once into an empty database
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS guild_settings ('
+            'guild_id TEXT PRIMARY KEY, data TEXT NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)'
+        )
+        self._conn.commit()
+
+        if legacy_file:
+            self._import_legacy(legacy_file)
+
+        self._read_lock = threading.Lock()
+        self._reader = sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+
+    def _import_legacy(self, legacy_file: str) -> None:
+        """Import a legacy settings.json once, the first time the database is used."""
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT 1 FROM meta WHERE key = 'legacy_imported'"
+            ).fetchone()
+            if done or not os.path.exists(legacy_file):
+                return
+
+            try:
+                with open(legacy_file, 'r') as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                logger.error(f"Failed to import {legacy_file}: {e}")
+                return
+
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO guild_settings (guild_id, data) VALUES (?, ?)',
+                    ((key, json.dumps(value)) for key, value in data.items())
+                )
+                self._conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('legacy_imported', ?)",
+                    (legacy_file,)
+                )
+            logger.info(f"Imported settings for {len(data)} guilds from {legacy_file}")
+
+    def load_guild(self, guild_key: str) -> Optional[Dict[str, Any]]:
+        with self._read_lock:
+            row = self._reader.execute(
+                'SELECT data FROM guild_settings WHERE guild_id = ?', (guild_key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_guilds(self, guilds: Dict[str, Optional[str]]) -> None:
+        upserts = [(key, raw) for key, raw in guilds.items() if raw is not None]
+        deletes = [(key,) for key, raw in guilds.items() if raw is None]
+
+        with self._lock, self._conn:
+            if upserts:
+                self._conn.executemany(
+                    'INSERT INTO guild_settings (guild_id, data) VALUES (?, ?) '
+                    'ON CONFLICT(guild_id) DO UPDATE SET data = excluded.data',
+                    upserts
+                )
+            if deletes:
+                self._conn.executemany('DELETE FROM guild_settings WHERE guild_id = ?', deletes)
+
+    def close(self) -> None:
+        with self._read_lock:
+            self._reader.close()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,390 @@
+import asyncio
+import time
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import discord
+
+from utils.helpers.database import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS starboard_posts (
+    message_id INTEGER PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    author_id INTEGER,
+    star_message_id INTEGER NOT NULL,
+    stars INTEGER NOT NULL DEFAULT 0,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_starboard_posts_guild ON starboard_posts (guild_id);
+CREATE INDEX IF NOT EXISTS idx_starboard_posts_top ON starboard_posts (guild_id, stars DESC);
+"""
+
+# Running totals, adjusted by every post write so leaderboards and stats never aggregate posts.
+# Months are 'YYYY-MM' in UTC, taken from when the source message was sent.
+_AUTHORS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS starboard_authors (
+    guild_id INTEGER NOT NULL,
+    author_id INTEGER NOT NULL,
+    stars INTEGER NOT NULL DEFAULT 0,
+    posts INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (guild_id, author_id)
+);
+CREATE INDEX IF NOT EXISTS idx_starboard_authors_top ON starboard_authors (guild_id, stars DESC);
+"""
+
+_AUTHOR_MONTHS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS starboard_author_months (
+    guild_id INTEGER NOT NULL,
+    month TEXT NOT NULL,
+    author_id INTEGER NOT NULL,
+    stars INTEGER NOT NULL DEFAULT 0,
+    posts INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (guild_id, month, author_id)
+);
+CREATE INDEX IF NOT EXISTS idx_starboard_author_months_top ON starboard_author_months (guild_id, month, stars DESC);
+"""
+
+# One row per guild for all time (month = ALL_TIME) and one per month
+_GUILDS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS starboard_guilds (
+    guild_id INTEGER NOT NULL,
+    month TEXT NOT NULL,
+    stars INTEGER NOT NULL DEFAULT 0,
+    posts INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (guild_id, month)
+);
+"""
+
+ALL_TIME = 'all'
+
+# SQL equivalent of post_month(), used to backfill totals from existing posts
+_MONTH_SQL = "strftime('%Y-%m', ((message_id >> 22) + 1420070400000) / 1000, 'unixepoch')"
+
+# (table, schema, statements that backfill it from starboard_posts when it is first created)
+_TOTALS = (
+    ('starboard_authors', _AUTHORS_SCHEMA, (
+        'INSERT INTO starboard_authors (guild_id, author_id, stars, posts) '
+        'SELECT guild_id, author_id, SUM(stars), COUNT(*) FROM starboard_posts '
+        'WHERE author_id IS NOT NULL GROUP BY guild_id, author_id',
+    )),
+    ('starboard_author_months', _AUTHOR_MONTHS_SCHEMA, (
+        'INSERT INTO starboard_author_months (guild_id, month, author_id, stars, posts) '
+        f'SELECT guild_id, {_MONTH_SQL} AS month, author_id, SUM(stars), COUNT(*) FROM starboard_posts '
+        'WHERE author_id IS NOT NULL GROUP BY guild_id, month, author_id',
+    )),
+    ('starboard_guilds', _GUILDS_SCHEMA, (
+        'INSERT INTO starboard_guilds (guild_id, month, stars, posts) '
+        f"SELECT guild_id, '{ALL_TIME}', SUM(stars), COUNT(*) FROM starboard_posts GROUP BY guild_id",
+        'INSERT INTO starboard_guilds (guild_id, month, stars, posts) '
+        f'SELECT guild_id, {_MONTH_SQL} AS month, SUM(stars), COUNT(*) FROM starboard_posts '
+        'GROUP BY guild_id, month',
+    )),
+)
+
+_COLUMNS = 'message_id, channel_id, author_id, star_message_id, stars'
+
+
+def post_month(message_id: int) -> str:
+    """Return the 'YYYY-MM' month (UTC) a message was sent in."""
+    return discord.utils.snowflake_time(message_id).strftime('%Y-%m')
+
+
+def _month_bounds(month: str) -> Tuple[int, int]:
+    """Return the first and last possible message IDs sent in a 'YYYY-MM' month."""
+    start = datetime.strptime(month, '%Y-%m').replace(tzinfo=timezone.utc)
+    end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    return discord.utils.time_snowflake(start), discord.utils.time_snowflake(end) - 1
+
+
+class StarPost:
+    """A source message and the starboard message that mirrors it."""
+
+    __slots__ = ('message_id', 'channel_id', 'author_id', 'star_message_id', 'stars')
+
+    def __init__(self, message_id: int, channel_id: int, author_id: Optional[int],
+                 star_message_id: int, stars: int = 0) -> None:
+        self.message_id = message_id
+        self.channel_id = channel_id
+        self.author_id = author_id
+        self.star_message_id = star_message_id
+        self.stars = stars
+
+    @classmethod
+    def from_row(cls, row: Tuple) -> 'StarPost':
+        return cls(row[0], row[1], row[2], row[3], row[4])
+
+    def __repr__(self) -> str:
+        return f"<StarPost message_id={self.message_id} star_message_id={self.star_message_id} stars={self.stars}>"
+
+
+class _Deltas:
+    """Changes to the running totals, applied in the same transaction as the post writes."""
+
+    __slots__ = ('authors', 'months', 'guilds')
+
+    def __init__(self) -> None:
+        self.authors: List[Tuple] = []
+        self.months: List[Tuple] = []
+        self.guilds: List[Tuple] = []
+
+    def replace(self, guild_id: int, old: Optional[StarPost], new: Optional[StarPost]) -> None:
+        """Record the changes for replacing `old` with `new`; either may be None."""
+        if old is not None:
+            self._add(guild_id, old, -1)
+        if new is not None:
+            self._add(guild_id, new, 1)
+
+    def _add(self, guild_id: int, post: StarPost, sign: int) -> None:
+        stars = sign * post.stars
+        month = post_month(post.message_id)
+        self.guilds.append((guild_id, ALL_TIME, stars, sign))
+        self.guilds.append((guild_id, month, stars, sign))
+        if post.author_id is not None:
+            self.authors.append((guild_id, post.author_id, stars, sign))
+            self.months.append((guild_id, month, post.author_id, stars, sign))
+
+
+class StarboardStore(SQLiteStore):
+    """Persistent mapping of starred messages to their starboard posts.
+
+    Rows are indexed by guild and a guild's posts are loaded into memory the
+    first time that guild is looked up, so lookups after that are dict hits.
+    Writes go through to SQLite on a single worker thread. Each write also
+    adjusts running totals per guild and per author, both all-time and per
+    month, and posts and authors are indexed by (guild, stars), so
+    leaderboards and stats read a handful of rows directly.
+    """
+
+    def __init__(self, path: str = 'data/starboard.db') -> None:
+        super().__init__(path, _SCHEMA, 'starboard')
+
+        # guild_id -> message_id -> post, for guilds loaded so far
+        self._guilds: Dict[int, Dict[int, StarPost]] = {}
+        self._loading: Dict[int, asyncio.Future] = {}
+
+    def _migrate(self) -> None:
+        """Create the totals tables, backfilling new ones from posts saved by older versions."""
+        for table, schema, backfill in _TOTALS:
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()
+            self._conn.executescript(schema)
+            if not exists:
+                for statement in backfill:
+                    self._conn.execute(statement)
+
+    #################################
+    ## Reads
+    #################################
+    def _load_guild(self, guild_id: int) -> Dict[int, StarPost]:
+        rows = self._conn.execute(
+            f'SELECT {_COLUMNS} FROM starboard_posts WHERE guild_id = ?', (guild_id,)
+        ).fetchall()
+        return {row[0]: StarPost.from_row(row) for row in rows}
+
+    async def guild_posts(self, guild_id: int) -> Dict[int, StarPost]:
+        """Return a guild's posts keyed by source message ID, loading them on first use."""
+        posts = self._guilds.get(guild_id)
+        if posts is not None:
+            return posts
+
+        # Concurrent first lookups for a guild share one query
+        pending = self._loading.get(guild_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = self._loading[guild_id] = asyncio.get_running_loop().create_future()
+        try:
+            posts = self._guilds[guild_id] = await self._run(self._load_guild, guild_id)
+            future.set_result(posts)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a failed load with no waiters is not reported as unhandled
+            future.exception()
+            raise
+        finally:
+            del self._loading[guild_id]
+        return posts
+
+    async def get(self, guild_id: int, message_id: int) -> Optional[StarPost]:
+        return (await self.guild_posts(guild_id)).get(message_id)
+
+    @staticmethod
+    def _author_table(month: Optional[str]) -> Tuple[str, Tuple]:
+        """Return the author totals table and the key prefix to filter it by."""
+        if month is None:
+            return 'starboard_authors WHERE guild_id = ?', ()
+        return 'starboard_author_months WHERE guild_id = ? AND month = ?', (month,)
+
+    def _top_posts(self, guild_id: int, limit: int, month: Optional[str]) -> List[StarPost]:
+        if month is None:
+            rows = self._conn.execute(
+                f'SELECT {_COLUMNS} FROM starboard_posts WHERE guild_id = ? '
+                'ORDER BY stars DESC, message_id LIMIT ?',
+                (guild_id, limit)
+            ).fetchall()
+        else:
+            rows = self._conn.execute(
+                f'SELECT {_COLUMNS} FROM starboard_posts WHERE guild_id = ? AND message_id BETWEEN ? AND ? '
+                'ORDER BY stars DESC, message_id LIMIT ?',
+                (guild_id, *_month_bounds(month), limit)
+            ).fetchall()
+        return [StarPost.from_row(row) for row in rows]
+
+    async def top_posts(self, guild_id: int, limit: int = 10, month: Optional[str] = None) -> List[StarPost]:
+        """Return a guild's most starred posts, most stars first.
+
+        Args:
+            guild_id: Guild to read
+            limit: Maximum number of posts
+            month: Only posts whose source message was sent in this 'YYYY-MM' month
+        """
+        return await self._run(self._top_posts, guild_id, limit, month)
+
+    def _top_authors(self, guild_id: int, limit: int, month: Optional[str]) -> List[Tuple[int, int, int]]:
+        table, key = self._author_table(month)
+        return self._conn.execute(
+            f'SELECT author_id, stars, posts FROM {table} AND posts > 0 '
+            'ORDER BY stars DESC, author_id LIMIT ?',
+            (guild_id, *key, limit)
+        ).fetchall()
+
+    async def top_authors(self, guild_id: int, limit: int = 10,
+                          month: Optional[str] = None) -> List[Tuple[int, int, int]]:
+        """Return (author_id, stars, posts) for a guild's most starred authors, optionally in one month."""
+        return await self._run(self._top_authors, guild_id, limit, month)
+
+    def _author_stats(self, guild_id: int, author_id: int, month: Optional[str]) -> Tuple[int, int, int]:
+        table, key = self._author_table(month)
+        row = self._conn.execute(
+            f'SELECT stars, posts FROM {table} AND author_id = ?',
+            (guild_id, *key, author_id)
+        ).fetchone()
+        if not row or row[1] <= 0:
+            return 0, 0, 0
+
+        rank = self._conn.execute(
+            f'SELECT COUNT(*) FROM {table} AND posts > 0 AND stars > ?',
+            (guild_id, *key, row[0])
+        ).fetchone()[0] + 1
+        return row[0], row[1], rank
+
+    async def author_stats(self, guild_id: int, author_id: int,
+                           month: Optional[str] = None) -> Tuple[int, int, int]:
+        """Return (stars, posts, rank) for one author; all zero if they have no posts."""
+        return await self._run(self._author_stats, guild_id, author_id, month)
+
+    def _guild_stats(self, guild_id: int, month: Optional[str]) -> Tuple[int, int, int]:
+        row = self._conn.execute(
+            'SELECT stars, posts FROM starboard_guilds WHERE guild_id = ? AND month = ?',
+            (guild_id, month or ALL_TIME)
+        ).fetchone()
+        table, key = self._author_table(month)
+        authors = self._conn.execute(
+            f'SELECT COUNT(*) FROM {table} AND posts > 0', (guild_id, *key)
+        ).fetchone()[0]
+        stars, posts = row or (0, 0)
+        return stars, posts, authors
+
+    async def guild_stats(self, guild_id: int, month: Optional[str] = None) -> Tuple[int, int, int]:
+        """Return (stars, posts, authors) totals for a guild's starboard, optionally in one month."""
+        return await self._run(self._guild_stats, guild_id, month)
+
+    #################################
+    ## Writes
+    #################################
+    @staticmethod
+    def _row_values(guild_id: int, post: StarPost, updated: float) -> Tuple:
+        return (
+            post.message_id, guild_id, post.channel_id, post.author_id,
+            post.star_message_id, post.stars, updated
+        )
+
+    def _apply_deltas(self, deltas: _Deltas) -> None:
+        self._conn.executemany(
+            'INSERT INTO starboard_authors (guild_id, author_id, stars, posts) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT(guild_id, author_id) DO UPDATE SET '
+            'stars = stars + excluded.stars, posts = posts + excluded.posts',
+            deltas.authors
+        )
+        self._conn.executemany(
+            'INSERT INTO starboard_author_months (guild_id, month, author_id, stars, posts) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT(guild_id, month, author_id) DO UPDATE SET '
+            'stars = stars + excluded.stars, posts = posts + excluded.posts',
+            deltas.months
+        )
+        self._conn.executemany(
+            'INSERT INTO starboard_guilds (guild_id, month, stars, posts) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT(guild_id, month) DO UPDATE SET '
+            'stars = stars + excluded.stars, posts = posts + excluded.posts',
+            deltas.guilds
+        )
+
+    def _upsert(self, rows: List[Tuple], deltas: _Deltas) -> None:
+        with self._conn:
+            self._apply_deltas(deltas)
+            self._conn.executemany(
+                'INSERT INTO starboard_posts '
+                '(message_id, guild_id, channel_id, author_id, star_message_id, stars, updated) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(message_id) DO UPDATE SET '
+                'channel_id = excluded.channel_id, '
+                'author_id = COALESCE(excluded.author_id, starboard_posts.author_id), '
+                'star_message_id = excluded.star_message_id, '
+                'stars = excluded.stars, '
+                'updated = excluded.updated',
+                rows
+            )
+
+    async def save(self, guild_id: int, post: StarPost) -> None:
+        """Insert or update a post."""
+        posts = await self.guild_posts(guild_id)
+        if post.author_id is None and post.message_id in posts:
+            post.author_id = posts[post.message_id].author_id
+        deltas = _Deltas()
+        deltas.replace(guild_id, posts.get(post.message_id), post)
+        posts[post.message_id] = post
+        await self._run(self._upsert, [self._row_values(guild_id, post, time.time())], deltas)
+
+    async def merge(self, guild_id: int, found: Iterable[StarPost]) -> int:
+        """Upsert posts recovered from the starboard channel in one transaction.
+
+        Known author IDs are kept when a recovered post has none. Returns the
+        number of posts that were missing, changed or gained an author.
+        """
+        posts = await self.guild_posts(guild_id)
+        now = time.time()
+        rows = []
+        deltas = _Deltas()
+        for post in found:
+            existing = posts.get(post.message_id)
+            if existing is not None and post.author_id is None:
+                post.author_id = existing.author_id
+            if (existing is None or existing.star_message_id != post.star_message_id
+                    or existing.stars != post.stars or existing.author_id != post.author_id):
+                deltas.replace(guild_id, existing, post)
+                posts[post.message_id] = post
+                rows.append(self._row_values(guild_id, post, now))
+
+        if rows:
+            await self._run(self._upsert, rows, deltas)
+        return len(rows)
+
+    def _delete(self, message_id: int, deltas: _Deltas) -> None:
+        with self._conn:
+            self._apply_deltas(deltas)
+            self._conn.execute('DELETE FROM starboard_posts WHERE message_id = ?', (message_id,))
+
+    async def remove(self, guild_id: int, message_id: int) -> Optional[StarPost]:
+        """Forget a post and return it, or None if it was not known."""
+        post = (await self.guild_posts(guild_id)).pop(message_id, None)
+        if post is not None:
+            deltas = _Deltas()
+            deltas.replace(guild_id, post, None)
+            await self._run(self._delete, message_id, deltas)
+        return post